@@ -0,0 +1,204 @@
+"""
+Load-test benchmark for the data clients against a local stand-in API.
+
+Starts reagentpy.testing.StubReagentServer and, for each endpoint, issues the same
+requests through several client setups:
+
+    serial      a fresh transport (new session, new connection) per request
+    pooled      one shared Reagent, requests one after another
+    concurrent  one shared Reagent driven by a thread pool
+    async       one AsyncReagent with bounded concurrency (needs httpx)
+
+Reports throughput, client-side p50/p95/p99 latency, response bytes and peak Python
+memory per endpoint and mode, as a table or JSON. The server runs in a child process so
+it does not compete with the clients for the GIL or show up in memory figures.
+
+    python benchmarks/client_load.py --requests 200 --workers 16 --latency 0.02 --record-padding 256
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reagentpy import Reagent  # noqa: E402
+from reagentpy.metrics import LatencyCollector  # noqa: E402
+from reagentpy.testing import StubReagentServer  # noqa: E402
+from reagentpy.transport import ReagentTransport  # noqa: E402
+
+API_KEY = "benchmark-key"
+REPO = "org/repo"
+
+# name -> (client method name, endpoint method name, kwargs)
+ENDPOINT_CALLS = {
+    "/commit/data": ("commit", "data", {"repo": REPO, "limit": 500}),
+    "/repo/list": ("repo", "repo_list", {"limit": 500}),
+    "/repo/email_domains": ("repo", "email_domains", {"repo": REPO, "limit": 100}),
+    "/repo/timezones": ("repo", "timezones", {"repo": REPO}),
+    "/repo/hygiene_summary": ("repo", "hygiene_summary", {"repo": REPO}),
+    "/foreign-adversarial/timezones": ("composite_scores", "adversarial_timezones", {"repo": REPO}),
+}
+MODES = ("serial", "pooled", "concurrent", "async")
+
+
+def call(reagent, endpoint: str):
+    client_name, method_name, kwargs = ENDPOINT_CALLS[endpoint]
+    return getattr(getattr(reagent, client_name)(), method_name)(**kwargs)
+
+
+def run_serial(base_url, endpoint, requests, workers, collector, decode):
+    for _ in range(requests):
+        with ReagentTransport(reagent_api_key=API_KEY, base_url=base_url, hooks=[collector]) as transport:
+            response = call(Reagent(transport=transport), endpoint)
+            if decode:
+                response.df()
+
+
+def run_pooled(base_url, endpoint, requests, workers, collector, decode):
+    with Reagent(reagent_api_key=API_KEY, base_url=base_url, hooks=[collector]) as reagent:
+        for _ in range(requests):
+            response = call(reagent, endpoint)
+            if decode:
+                response.df()
+
+
+def run_concurrent(base_url, endpoint, requests, workers, collector, decode):
+    with Reagent(reagent_api_key=API_KEY, base_url=base_url, hooks=[collector],
+                 pool_connections=workers, pool_maxsize=workers) as reagent:
+        def one(_):
+            response = call(reagent, endpoint)
+            if decode:
+                response.df()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(one, range(requests)))
+
+
+def run_async(base_url, endpoint, requests, workers, collector, decode):
+    import asyncio
+    from reagentpy.clients.aio import AsyncReagent
+
+    async def main():
+        async with AsyncReagent(reagent_api_key=API_KEY, base_url=base_url, hooks=[collector],
+                                max_connections=workers, max_concurrency=workers) as reagent:
+            remaining = iter(range(requests))
+
+            # A fixed set of workers, like the thread pool, so queueing time stays out of latency
+            async def worker():
+                for _ in remaining:
+                    response = await call(reagent, endpoint)
+                    if decode:
+                        response.df()
+
+            await asyncio.gather(*(worker() for _ in range(workers)))
+
+    asyncio.run(main())
+
+
+def serve(options: dict, connection, stop):
+    with StubReagentServer(**options) as server:
+        connection.send(server.base_url)
+        stop.wait()
+
+
+def start_server(**options):
+    """Run a StubReagentServer in a child process; returns (base_url, stop event, process)."""
+    parent, child = multiprocessing.Pipe()
+    stop = multiprocessing.Event()
+    process = multiprocessing.Process(target=serve, args=(options, child, stop), daemon=True)
+    process.start()
+    return parent.recv(), stop, process
+
+
+RUNNERS = {"serial": run_serial, "pooled": run_pooled, "concurrent": run_concurrent, "async": run_async}
+
+
+def measure(base_url: str, endpoint: str, mode: str, requests: int, workers: int, decode: bool,
+            memory_requests: int) -> dict:
+    collector = LatencyCollector()
+    start = time.perf_counter()
+    RUNNERS[mode](base_url, endpoint, requests, workers, collector, decode)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows allocation-heavy code a lot, so memory gets its own shorter pass
+    tracemalloc.start()
+    RUNNERS[mode](base_url, endpoint, memory_requests, workers, LatencyCollector(), decode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = collector.summary().get(endpoint, {})
+    return {
+        "endpoint": endpoint,
+        "mode": mode,
+        "requests": requests,
+        "seconds": elapsed,
+        "requests_per_second": requests / elapsed if elapsed else None,
+        "p50": stats.get("p50"),
+        "p95": stats.get("p95"),
+        "p99": stats.get("p99"),
+        "bytes": stats.get("bytes"),
+        "errors": stats.get("errors"),
+        "peak_memory_bytes": peak,
+    }
+
+
+def available_modes(modes):
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        return [mode for mode in modes if mode != "async"]
+    return list(modes)
+
+
+def format_table(results) -> str:
+    header = f"{'endpoint':<32} {'mode':<11} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak MiB':>9}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        ms = {q: (result[q] or 0) * 1000 for q in ("p50", "p95", "p99")}
+        lines.append(
+            f"{result['endpoint']:<32} {result['mode']:<11} {result['requests_per_second']:>9.1f} "
+            f"{ms['p50']:>8.1f} {ms['p95']:>8.1f} {ms['p99']:>8.1f} {result['peak_memory_bytes'] / 2**20:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", action="append", choices=sorted(ENDPOINT_CALLS),
+                        help="Endpoint to benchmark; repeatable. Defaults to all.")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Client setup to run; repeatable. Defaults to all.")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint and mode.")
+    parser.add_argument("--memory-requests", type=int, default=20, help="Requests in the separate memory-tracing pass.")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrency for the concurrent and async modes.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Server-side latency per request in seconds.")
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--record-padding", type=int, default=0, help="Extra bytes per record in list payloads.")
+    parser.add_argument("--decode", action="store_true", help="Also build a DataFrame from every response.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table.")
+    args = parser.parse_args()
+
+    endpoints = args.endpoint or list(ENDPOINT_CALLS)
+    modes = available_modes(args.mode or MODES)
+
+    base_url, stop, process = start_server(latency=args.latency, latency_jitter=args.latency_jitter,
+                                           record_padding=args.record_padding)
+    results = []
+    try:
+        for endpoint in endpoints:
+            for mode in modes:
+                results.append(measure(base_url, endpoint, mode, args.requests, args.workers, args.decode,
+                                       args.memory_requests))
+    finally:
+        stop.set()
+        process.join()
+
+    print(json.dumps(results, indent=2) if args.json else format_table(results))
+
+
+if __name__ == "__main__":
+    main()
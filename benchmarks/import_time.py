@@ -0,0 +1,66 @@
+"""
+Cold-start benchmark for the reagent CLI.
+
+Imports a module in fresh interpreters and reports the median wall time, plus any heavy
+plotting/geo modules that were loaded along the way. Exits non-zero if the median
+exceeds the budget or a heavy module was imported.
+
+    python benchmarks/import_time.py --module reagentpy.cli --runs 10 --budget 0.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just to start the CLI or a data client
+HEAVY_MODULES = ("matplotlib", "cartopy", "geopandas", "shapely", "wordcloud", "numpy", "pandas", "httpx")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            check=True, capture_output=True, text=True, cwd=REPO_ROOT,
+        ).stdout
+        result = json.loads(output)
+        timings.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return {
+        "module": module,
+        "runs": runs,
+        "median_seconds": statistics.median(timings),
+        "max_seconds": max(timings),
+        "heavy_modules_loaded": sorted(loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="reagentpy.cli")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum median import time in seconds.")
+    args = parser.parse_args()
+
+    result = measure(args.module, args.runs)
+    print(json.dumps(result, indent=2))
+
+    if result["heavy_modules_loaded"] or result["median_seconds"] > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
-import os
+from typing import Iterator, Optional
 import requests
-from dotenv import load_dotenv
-from reagentpy.constants import VERSION, REAGENTPY_USER_AGENT, REAGENT_BASE_URL
+from reagentpy.clients import ReagentResponse
+from reagentpy.constants import VERSION, REAGENTPY_USER_AGENT, PAGINATION_OFFSET_PARAM
+from reagentpy.endpoints import get_endpoint
+from reagentpy.pagination import iter_records
+from reagentpy.streaming import streaming
+from reagentpy.transport import ReagentTransport
     
 
 class ReagentClient:
@@ -14,43 +18,50 @@ class ReagentClient:
 
     session: requests.Session = None
 
-    def __init__(self, reagent_api_key: str = None):
+    transport: ReagentTransport = None
+
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
 
         # Set the version
-        self.version = "0.1.0"
+        self.version = VERSION
 
         # Set the user agent
         self.user_agent = f"{REAGENTPY_USER_AGENT}/{self.version}"
 
-        # Set the base URL
-        self.reagent_base_url = REAGENT_BASE_URL
-
-        if reagent_api_key:
-            self.reagent_api_key = reagent_api_key
-        else:
-            # Load environment variables from a .env file
-            load_dotenv()
-            self.reagent_api_key = os.getenv("REAGENT_API_KEY")
+        # Share the given transport, or open a private one
+        if transport is None:
+            transport = ReagentTransport(reagent_api_key=reagent_api_key)
+        self.transport = transport
 
-        # Initialize a new requests session
-        self.init_session()
+        # Set the base URL and credentials from the transport
+        self.reagent_base_url = transport.base_url
+        self.reagent_api_key = transport.reagent_api_key
+        self.session = transport.session
 
     def init_session(self):
-        """Initialize a new requests session."""
-        
-        # Create a requests session
-        self.session = requests.Session()
-
-        # Set the authorization header
-        if not self.reagent_api_key:
-            raise ValueError("Reagent API key environment variable not set or missing. Try \"reagent login\" to set the API key.")
-        self.session.headers.update({
-            "Authorization": f"Basic {self.reagent_api_key}"
-        })
-
-        # Set user agent
-        self.session.headers.update(
-            {
-                "User-Agent": f"{self.user_agent}"
-            }
-        )
+        """Initialize a new requests session on the underlying transport."""
+        self.transport.init_session()
+        self.session = self.transport.session
+
+    def _get(self, endpoint: str, params: Optional[dict] = None) -> ReagentResponse:
+        """GET an endpoint (relative to the base URL) through the shared transport."""
+        return self.transport.request("GET", endpoint, params=params)
+
+    def _post(self, endpoint: str, json: Optional[dict] = None) -> ReagentResponse:
+        """POST to an endpoint (relative to the base URL) through the shared transport."""
+        return self.transport.request("POST", endpoint, json=json)
+
+    def _iter_pages(self, endpoint: str, params: dict, page_size: Optional[int] = None,
+                    max_records: Optional[int] = None, prefetch: bool = True) -> Iterator[dict]:
+        """Yield every record of a limit-based endpoint, requesting one page (limit/offset) at a time."""
+        if not get_endpoint(endpoint).paginated:
+            raise ValueError(f"{endpoint} does not support pagination.")
+
+        def fetch_page(offset: int, limit: int):
+            page_params = {**params, "limit": limit, PAGINATION_OFFSET_PARAM: offset}
+            # Decode each page straight from the socket rather than buffering the body first
+            with streaming():
+                response = self._get(endpoint, params=page_params)
+            return list(response.raise_for_status().iter_records())
+
+        return iter_records(fetch_page, page_size=page_size, max_records=max_records, prefetch=prefetch)
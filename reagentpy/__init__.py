@@ -1,3 +1,10 @@
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from reagentpy.batch import Batch
+from reagentpy.constants import DEFAULT_BATCH_WORKERS
+from reagentpy.transport import ReagentTransport
 from reagentpy.clients.community import CommunityClient
 from reagentpy.clients.repo import RepoClient
 from reagentpy.clients.user import UserClient
@@ -5,42 +12,106 @@ from reagentpy.clients.enrichments import EnrichmentsClient
 from reagentpy.clients.commit import CommitClient
 from reagentpy.clients.composite_scores import CompositeClient
 from reagentpy.clients.generic import GenericClient
-from reagentpy.visualizations.demo_visualizations import DemoVisClient
-from reagentpy.visualizations.timezone_visualizations import TimezoneVisClient
-from reagentpy.visualizations.boe_visualizations import BOEVisClient
+
+# The visualization clients pull in matplotlib, cartopy, geopandas and wordcloud, and the
+# async clients pull in asyncio and httpx, so they are only imported when first used
+# (including "from reagentpy import TimezoneVisClient")
+_LAZY_CLIENTS = {
+    "DemoVisClient": "reagentpy.visualizations.demo_visualizations",
+    "TimezoneVisClient": "reagentpy.visualizations.timezone_visualizations",
+    "BOEVisClient": "reagentpy.visualizations.boe_visualizations",
+    "AsyncReagent": "reagentpy.clients.aio",
+    "AsyncReagentTransport": "reagentpy.async_transport",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_CLIENTS:
+        module = importlib.import_module(_LAZY_CLIENTS[name])
+        client = getattr(module, name)
+        globals()[name] = client
+        return client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class Reagent:
 
-    def __init__(self):
-        pass
+    transport: ReagentTransport = None
+
+    # Thread pool shared by every batch(), created on first use
+    executor: ThreadPoolExecutor = None
+
+    def __init__(self, reagent_api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 transport: Optional[ReagentTransport] = None, **transport_options):
+        """
+        Every client returned by this facade shares one pooled transport, so connections
+        and credentials are reused across calls. Extra keyword arguments (pool_maxsize,
+        keep_alive, timeout, ...) are passed to ReagentTransport.
+        """
+        if transport is None:
+            transport = ReagentTransport(reagent_api_key=reagent_api_key, base_url=base_url, **transport_options)
+        self.transport = transport
+        self._executor_lock = threading.Lock()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def community(self):
-        return CommunityClient()
+        return CommunityClient(transport=self.transport)
     
     def repo(self):
-        return RepoClient()
+        return RepoClient(transport=self.transport)
     
     def user(self):
-        return UserClient()
+        return UserClient(transport=self.transport)
     
     def enrichments(self):
-        return EnrichmentsClient()
+        return EnrichmentsClient(transport=self.transport)
     
     def commit(self):
-        return CommitClient()
+        return CommitClient(transport=self.transport)
     
     def demo_visualizations(self):
-        return DemoVisClient()
+        from reagentpy.visualizations.demo_visualizations import DemoVisClient
+        return DemoVisClient(transport=self.transport)
 
     def timezone_visualizations(self):
-        return TimezoneVisClient()
+        from reagentpy.visualizations.timezone_visualizations import TimezoneVisClient
+        return TimezoneVisClient(transport=self.transport)
     
     def boe_visualizations(self):
-        return BOEVisClient()
+        from reagentpy.visualizations.boe_visualizations import BOEVisClient
+        return BOEVisClient(transport=self.transport)
     
     def composite_scores(self):
-        return CompositeClient()
+        return CompositeClient(transport=self.transport)
     
     def status(self):
-        return GenericClient().get("/status")
-    
\ No newline at end of file
+        return GenericClient(transport=self.transport).get("/status")
+
+    def batch(self, max_workers: int = DEFAULT_BATCH_WORKERS) -> Batch:
+        """
+        Submit calls concurrently and get futures back:
+
+            with reagent.batch(max_workers=16) as b:
+                timezones = b.repo.timezones("org/repo")
+                score = b.composite_scores.adversarial_total("org/repo")
+            timezones.result().df()
+
+        Calls share this facade's transport (rate limiter, retries, caches) and a thread
+        pool that is reused across batches, sized by the first one (at least 16 threads).
+        Identical calls in a batch are made once.
+        """
+        with self._executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=max(max_workers, DEFAULT_BATCH_WORKERS),
+                                                   thread_name_prefix="reagentpy-batch")
+        return Batch(self, self.executor, max_workers=max_workers)
@@ -0,0 +1,62 @@
+from typing import Iterable, List, Optional
+
+
+def import_pyarrow():
+    """Import pyarrow, which is an optional dependency."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow and Parquet support requires pyarrow. Install it with \"pip install reagentpy[arrow]\".") from None
+    return pyarrow
+
+
+def as_records(data) -> List[dict]:
+    """Coerce a decoded result (list of objects, or a single object) into a list of records."""
+    if data is None:
+        return []
+    if isinstance(data, dict):
+        return [data]
+    return list(data)
+
+
+def flatten_table(table):
+    """Flatten nested struct columns into dotted names ("a.b"), matching pd.json_normalize."""
+    pa = import_pyarrow()
+    while any(pa.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+    return table
+
+
+def records_to_table(records: Iterable[dict], schema=None, flatten: bool = True):
+    """
+    Build an Arrow table straight from decoded JSON records.
+
+    Columns are the union of keys across all records (missing values become null). Fields
+    in a declared schema take its type and order; other columns are inferred.
+    """
+    pa = import_pyarrow()
+    records = as_records(records)
+
+    columns = {}
+    if schema is not None:
+        for name in schema.names:
+            columns[name] = None
+    for record in records:
+        for key in record:
+            columns.setdefault(key, None)
+
+    arrays = []
+    fields = []
+    for name in columns:
+        values = [record.get(name) for record in records]
+        if schema is not None and schema.get_field_index(name) != -1:
+            field = schema.field(name)
+            arrays.append(pa.array(values, type=field.type))
+            fields.append(field)
+        else:
+            array = pa.array(values)
+            arrays.append(array)
+            fields.append(pa.field(name, array.type))
+
+    table = pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+    return flatten_table(table) if flatten else table
@@ -0,0 +1,207 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple, Union
+from reagentpy.cassette import Cassette, request_key, resolve_cassette
+from reagentpy.clients import ReagentResponse
+from reagentpy.constants import VERSION, REAGENTPY_USER_AGENT, DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT
+from reagentpy.metrics import CallbackHook, RequestEvent, RequestHook
+from reagentpy.ratelimit import RetryPolicy, TokenBucket, get_rate_limiter
+from reagentpy.transport import resolve_api_key, resolve_base_url
+
+# httpx is optional and only imported once an async transport is created
+httpx = None
+
+
+def _import_httpx():
+    global httpx
+    if httpx is None:
+        try:
+            import httpx as httpx_module
+        except ImportError:
+            raise ImportError("AsyncReagent requires httpx. Install it with \"pip install reagentpy[async]\".") from None
+        httpx = httpx_module
+    return httpx
+
+
+def encode_params(params: Optional[dict]) -> Optional[dict]:
+    """Encode query params the way requests does: drop None values and send booleans as "True"/"False"."""
+    if params is None:
+        return None
+    return {key: str(value) if isinstance(value, bool) else value for key, value in params.items() if value is not None}
+
+
+class AsyncReagentTransport:
+    """A pooled asyncio HTTP transport with bounded request concurrency."""
+
+    reagent_api_key: str = None
+
+    base_url: str = None
+
+    def __init__(self, reagent_api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_connections: int = DEFAULT_POOL_MAXSIZE, max_keepalive_connections: Optional[int] = None,
+                 keepalive_expiry: float = 5.0, max_concurrency: Optional[int] = None,
+                 timeout: Union[float, Tuple[float, float], None] = DEFAULT_TIMEOUT, http2: bool = False,
+                 keep_raw: bool = True, retry: Union[RetryPolicy, bool, None] = True, rate_limit: Optional[float] = None,
+                 rate_limit_burst: Optional[int] = None, rate_limiter: Optional[TokenBucket] = None,
+                 hooks: Optional[List[RequestHook]] = None, cassette: Union[Cassette, str, None] = None):
+        """
+        Args:
+            reagent_api_key: API key; falls back to REAGENT_API_KEY from the environment or a .env file.
+            base_url: API base URL; falls back to the REAGENT_BASE_URL environment variable, then the default.
+            max_connections: maximum number of open connections in the pool.
+            max_keepalive_connections: idle connections kept alive (defaults to max_connections).
+            keepalive_expiry: seconds an idle connection is kept alive.
+            max_concurrency: maximum number of in-flight requests (defaults to max_connections).
+            timeout: (connect, read) timeout in seconds applied to every request.
+            http2: negotiate HTTP/2 (requires the h2 package).
+            keep_raw: keep raw response bytes on each ReagentResponse after its body is decoded.
+            retry: RetryPolicy for 429/5xx responses and connection errors; True uses the defaults, False disables retries.
+            rate_limit: requests per second allowed for this API key, shared with the blocking transports in the process.
+            rate_limit_burst: requests allowed in a burst above rate_limit (defaults to the rate).
+            rate_limiter: an explicit TokenBucket to use instead of rate_limit.
+            hooks: RequestHook objects notified before and after every request (see reagentpy.metrics).
+            cassette: a Cassette (or cassette path) to record responses to or replay them from;
+                defaults to the REAGENT_CASSETTE environment variable. Replaying needs no API key.
+        """
+        _import_httpx()
+
+        self.reagent_api_key = resolve_api_key(reagent_api_key)
+        self.base_url = resolve_base_url(base_url)
+        self.user_agent = f"{REAGENTPY_USER_AGENT}/{VERSION}"
+        self.timeout = timeout
+        self.keep_raw = keep_raw
+        self.max_concurrency = max_concurrency or max_connections
+        self.retry = RetryPolicy() if retry is True else (retry or None)
+        self.cassette = resolve_cassette(cassette)
+
+        replaying = self.cassette is not None and self.cassette.replaying
+        if not self.reagent_api_key and not replaying:
+            raise ValueError("Reagent API key environment variable not set or missing. Try \"reagent login\" to set the API key.")
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            httpx_timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            httpx_timeout = httpx.Timeout(timeout)
+
+        headers = {"User-Agent": f"{self.user_agent}"}
+        if self.reagent_api_key:
+            headers["Authorization"] = f"Basic {self.reagent_api_key}"
+
+        self._client_options = {
+            "headers": headers,
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections or max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            "timeout": httpx_timeout,
+            "http2": http2,
+        }
+        self.client = None
+        self.init_session()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if rate_limiter is None and rate_limit is not None:
+            rate_limiter = get_rate_limiter(self.reagent_api_key, rate_limit, rate_limit_burst)
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or [])
+
+    def init_session(self):
+        """Open a new pooled httpx client; requests already in flight finish on the old one."""
+        self.client = httpx.AsyncClient(**self._client_options)
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}{endpoint}"
+
+    def add_hook(self, hook: Optional[RequestHook] = None, before=None, after=None) -> RequestHook:
+        """Register a RequestHook, or plain before(event)/after(event) callables."""
+        if hook is None:
+            hook = CallbackHook(before=before, after=after)
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: RequestHook):
+        self.hooks.remove(hook)
+
+    async def request(self, method: str, endpoint: str, params: Optional[dict] = None, json: Optional[dict] = None) -> ReagentResponse:
+        """Send a request to the Reagent API, notifying hooks before and after."""
+        if not self.hooks:
+            return await self.send(method, endpoint, params=params, json=json)
+
+        event = RequestEvent(method=method, endpoint=endpoint, params=params)
+        for hook in self.hooks:
+            hook.before_request(event)
+
+        start = time.perf_counter()
+        try:
+            response = await self.send(method, endpoint, params=params, json=json)
+        except BaseException as error:
+            event.latency = time.perf_counter() - start
+            event.error = error
+            for hook in self.hooks:
+                hook.after_request(event)
+            raise
+
+        event.latency = time.perf_counter() - start
+        event.status_code = response.status_code
+        event.retries = response.retries
+        content = response.content()
+        event.bytes = len(content) if content is not None else None
+        for hook in self.hooks:
+            hook.after_request(event)
+        return response
+
+    async def send(self, method: str, endpoint: str, params: Optional[dict] = None, json: Optional[dict] = None) -> ReagentResponse:
+        """Send a request over the network (or the cassette), waiting for a concurrency slot first, with rate limiting and retries."""
+        if self.cassette is None:
+            return await self._send(method, endpoint, params, json)
+
+        if self.cassette.replaying:
+            status_code, content = self.cassette.replay(method, endpoint, params, json)
+            response = ReagentResponse.from_content(content, status_code=status_code, keep_raw=self.keep_raw)
+            response.endpoint = endpoint
+            return response
+
+        response = await self._send(method, endpoint, params, json)
+        if self.cassette.recording:
+            self.cassette.record(request_key(method, endpoint, params, json), endpoint, response.status_code, response.content())
+        return response
+
+    async def _send(self, method: str, endpoint: str, params: Optional[dict], json: Optional[dict]) -> ReagentResponse:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            try:
+                async with self._semaphore:
+                    raw = await self.client.request(method, self.url(endpoint), params=encode_params(params), json=json)
+            except httpx.TransportError:
+                if self.retry is None or not self.retry.should_retry_error(method, attempt):
+                    raise
+                delay = self.retry.backoff(attempt)
+            else:
+                if self.retry is None or not self.retry.should_retry(method, raw.status_code, attempt):
+                    response = ReagentResponse(raw, keep_raw=self.keep_raw)
+                    response.retries = attempt
+                    response.endpoint = endpoint
+                    return response
+                delay = self.retry.backoff(attempt, raw.headers.get("Retry-After"))
+                if raw.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self):
+        """Close every pooled connection and save any cassette recordings."""
+        await self.client.aclose()
+        if self.cassette is not None:
+            self.cassette.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -0,0 +1,164 @@
+"""
+Futures-based batches of API calls.
+
+    with reagent.batch(max_workers=16) as b:
+        timezones = b.repo.timezones("org/repo")
+        hygiene = b.repo.hygiene_summary("org/repo")
+        breaches = b.enrichments.hibp(repo="org/repo")
+    timezones.result().df()
+
+Calls run on the facade's shared thread pool through its transport, so the rate limiter,
+retries, caches and hooks all apply. Identical calls within a batch share one future.
+"""
+import contextvars
+import inspect
+import json
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Tuple
+from reagentpy.constants import DEFAULT_BATCH_WORKERS
+
+
+def call_key(owner: str, name: str, function: Callable, args: tuple, kwargs: dict) -> str:
+    """A key that is equal for calls with the same effective arguments, however they were passed."""
+    try:
+        bound = inspect.signature(function).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+    except (TypeError, ValueError):
+        arguments = {"args": args, "kwargs": kwargs}
+    return json.dumps([owner, name, arguments], sort_keys=True, default=repr)
+
+
+def _run(function: Callable, args: tuple, kwargs: dict):
+    result = function(*args, **kwargs)
+    # iter_* methods return generators; fetch everything inside the pool
+    if inspect.isgenerator(result):
+        result = list(result)
+    return result
+
+
+class _BatchClient:
+    """Stands in for a client inside a batch: each method call is submitted and returns a Future."""
+
+    def __init__(self, batch: "Batch", client):
+        self._batch = batch
+        self._client = client
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+        if name.startswith("_") or not callable(method):
+            return method
+        owner = type(self._client).__name__
+
+        def submit(*args, **kwargs) -> Future:
+            return self._batch._submit(call_key(owner, name, method, args, kwargs), method, args, kwargs)
+
+        submit.__name__ = name
+        submit.__doc__ = method.__doc__
+        return submit
+
+
+class Batch:
+    """
+    A group of calls run concurrently on a shared pool; use reagent.batch() to create one.
+
+    At most max_workers calls of the batch run at once, and leaving the with block waits
+    for all of them. Size the transport's pool_maxsize to at least max_workers so every
+    worker keeps its connection alive.
+    """
+
+    def __init__(self, reagent, executor: ThreadPoolExecutor, max_workers: int = DEFAULT_BATCH_WORKERS):
+        self.reagent = reagent
+        self.max_workers = max(1, max_workers)
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        # Each call keeps a copy of its submitter's context (cache mode, streaming())
+        self._queue: Deque[Tuple[Future, contextvars.Context, Callable, tuple, dict]] = deque()
+        self._running = 0
+
+        self.community = _BatchClient(self, reagent.community())
+        self.repo = _BatchClient(self, reagent.repo())
+        self.user = _BatchClient(self, reagent.user())
+        self.enrichments = _BatchClient(self, reagent.enrichments())
+        self.commit = _BatchClient(self, reagent.commit())
+        self.composite_scores = _BatchClient(self, reagent.composite_scores())
+
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """Run any callable in the batch; identical calls of the same callable are deduplicated."""
+        target = getattr(function, "__func__", function)
+        # Bound methods are new objects on every access, so key on the function and its instance
+        owner = f"{getattr(target, '__module__', '')}.{getattr(target, '__qualname__', repr(target))}"
+        key = call_key(owner, str(id(getattr(function, "__self__", target))), function, args, kwargs)
+        return self._submit(key, function, args, kwargs)
+
+    def status(self) -> Future:
+        return self.submit(self.reagent.status)
+
+    def _submit(self, key: str, function: Callable, args: tuple, kwargs: dict) -> Future:
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+            future = self._futures[key] = Future()
+            context = contextvars.copy_context()
+            if self._running >= self.max_workers:
+                self._queue.append((future, context, function, args, kwargs))
+                return future
+            self._running += 1
+        self._start(future, context, function, args, kwargs)
+        return future
+
+    def _start(self, future: Future, context: contextvars.Context, function: Callable, args: tuple, kwargs: dict):
+        while True:
+            if future.set_running_or_notify_cancel():
+                inner = self._executor.submit(context.run, _run, function, args, kwargs)
+                inner.add_done_callback(lambda done, future=future: self._finish(done, future))
+                return
+            # Cancelled while queued: hand the slot to the next call
+            with self._lock:
+                if not self._queue:
+                    self._running -= 1
+                    return
+                future, context, function, args, kwargs = self._queue.popleft()
+
+    def _finish(self, inner: Future, future: Future):
+        # Cancelled inside the pool (e.g. it shut down); ours is already running, so it can't be cancelled
+        error = CancelledError() if inner.cancelled() else inner.exception()
+        if error is None:
+            future.set_result(inner.result())
+        else:
+            future.set_exception(error)
+
+        with self._lock:
+            if not self._queue:
+                self._running -= 1
+                return
+            next_call = self._queue.popleft()
+        self._start(*next_call)
+
+    @property
+    def futures(self) -> List[Future]:
+        """Every distinct call submitted so far, in submission order."""
+        with self._lock:
+            return list(self._futures.values())
+
+    def wait(self, timeout: float = None):
+        """Block until every submitted call has finished."""
+        wait(self.futures, timeout=timeout)
+
+    def cancel(self):
+        """Cancel calls that have not started yet."""
+        for future in self.futures:
+            future.cancel()
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.cancel()
+        self.wait()
+
@@ -0,0 +1,391 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+from reagentpy.endpoints import get_endpoint
+from reagentpy.constants import (
+    DEFAULT_CACHE_PATH,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_TTLS,
+    DEFAULT_MEMORY_CACHE_ENTRIES,
+    DEFAULT_MEMORY_CACHE_TTL,
+)
+
+
+# Cache modes
+CACHE_USE = "use"          # serve hits, store misses
+CACHE_BYPASS = "bypass"    # neither read nor write the cache
+CACHE_REFRESH = "refresh"  # always fetch, then overwrite the cached entry
+
+_cache_mode: ContextVar[str] = ContextVar("reagentpy_cache_mode", default=CACHE_USE)
+
+
+def get_cache_mode() -> str:
+    return _cache_mode.get()
+
+
+@contextmanager
+def cache_mode(mode: str):
+    """
+    Set how caches treat requests made inside the block (in this thread or task).
+
+        with cache_mode(CACHE_REFRESH):
+            client.timezones("org/repo")
+    """
+    if mode not in (CACHE_USE, CACHE_BYPASS, CACHE_REFRESH):
+        raise ValueError(f"Unknown cache mode: {mode}")
+    token = _cache_mode.set(mode)
+    try:
+        yield
+    finally:
+        _cache_mode.reset(token)
+
+
+def bypass_cache():
+    """Skip the cache entirely for requests made inside the block."""
+    return cache_mode(CACHE_BYPASS)
+
+
+def refresh_cache():
+    """Re-fetch and overwrite cached entries for requests made inside the block."""
+    return cache_mode(CACHE_REFRESH)
+
+
+# Outcomes reported by MemoryCache.get_or_fetch
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_COALESCED = "coalesced"
+
+
+# Default for ResponseCache.set(ttl=...): use the endpoint's TTL
+_ENDPOINT_TTL = object()
+
+
+def normalize_params(params: Optional[dict]) -> list:
+    """Sorted (key, value) pairs with None values dropped, so equivalent queries share a key."""
+    return sorted((key, value) for key, value in (params or {}).items() if value is not None)
+
+
+def cache_key(method: str, endpoint: str, params: Optional[dict] = None) -> str:
+    """A stable key for a request: method, endpoint and normalized query params."""
+    return json.dumps([method.upper(), endpoint, normalize_params(params)], separators=(",", ":"), default=str)
+
+
+def limit_key(method: str, endpoint: str, params: Optional[dict] = None) -> Optional[Tuple[str, int]]:
+    """
+    (key shared by every limit, limit) for a GET whose smaller-limit results can be sliced
+    from a larger-limit result, i.e. to an endpoint whose deterministic_order holds for
+    these params; else None.
+    """
+    if method.upper() != "GET" or not params or not get_endpoint(endpoint).ordered(params):
+        return None
+    limit = params.get("limit")
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+        return None
+    other_params = {key: value for key, value in params.items() if key != "limit"}
+    return cache_key(method, endpoint, other_params) + "limit=*", limit
+
+
+def encode_limited(limit: int, content: bytes) -> bytes:
+    """A cached body tagged with the limit it was fetched with."""
+    return b'{"limit":%d,"body":%s}' % (limit, content)
+
+
+def decode_limited(content: bytes) -> Tuple[int, Any]:
+    stored = json.loads(content)
+    return stored["limit"], stored["body"]
+
+
+def limited_content(body: Any, cached_limit: int, limit: int) -> Optional[bytes]:
+    """
+    The body of a result fetched with cached_limit, cut down to its first limit records; None
+    when it can't answer limit (it has fewer records and was itself truncated at cached_limit).
+    """
+    records = body.get("results") if isinstance(body, dict) else body
+    if not isinstance(records, list):
+        return None
+    if len(records) > limit:
+        body = {**body, "results": records[:limit]} if isinstance(body, dict) else records[:limit]
+    # Fewer records than the cached limit means the cached query got everything there is
+    elif len(records) != limit and len(records) >= cached_limit:
+        return None
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def ttl_for_endpoint(endpoint: str, ttls: Dict[str, Optional[float]], default_ttl: Optional[float]) -> Optional[float]:
+    """The TTL for an endpoint: the longest matching prefix in ttls, else default_ttl."""
+    matches = [prefix for prefix in ttls if endpoint.startswith(prefix)]
+    if not matches:
+        return default_ttl
+    return ttls[max(matches, key=len)]
+
+
+class ResponseCache:
+    """
+    A persistent SQLite cache of response bodies.
+
+    Bodies are stored zlib-compressed and expire after a per-endpoint TTL. When the stored
+    size exceeds max_bytes the least recently used entries are evicted. The database can be
+    shared by several processes.
+    """
+
+    def __init__(self, path: Optional[str] = None, default_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 ttls: Optional[Dict[str, Optional[float]]] = None, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 compression_level: int = 6):
+        """
+        Args:
+            path: SQLite file; defaults to ~/.cache/reagentpy/responses.sqlite3. Use ":memory:" for a throwaway cache.
+            default_ttl: seconds an entry stays fresh; None never expires.
+            ttls: per-endpoint TTLs keyed by endpoint prefix (e.g. {"/repo/timezones": 86400}); 0 disables caching.
+            max_bytes: maximum total size of the compressed bodies.
+            compression_level: zlib compression level (1-9).
+        """
+        self.path = os.path.expanduser(path or DEFAULT_CACHE_PATH)
+        self.default_ttl = default_ttl
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key_hash TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """The TTL for an endpoint: the longest matching prefix in ttls, else default_ttl."""
+        return ttl_for_endpoint(endpoint, self.ttls, self.default_ttl)
+
+    def get(self, key: str) -> Optional[Tuple[int, bytes]]:
+        """Return (status_code, body) for a fresh entry, or None."""
+        key_hash = self._hash(key)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, body, expires_at FROM responses WHERE key_hash = ?", (key_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            status_code, body, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._connection.execute("DELETE FROM responses WHERE key_hash = ?", (key_hash,))
+                return None
+            self._connection.execute("UPDATE responses SET last_access = ? WHERE key_hash = ?", (now, key_hash))
+        return status_code, zlib.decompress(body)
+
+    def set(self, key: str, endpoint: str, status_code: int, content: bytes, ttl: Any = _ENDPOINT_TTL):
+        """Store a body under key, then evict down to max_bytes. ttl overrides the endpoint's TTL."""
+        if ttl is _ENDPOINT_TTL:
+            ttl = self.ttl_for(endpoint)
+        if ttl == 0:
+            return
+
+        body = zlib.compress(content, self.compression_level)
+        if len(body) > self.max_bytes:
+            return
+
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._hash(key), endpoint, status_code, body, len(body), now, expires_at, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        self._connection.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims = []
+        for key_hash, size in self._connection.execute("SELECT key_hash, size FROM responses ORDER BY last_access"):
+            victims.append((key_hash,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._connection.executemany("DELETE FROM responses WHERE key_hash = ?", victims)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key_hash = ?", (self._hash(key),))
+
+    def clear(self, endpoint: Optional[str] = None):
+        """Remove every entry, or only those for one endpoint."""
+        with self._lock:
+            if endpoint is None:
+                self._connection.execute("DELETE FROM responses")
+            else:
+                self._connection.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+
+    def size(self) -> int:
+        """Total size of the stored (compressed) bodies in bytes."""
+        with self._lock:
+            (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return total
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class MemoryCache:
+    """
+    An in-process TTL/LRU cache of responses with single-flight request coalescing.
+
+    Concurrent lookups for the same key while a fetch is in flight wait for that fetch and
+    share its result instead of issuing their own request. Only successful (200) responses
+    are stored. hits, misses and coalesced count lookups, to help size the cache.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_CACHE_ENTRIES, default_ttl: Optional[float] = DEFAULT_MEMORY_CACHE_TTL,
+                 ttls: Optional[Dict[str, Optional[float]]] = None):
+        """
+        Args:
+            max_entries: number of responses kept before the least recently used is evicted.
+            default_ttl: seconds an entry stays fresh; None never expires.
+            ttls: per-endpoint TTLs keyed by endpoint prefix; 0 disables caching (coalescing still applies).
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        return ttl_for_endpoint(endpoint, self.ttls, self.default_ttl)
+
+    def _lookup(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str):
+        """Return a fresh cached value, or None. Does not count towards the stats."""
+        with self._lock:
+            entry = self._lookup(key, time.monotonic())
+        return entry[1] if entry is not None else None
+
+    def set(self, key: str, endpoint: str, value):
+        ttl = self.ttl_for(endpoint)
+        if ttl == 0 or self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, key: str, endpoint: str, fetch: Callable[[], Any], refresh: bool = False) -> Tuple[Any, str]:
+        """
+        Return (value, outcome) for key, calling fetch() at most once across concurrent callers.
+
+        outcome is CACHE_HIT, CACHE_MISS (this caller fetched) or CACHE_COALESCED (this caller
+        waited for another caller's fetch). With refresh=True a cached value is ignored.
+        """
+        with self._lock:
+            if not refresh:
+                entry = self._lookup(key, time.monotonic())
+                if entry is not None:
+                    self.hits += 1
+                    return entry[1], CACHE_HIT
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = Future()
+                self._in_flight[key] = flight
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            return flight.result(), CACHE_COALESCED
+
+        try:
+            value = fetch()
+        except BaseException as error:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.set_exception(error)
+            raise
+
+        if getattr(value, "status_code", 200) == 200:
+            self.set(key, endpoint, value)
+        with self._lock:
+            self._in_flight.pop(key, None)
+        flight.set_result(value)
+        return value, CACHE_MISS
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
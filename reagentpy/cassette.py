@@ -0,0 +1,213 @@
+"""
+Record/replay cassettes: request/response pairs stored in one compact, indexed file.
+
+    reagent = Reagent(cassette="case-study.cassette")   # records on the first run, replays afterwards
+
+Layout: a magic header, the zlib-compressed response bodies back to back, a
+zlib-compressed JSON index mapping each request key to (offset, length, status_code,
+endpoint), and a fixed-size trailer pointing at the index. Replay memory-maps the
+file and only decompresses the bodies that are asked for, with no network access.
+"""
+import atexit
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Optional, Tuple, Union
+from reagentpy.cache import cache_key
+
+MAGIC = b"RGCASSETTE1\n"
+# index offset, index length, magic
+TRAILER = struct.Struct("<QQ12s")
+
+RECORD = "record"
+REPLAY = "replay"
+AUTO = "auto"
+CASSETTE_MODES = (RECORD, REPLAY, AUTO)
+
+# Cassettes opened by path are shared process-wide so transports don't overwrite each other
+_cassettes_lock = threading.Lock()
+_cassettes: Dict[Tuple[str, str], "Cassette"] = {}
+
+
+def request_key(method: str, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None) -> str:
+    """The cache key of a request, extended with its JSON body when there is one."""
+    key = cache_key(method, endpoint, params)
+    if body is None:
+        return key
+    return key + json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class Cassette:
+    """
+    A file of recorded responses.
+
+    Args:
+        path: cassette file.
+        mode: "record" sends requests and stores the responses (entries already in the
+            file are kept unless re-recorded); "replay" serves stored responses and raises
+            LookupError for anything unrecorded; "auto" replays when the file exists and
+            records otherwise.
+        compression_level: zlib level for recorded bodies.
+    """
+
+    def __init__(self, path: str, mode: str = AUTO, compression_level: int = 6):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Cassette mode must be one of {', '.join(CASSETTE_MODES)}, not {mode!r}.")
+        self.path = os.path.expanduser(path)
+        if mode == AUTO:
+            mode = REPLAY if os.path.exists(self.path) else RECORD
+        self.mode = mode
+        self.compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap = None
+        self._index: Dict[str, list] = {}
+        # Recorded bodies, compressed, waiting for save()
+        self._recorded: Dict[str, Tuple[int, str, bytes]] = {}
+        self._dirty = False
+
+        if os.path.exists(self.path):
+            self._open()
+        if self.recording:
+            # Notebooks rarely close their clients; don't lose the recording
+            atexit.register(self.save)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def _open(self):
+        if os.path.getsize(self.path) < len(MAGIC) + TRAILER.size:
+            raise ValueError(f"{self.path} is not a reagentpy cassette.")
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._close_file()
+            raise ValueError(f"{self.path} is not a reagentpy cassette.")
+
+        index_offset, index_length, magic = TRAILER.unpack_from(self._mmap, len(self._mmap) - TRAILER.size)
+        if magic != MAGIC:
+            self._close_file()
+            raise ValueError(f"{self.path} is truncated or corrupt.")
+        self._index = json.loads(zlib.decompress(self._mmap[index_offset:index_offset + index_length]))
+
+    def get(self, key: str) -> Optional[Tuple[int, bytes]]:
+        """(status_code, body) recorded for key, or None."""
+        with self._lock:
+            if key in self._recorded:
+                status_code, _, compressed = self._recorded[key]
+                return status_code, zlib.decompress(compressed)
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            if self._mmap is None:
+                self._open()
+            offset, length, status_code, _ = entry
+            return status_code, zlib.decompress(self._mmap[offset:offset + length])
+
+    def replay(self, method: str, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None) -> Tuple[int, bytes]:
+        """(status_code, body) recorded for a request; raises LookupError if it was never recorded."""
+        recorded = self.get(request_key(method, endpoint, params, body))
+        if recorded is None:
+            raise LookupError(f"No recorded response for {method.upper()} {endpoint} {params or ''} in {self.path}.")
+        return recorded
+
+    def record(self, key: str, endpoint: str, status_code: int, content: bytes):
+        """Store a response; it is written out on save() or close()."""
+        compressed = zlib.compress(content or b"", self.compression_level)
+        with self._lock:
+            self._recorded[key] = (status_code, endpoint, compressed)
+            self._dirty = True
+
+    def save(self):
+        """Write every recorded and previously stored response to the cassette file."""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            if self._index and self._mmap is None:
+                self._open()
+
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            index = {}
+            with open(temporary, "wb") as out:
+                out.write(MAGIC)
+                offset = len(MAGIC)
+                for key, (entry_offset, length, status_code, endpoint) in self._index.items():
+                    if key in self._recorded:
+                        continue
+                    out.write(self._mmap[entry_offset:entry_offset + length])
+                    index[key] = [offset, length, status_code, endpoint]
+                    offset += length
+                for key, (status_code, endpoint, compressed) in self._recorded.items():
+                    out.write(compressed)
+                    index[key] = [offset, len(compressed), status_code, endpoint]
+                    offset += len(compressed)
+                encoded_index = zlib.compress(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+                out.write(encoded_index)
+                out.write(TRAILER.pack(offset, len(encoded_index), MAGIC))
+
+            self._close_file()
+            os.replace(temporary, self.path)
+            self._recorded.clear()
+            self._dirty = False
+            self._open()
+
+    def _close_file(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Save any recordings and release the memory map; it is reopened if the cassette is used again."""
+        if self._dirty:
+            self.save()
+        with self._lock:
+            self._close_file()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index.keys() | self._recorded.keys())
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._recorded or key in self._index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def resolve_cassette(cassette: Union[Cassette, str, None] = None) -> Optional[Cassette]:
+    """
+    The given Cassette, a Cassette for the given path, or one configured through the
+    REAGENT_CASSETTE (path) and REAGENT_CASSETTE_MODE (record/replay/auto) environment variables.
+    """
+    if isinstance(cassette, Cassette):
+        return cassette
+    path = cassette or os.getenv("REAGENT_CASSETTE")
+    if not path:
+        return None
+    mode = os.getenv("REAGENT_CASSETTE_MODE") or AUTO
+    key = (os.path.abspath(os.path.expanduser(path)), mode)
+    with _cassettes_lock:
+        if key not in _cassettes:
+            _cassettes[key] = Cassette(path, mode=mode)
+        return _cassettes[key]
@@ -1,12 +1,85 @@
-from typing import Optional
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
+from itertools import takewhile
+from types import SimpleNamespace
+from typing import Callable, List, Optional
 import click
 from reagentpy import Reagent
+from reagentpy.metrics import percentile
+from reagentpy.streaming import streaming, write_csv, write_json, write_ndjson, write_parquet
+
+OUTPUT_FORMATS = ("csv", "json", "ndjson", "parquet")
+
+# Set while a batch worker runs a command: receives the response instead of it being written out
+_response_sink: ContextVar[Optional[Callable]] = ContextVar("reagentpy_response_sink", default=None)
 
 # CLI entry point
 @click.group()
-def cli():
+@click.option("--format", "output_format", type=click.Choice(OUTPUT_FORMATS), default="csv", show_default=True,
+              help="Output format; rows are written as they are decoded.")
+@click.option("--output", "-o", default="-", show_default=True, help="File to write to, or - for stdout.")
+@click.pass_context
+def cli(ctx, output_format, output):
     """Python wrapper for the Reagent Analytics API."""
-    pass
+    # Leave response bodies on the socket so write_response() can stream them
+    ctx.with_resource(streaming())
+
+def get_reagent(**transport_options) -> Reagent:
+    """The Reagent shared by every command in this invocation, so they reuse one pooled session."""
+    root = click.get_current_context().find_root()
+    if root.obj is None:
+        root.obj = root.with_resource(Reagent(**transport_options))
+    return root.obj
+
+def write_response(response):
+    """Stream the response's records to --output in --format."""
+    sink = _response_sink.get()
+    if sink is not None:
+        sink(response)
+        return
+
+    params = click.get_current_context().find_root().params
+    output_format, output = params["output_format"], params["output"]
+    records = response.raise_for_status().iter_records()
+
+    try:
+        if output_format == "parquet":
+            write_parquet(records, sys.stdout.buffer if output == "-" else output)
+            return
+        writer = {"csv": write_csv, "json": write_json, "ndjson": write_ndjson}[output_format]
+        if output == "-":
+            writer(records, sys.stdout)
+        else:
+            with open(output, "w", newline="", encoding="utf-8") as file:
+                writer(records, file)
+    except BrokenPipeError:
+        # The reader (e.g. head) went away; stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
+
+def chart_output() -> Optional[str]:
+    """--output for chart commands: the file to save the chart to (PNG, SVG or PDF), or None to show it for -."""
+    output = click.get_current_context().find_root().params["output"]
+    return None if output == "-" else output
+
+def write_chart(saved: Optional[str]):
+    """Echo where a chart command saved its chart, if it didn't just show it."""
+    if saved is not None:
+        click.echo(saved)
+
+def parse_country_counts(value: str) -> SimpleNamespace:
+    """--country-counts as the object the nationality charts take: a JSON object of commits per country."""
+    try:
+        countries = json.loads(value)
+    except ValueError:
+        countries = None
+    if not isinstance(countries, dict):
+        raise click.BadParameter('expected a JSON object of commits per country, e.g. \'{"US": 12, "DE": 3}\'')
+    return SimpleNamespace(countries=countries)
 
 # login command
 @cli.group()
@@ -20,8 +93,8 @@ def login(username, password):
 @cli.command()
 def status():
     """Get status of the Reagent API."""
-    response = Reagent().status()
-    click.echo(response.text())
+    response = get_reagent().status()
+    write_response(response)
 
 # community client
 @cli.group()
@@ -37,9 +110,9 @@ def community():
 @click.option("--name", help="The name of the maintainer.")
 def maintainers(repo, limit, email, name):
     """Get maintainers of a repo."""
-    client = Reagent().community()
+    client = get_reagent().community()
     response = client.maintainers(repo=repo, limit=limit, email=email, name=name)
-    click.echo(response.text())
+    write_response(response)
 
 # communities command
 @community.command()
@@ -50,9 +123,9 @@ def maintainers(repo, limit, email, name):
 @click.option("--end_date", help="The end date of the communities.")
 def communities(repo, limit, timezone, start_date, end_date):
     """Get communities of a repo."""
-    client = Reagent().community()
+    client = get_reagent().community()
     response = client.communities(repo=repo, limit=limit, timezone=timezone, start_date=start_date, end_date=end_date)
-    click.echo(response.text())
+    write_response(response)
 
 # enrichments client
 @cli.group()
@@ -69,9 +142,9 @@ def enrichments():
 @click.option("--timezone", help="The timezone.")
 def hibp(repo, limit, breach, email, timezone):
     """Given a repo name or email address, get all data breaches the entity is a part of."""
-    client = Reagent().enrichments()
+    client = get_reagent().enrichments()
     response = client.hibp(repo=repo, limit=limit, breach=breach, email=email, timezone=timezone)
-    click.echo(response.text())
+    write_response(response)
 
 # similar_repos command
 @enrichments.command()
@@ -83,9 +156,9 @@ def hibp(repo, limit, breach, email, timezone):
 @click.option("--end_date", help="The end date.")
 def similar_repos(repo, limit, email, timezone, start_date, end_date):
     """Given a repository, get similar organizations and tags common between them."""
-    client = Reagent().enrichments()
+    client = get_reagent().enrichments()
     response = client.similar_repos(repo=repo, limit=limit, email=email, timezone=timezone, start_date=start_date, end_date=end_date)
-    click.echo(response.text())
+    write_response(response)
 
 # timezone_spoof command
 @enrichments.command()
@@ -93,9 +166,9 @@ def similar_repos(repo, limit, email, timezone, start_date, end_date):
 @click.option("--limit", default=10, help="The number of timezones to return.")
 def timezone_spoof(repo, limit):
     """Given a repo name, get all fabricated timezone information."""
-    client = Reagent().enrichments()
+    client = get_reagent().enrichments()
     response = client.timezone_spoof(repo=repo, limit=limit)
-    click.echo(response.text())
+    write_response(response)
 
 # topics command
 @enrichments.command()
@@ -107,9 +180,9 @@ def timezone_spoof(repo, limit):
 @click.option("--end_date", help="The end date.")
 def topics(repo, limit, email, timezone, start_date, end_date):
     """Given a repo name, get all topics."""
-    client = Reagent().enrichments()
+    client = get_reagent().enrichments()
     response = client.topics(repo=repo, limit=limit, email=email, timezone=timezone, start_date=start_date, end_date=end_date)
-    click.echo(response.text())
+    write_response(response)
 
 # repo client
 @cli.group()
@@ -126,9 +199,9 @@ def repo():
 @click.option("--end_date", help="The end date.")
 def email_domains(repo, limit, timezone, start_date, end_date):
     """Given a repository, get all the other organizations that contributing users are working in."""
-    client = Reagent().repo()
+    client = get_reagent().repo()
     response = client.email_domains(repo=repo, limit=limit, timezone=timezone, start_date=start_date, end_date=end_date)
-    click.echo(response.text())
+    write_response(response)
 
 # timezones command
 @repo.command()
@@ -138,18 +211,18 @@ def email_domains(repo, limit, timezone, start_date, end_date):
 @click.option("--name", help="The name.")
 def timezones(repo, email, timezone, name):
     """Given a repo name, get number of commits and timezone data."""
-    client = Reagent().repo()
+    client = get_reagent().repo()
     response = client.timezones(repo=repo, email=email, timezone=timezone, name=name)
-    click.echo(response.text())
+    write_response(response)
 
 # hygiene_summary command
 @repo.command()
 @click.option("--repo", help="The repo name.")
 def hygiene_summary(repo):
     """Given a repo name, get a high-level summary of its general open-source best practices."""
-    client = Reagent().repo()
+    client = get_reagent().repo()
     response = client.hygiene_summary(repo=repo)
-    click.echo(response.text())
+    write_response(response)
 
 # repo_list command
 @repo.command()
@@ -159,9 +232,9 @@ def hygiene_summary(repo):
 @click.option("--end_date", help="The end date.")
 def repo_list(limit, timezone, start_date, end_date):
     """Given a repo name, get a high-level summary of its general open-source best practices."""
-    client = Reagent().repo()
+    client = get_reagent().repo()
     response = client.repo_list(limit=limit, timezone=timezone, start_date=start_date, end_date=end_date)
-    click.echo(response.text())
+    write_response(response)
 
 # user_commit_data command
 @repo.command()
@@ -177,11 +250,11 @@ def repo_list(limit, timezone, start_date, end_date):
 @click.option("--format_in_rows", help="Whether to format in rows.")
 def user_commit_data(repo, limit, email, name, timezone, start_date, end_date, order_by_date, include_other_repos, format_in_rows):
     """Given a repo name and timezone, get users above a certain threshold for finer-grained intelligence."""
-    client = Reagent().repo()
+    client = get_reagent().repo()
     response = client.user_commit_data(
         repo=repo, limit=limit, email=email, name=name, timezone=timezone, start_date=start_date, end_date=end_date, order_by_date=order_by_date, include_other_repos=include_other_repos, format_in_rows=format_in_rows
     )
-    click.echo(response.text())
+    write_response(response)
 
 # user client
 @cli.group()
@@ -202,11 +275,11 @@ def user():
 @click.option("--end_date", help="The end date.")
 def commit_file_community(repo, limit, email, name, order_by_date, format_in_rows, timezone, start_date, end_date):
     """Get threat scores, repos, and top developers on files."""
-    client = Reagent().user()
+    client = get_reagent().user()
     response = client.commit_file_community(
         repo=repo, limit=limit, email=email, name=name, order_by_date=order_by_date, format_in_rows=format_in_rows, timezone=timezone, start_date=start_date, end_date=end_date
     )
-    click.echo(response.text())
+    write_response(response)
 
 # post_patch command
 @user.command()
@@ -218,9 +291,9 @@ def commit_file_community(repo, limit, email, name, order_by_date, format_in_row
 @click.option("--end_date", help="The end date.")
 def post_patch(repo, limit, email, timezone, start_date, end_date):
     """Get everything a user has done, sorting by most recent suspicious activity and whether their potentially introduced security vulnerabilities have been patched."""
-    client = Reagent().user()
+    client = get_reagent().user()
     response = client.post_patch(repo=repo, limit=limit, email=email, timezone=timezone, start_date=start_date, end_date=end_date)
-    click.echo(response.text())
+    write_response(response)
 
 # profile command
 @user.command()
@@ -233,9 +306,9 @@ def post_patch(repo, limit, email, timezone, start_date, end_date):
 @click.option("--end_date", help="The end date.")
 def profile(repo, limit, email, name, timezone, start_date, end_date):
     """Get contributor profiles for a given user."""
-    client = Reagent().user()
+    client = get_reagent().user()
     response = client.profile(repo=repo, limit=limit, email=email, name=name, timezone=timezone, start_date=start_date, end_date=end_date)
-    click.echo(response.text())
+    write_response(response)
 
 # timezone visualization client
 @cli.group()
@@ -245,49 +318,54 @@ def timezone_visualizations():
 
 # show_logarithmic_bar_chart visualization command
 @timezone_visualizations.command()
-@click.option("--api-response", help="API query response from RepoClient().timezones")
-def show_logarithmic_bar_chart(api_response):
+@click.option("--repo", required=True, help="The repo name.")
+def show_logarithmic_bar_chart(repo):
     """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().timezone_visualizations()
-    response = client.show_logarithmic_bar_chart(response=api_response)
-    click.echo(response.text())
+    client = get_reagent().timezone_visualizations()
+    write_chart(client.show_logarithmic_bar_chart(repo, output=chart_output()))
 
 # plot_timezone_distribution visualization command
 @timezone_visualizations.command()
-@click.option("--api-response", help="API query response from RepoClient().timezones")
-def plot_timezone_distribution(api_response):
+@click.option("--repo", required=True, help="The repo name.")
+def plot_timezone_distribution(repo):
     """Visualize timezones in a bar chart!"""
-    client = Reagent().timezone_visualizations()
-    response = client.plot_timezone_distribution(response=api_response)
-    click.echo(response.text())
+    client = get_reagent().timezone_visualizations()
+    write_chart(client.plot_timezone_distribution(repo, output=chart_output()))
 
 # plot_timezone_distribution_color visualization command
 @timezone_visualizations.command()
-@click.option("--api-response", help="API query response from RepoClient().timezones")
-def plot_timezone_distribution_color(api_response):
+@click.option("--repo", required=True, help="The repo name.")
+def plot_timezone_distribution_color(repo):
     """Visualize timezones in a (colored) bar chart!"""
-    client = Reagent().timezone_visualizations()
-    response = client.plot_timezone_distribution_color(response=api_response)
-    click.echo(response.text())
+    client = get_reagent().timezone_visualizations()
+    write_chart(client.plot_timezone_distribution_color(repo, output=chart_output()))
 
 # get_top_n_timezones visualization command
 @timezone_visualizations.command()
-@click.option("--api-response", help="API query response from RepoClient().timezones")
+@click.option("--repo", required=True, help="The repo name.")
 @click.option("--timezone-count", default=10, help="Top number of timezones to return, in order")
-def get_top_n_timezones(api_response, tz_count):
+def get_top_n_timezones(repo, timezone_count):
     """List each timezone commits occur in within a given repo, from most to least!"""
-    client = Reagent().timezone_visualizations()
-    response = client.get_top_n_timezones(response=api_response, N=tz_count)
-    click.echo(response.text())
+    client = get_reagent().timezone_visualizations()
+    click.echo(client.get_top_n_timezones(repo, N=timezone_count))
 
 # build_and_show_timezone_map visualization command
 @timezone_visualizations.command()
-@click.option("--api-response", help="API query response from RepoClient().timezones")
-def build_and_show_timezone_map(api_response):
-    """List each timezone commits occur in within a given repo, from most to least!"""
-    client = Reagent().timezone_visualizations()
-    response = client.build_and_show_timezone_map(response=api_response)
-    click.echo(response.text())
+@click.option("--repo", required=True, help="The repo name.")
+@click.option("--rasterized", is_flag=True, help="Color a cached image of the map instead of drawing every boundary.")
+def build_and_show_timezone_map(repo, rasterized):
+    """Map where a repo's commits come from, colored by commits per timezone!"""
+    client = get_reagent().timezone_visualizations()
+    write_chart(client.build_and_show_timezone_map(repo, rasterized=rasterized, output=chart_output()))
+
+# build_boundary_store command
+@timezone_visualizations.command()
+@click.argument("geojson", type=click.Path(exists=True, dir_okay=False))
+@click.option("--store", help="Where to write the boundary store (default: REAGENT_TIMEZONE_STORE or ~/.cache/reagentpy)")
+def build_boundary_store(geojson, store):
+    """Convert timezone-boundary-builder's combined-now.json into the memory-mapped store the maps load."""
+    from reagentpy.visualizations.timezone_boundaries import build_boundary_store as build_store
+    click.echo(build_store(geojson, store))
 
 # demo (all other) visualization client
 @cli.group()
@@ -297,70 +375,62 @@ def demo_visualizations():
 
 # wordcloud visualization command
 @demo_visualizations.command()
-@click.option("--api-response", help="API query response from RepoClient().email_donains")
-def wordcloud(api_response):
-    """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().demo_visualizations()
-    response = client.wordcloud(response=api_response)
-    click.echo(response.text())
+@click.option("--repo", required=True, help="The repo name.")
+def wordcloud(repo):
+    """Visualize a repo's email domains as a word cloud!"""
+    client = get_reagent().demo_visualizations()
+    write_chart(client.wordcloud(repo, output=chart_output()))
 
 # print_hygiene_summary visualization command
 @demo_visualizations.command()
-@click.option("--api-response", help="API query response from RepoClient().email_donains")
-def print_hygiene_summary(api_response):
-    """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().demo_visualizations()
-    response = client.print_hygiene_summary(response=api_response)
-    click.echo(response.text())
+@click.option("--repo", required=True, help="The repo name.")
+def print_hygiene_summary(repo):
+    """Summarize a repo's contributors, forks, license, readme and recent activity!"""
+    client = get_reagent().demo_visualizations()
+    client.print_hygiene_summary(repo)
 
-# create_out_of_five_chart visualization command
+# create_out_of_ten_chart visualization command
 @demo_visualizations.command()
-@click.option("--repo", help="The repo name.")
-@click.option("--limit", default=10, help="The number of commits to return.")
-def create_out_of_five_chart(repo: Optional[str], limit: Optional[int]):
-    """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().demo_visualizations()
-    response = client.create_out_of_five_chart(repo=repo, limit=limit)
-    click.echo(response.text())
+@click.option("--repo", required=True, help="The repo name.")
+def create_out_of_ten_chart(repo):
+    """Visualize a repo's threat scores out of ten!"""
+    client = get_reagent().demo_visualizations()
+    write_chart(client.create_out_of_ten_chart(repo, output=chart_output()))
 
 # nationality_pie_chart visualization command
 @demo_visualizations.command()
-@click.option("--repo", help="The repo name.")
-@click.option("--country-counts", default=10, help="The number of commits per country.")
+@click.option("--repo", required=True, help="The repo name.")
+@click.option("--country-counts", required=True, help="JSON object of commits per country.")
 def nationality_pie_chart(country_counts, repo):
-    """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().demo_visualizations()
-    response = client.nationality_pie_chart(country_counts, repo)
-    click.echo(response.text())
+    """Visualize contributions per country in a pie chart!"""
+    client = get_reagent().demo_visualizations()
+    write_chart(client.nationality_pie_chart(parse_country_counts(country_counts), repo, output=chart_output()))
 
 # nationality_horizontal_bar_chart visualization command
 @demo_visualizations.command()
-@click.option("--repo", help="The repo name.")
-@click.option("--country-counts", default=10, help="The number of commits per country.")
+@click.option("--repo", required=True, help="The repo name.")
+@click.option("--country-counts", required=True, help="JSON object of commits per country.")
 def nationality_horizontal_bar_chart(country_counts, repo):
-    """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().demo_visualizations()
-    response = client.nationality_horizontal_bar_chart(country_counts, repo)
-    click.echo(response.text())
+    """Visualize contributions per country in a horizontal bar!"""
+    client = get_reagent().demo_visualizations()
+    write_chart(client.nationality_horizontal_bar_chart(parse_country_counts(country_counts), repo, output=chart_output()))
 
 # hibp_pie_chart visualization command
 @demo_visualizations.command()
-@click.option("--repo", help="The repo name.")
+@click.option("--repo", required=True, help="The repo name.")
 def hibp_pie_chart(repo):
-    """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().demo_visualizations()
-    response = client.hibp_pie_chart(repo)
-    click.echo(response.text())
+    """Visualize the data breaches of a repo's contributors in a pie chart!"""
+    client = get_reagent().demo_visualizations()
+    write_chart(client.hibp_pie_chart(repo, output=chart_output()))
 
 # political_chart visualization command
 @demo_visualizations.command()
-@click.option("--repo", help="The repo name.")
-@click.option("--country-counts", default=10, help="The number of commits per country.")
+@click.option("--repo", required=True, help="The repo name.")
+@click.option("--country-counts", required=True, help="JSON object of commits per country.")
 def political_chart(country_counts, repo):
-    """Visualize timezones in a bar chart, scaled logarithmically for readability!"""
-    client = Reagent().demo_visualizations()
-    response = client.political_chart(country_counts, repo)
-    click.echo(response.text())
+    """Visualize contributions from adversarial and other countries in a horizontal bar!"""
+    client = get_reagent().demo_visualizations()
+    write_chart(client.political_chart(parse_country_counts(country_counts), repo, output=chart_output()))
 
 # composite scores client
 @cli.group()
@@ -372,46 +442,133 @@ def composite_scores():
 @composite_scores.command()
 @click.option("--repo", help="The repo name.")
 def nonadversarial_components(repo):
-    client = Reagent().composite_scores()
+    client = get_reagent().composite_scores()
     response = client.nonadversarial_components(repo=repo)
-    click.echo(response.text())
+    write_response(response)
  
 # nonadversarial_total
 @composite_scores.command()
 @click.option("--repo", help="The repo name.")
 def nonadversarial_total(repo):
-    client = Reagent().composite_scores()
+    client = get_reagent().composite_scores()
     response = client.nonadversarial_total(repo=repo)
-    click.echo(response.text())
+    write_response(response)
 
 # nonadversarial_timezones
 @composite_scores.command()
 @click.option("--repo", help="The repo name.")
 def nonadversarial_timezones(repo):
-    client = Reagent().composite_scores()
+    client = get_reagent().composite_scores()
     response = client.nonadversarial_timezones(repo=repo)
-    click.echo(response.text())
+    write_response(response)
 
 # adversarial_components
 @composite_scores.command()
 @click.option("--repo", help="The repo name.")
 def adversarial_timezones(repo):
-    client = Reagent().composite_scores()
+    client = get_reagent().composite_scores()
     response = client.adversarial_components(repo=repo)
-    click.echo(response.text())
+    write_response(response)
 
 # adversarial_timezones
 @composite_scores.command()
 @click.option("--repo", help="The repo name.")
 def adversarial_timezones(repo):
-    client = Reagent().composite_scores()
+    client = get_reagent().composite_scores()
     response = client.adversarial_timezones(repo=repo)
-    click.echo(response.text())
+    write_response(response)
 
 # adversarial_total
 @composite_scores.command()
 @click.option("--repo", help="The repo name.")
 def adversarial_total(repo):
-    client = Reagent().composite_scores()
+    client = get_reagent().composite_scores()
     response = client.adversarial_total(repo=repo)
-    click.echo(response.text())
+    write_response(response)
+
+def read_repos(path: str) -> List[str]:
+    """Repo names from a file (or - for stdin), one per line; blank lines and # comments are skipped."""
+    with click.open_file(path, "r", encoding="utf-8") as file:
+        lines = [line.strip() for line in file]
+    return [line for line in lines if line and not line.startswith("#")]
+
+def find_command(ctx, names):
+    """Resolve e.g. ("composite_scores", "adversarial_total") to the click command it names."""
+    command = cli
+    for name in names:
+        found = command.get_command(ctx, name) or command.get_command(ctx, name.replace("_", "-"))
+        if found is None:
+            raise click.UsageError(f"No such command: {' '.join(names)}")
+        command = found
+    if isinstance(command, click.Group):
+        raise click.UsageError(f"{' '.join(names)} is a group; name one of its commands.")
+    return command
+
+def run_for_repo(ctx, command, name, args, repo_option, repo):
+    """Run a command for one repo on the shared session and return its NDJSON result line."""
+    responses = []
+    token = _response_sink.set(responses.append)
+    start = time.perf_counter()
+    try:
+        with command.make_context(name, [*args, repo_option, repo], parent=ctx) as sub_ctx:
+            command.invoke(sub_ctx)
+        results = [record for response in responses for record in response.raise_for_status().iter_records()]
+        line = {"repo": repo, "status": "ok", "results": results}
+    except Exception as error:
+        line = {"repo": repo, "status": "error", "error": f"{type(error).__name__}: {error}"}
+    finally:
+        _response_sink.reset(token)
+    line["seconds"] = round(time.perf_counter() - start, 6)
+    return line
+
+# batch command
+@cli.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
+@click.argument("command", nargs=-1, required=True)
+@click.option("--repos-file", required=True, help="File with one repo per line, or - for stdin.")
+@click.option("--concurrency", default=8, show_default=True, help="Repos processed at once.")
+@click.pass_context
+def batch(ctx, command, repos_file, concurrency):
+    """
+    Run a command (e.g. "composite_scores adversarial_total") for every repo in a file.
+
+    All repos share one warm session. Each result is written to --output as an NDJSON line
+    tagged with its repo as soon as it is ready (--format is ignored); failures are
+    reported per repo without stopping the batch, and a throughput summary goes to stderr.
+    Options after the command name that are not batch options are passed to every run.
+    """
+    names = list(takewhile(lambda part: not part.startswith("-"), command))
+    args = [*command[len(names):], *ctx.args]
+    target = find_command(ctx, names)
+    name = " ".join(names)
+
+    repo_params = [param for param in target.params if param.name == "repo"]
+    if not repo_params:
+        raise click.UsageError(f"{name} does not take a --repo option.")
+    repo_option = max(repo_params[0].opts, key=len)
+    # Surface bad pass-through options once, not once per repo
+    target.make_context(name, [*args, repo_option, "org/repo"], parent=ctx)
+
+    repos = read_repos(repos_file)
+    get_reagent(pool_maxsize=max(concurrency, 1))
+    output = ctx.find_root().params["output"]
+    timings = []
+    failures = 0
+
+    start = time.perf_counter()
+    with click.open_file(output, "w", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = [pool.submit(run_for_repo, ctx, target, name, args, repo_option, repo) for repo in repos]
+        for future in as_completed(futures):
+            line = future.result()
+            timings.append(line["seconds"])
+            failures += line["status"] == "error"
+            out.write(json.dumps(line, default=str) + "\n")
+            out.flush()
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    click.echo(
+        f"{len(repos)} repos in {elapsed:.2f}s ({len(repos) / elapsed if elapsed else 0:.1f} repos/s), "
+        f"{len(repos) - failures} ok, {failures} failed, "
+        f"p50 {percentile(timings, 50) or 0:.3f}s, p95 {percentile(timings, 95) or 0:.3f}s per repo",
+        err=True,
+    )
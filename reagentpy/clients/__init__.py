@@ -1,10 +1,44 @@
-import os
+import json
+import threading
+from typing import Iterator, Optional, Sequence
 import requests
-from dotenv import load_dotenv
-import pandas as pd
-from reagentpy.constants import VERSION, REAGENTPY_USER_AGENT, REAGENT_BASE_URL
+from reagentpy.arrow import as_records, import_pyarrow, records_to_table
+from reagentpy.streaming import DEFAULT_CHUNK_SIZE, iter_content_chunks, iter_json_records, write_csv, write_parquet
+
+# Sentinel for views that have not been computed yet
+_UNSET = object()
+
+_display_options_lock = threading.Lock()
+_display_options_set: bool = False
+
+
+def configure_pandas_display():
+    """Show full cell contents and all rows/columns when printing DataFrames. Applied once per process."""
+    global _display_options_set
+    import pandas as pd
+
+    with _display_options_lock:
+        if _display_options_set:
+            return
+
+        # Set the maximum column width to None (or you can use -1)
+        pd.set_option("display.max_colwidth", None)
+
+        # Optionally set the maximum number of columns and rows to display
+        pd.set_option("display.max_columns", None)
+        pd.set_option("display.max_rows", None)
+
+        _display_options_set = True
+
 
 class ReagentResponse:
+    """
+    The result of a Reagent API call.
+
+    The body is decoded exactly once; the dict, DataFrame, JSON, CSV and Arrow views are built
+    lazily on first use and cached on the response, so repeated calls are free. Views are
+    shared, so copy a DataFrame before mutating it in place.
+    """
 
     response: requests.Response = None
 
@@ -12,34 +46,222 @@ class ReagentResponse:
 
     metadata: bool = False
 
-    def __init__(self, response: requests.Response, metadata: bool = False):
+    keep_raw: bool = True
+
+    from_cache: bool = False
+
+    retries: int = 0
+
+    # Route this response came from, e.g. "/commit/data"; selects the schema used by df(typed=True)
+    endpoint: str = None
+
+    # The body is still on the socket (requested inside streaming()); iter_records() can read it incrementally
+    streamed: bool = False
+
+    def __init__(self, response: requests.Response, metadata: bool = False, keep_raw: bool = True):
+        """
+        Args:
+            response: the HTTP response to wrap.
+            metadata: return the full body from dict() instead of just its "results".
+            keep_raw: keep the HTTP response (and its raw bytes) after the body is decoded.
+                Set to False to free that memory for large payloads.
+        """
         self.response = response
-        self.status_code = response.status_code
+        self.status_code = response.status_code if response is not None else None
+        self.metadata = metadata
+        self.keep_raw = keep_raw
+
+        self._lock = threading.RLock()
+        self._content = None
+        self._body = _UNSET
+        self._frames = {}
+        self._json = _UNSET
+        self._csv = _UNSET
+        self._arrow = _UNSET
+
+    @classmethod
+    def from_content(cls, content: bytes, status_code: int = 200, metadata: bool = False, keep_raw: bool = True):
+        """Build a response from raw body bytes (e.g. a cache hit) without an HTTP response."""
+        instance = cls(None, metadata=metadata, keep_raw=keep_raw)
+        instance.status_code = status_code
+        instance._content = content
+        return instance
+
+    def raise_for_status(self):
+        """Raise requests.HTTPError if the API returned an error status."""
+        if self.status_code is not None and self.status_code >= 400:
+            raise requests.HTTPError(f"Reagent API returned status {self.status_code}", response=self.response)
+        return self
+
+    def content(self):
+        """The raw body bytes, or None once they have been released."""
+        if self.response is not None:
+            return self.response.content
+        return self._content
+
+    def body(self):
+        """The decoded JSON body, including any metadata around the results."""
+        if self._body is _UNSET:
+            with self._lock:
+                if self._body is _UNSET:
+                    if self.response is not None:
+                        self._body = self.response.json()
+                    elif self._content is None:
+                        raise RuntimeError("The streamed body of this response was already consumed.")
+                    else:
+                        self._body = json.loads(self._content)
+                    self.streamed = False
+                    if not self.keep_raw:
+                        self.response = None
+                        self._content = None
+        return self._body
+
+    def release_raw(self):
+        """Decode the body if needed, then drop the HTTP response and its raw bytes."""
+        self.body()
+        self.keep_raw = False
+        self.response = None
+        self._content = None
+
+    def iter_records(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+        """
+        Yield the records dict() would return, one at a time.
+
+        A streamed response is decoded straight from the socket with bounded memory; this
+        consumes the body, so it can only be iterated once and the other views become
+        unavailable. Otherwise records are decoded from the buffered body, or taken from
+        the already decoded one.
+        """
+        if self._body is not _UNSET:
+            yield from as_records(self.dict())
+            return
+
+        if self.streamed:
+            with self._lock:
+                if not self.streamed:
+                    raise RuntimeError("The streamed body of this response was already consumed.")
+                self.streamed = False
+                response = self.response
+                self.response = None
+            try:
+                yield from iter_json_records(response.iter_content(chunk_size=chunk_size))
+            finally:
+                response.close()
+            return
+
+        content = self.content()
+        if content is None:
+            yield from as_records(self.dict())
+            return
+        yield from iter_json_records(iter_content_chunks(content, chunk_size))
 
     def dict(self):
+        body = self.body()
         if self.metadata:
-            return self.response.json()
+            return body
         else:
-            if 'results' in self.response.json():
-                return self.response.json().get('results')
+            if isinstance(body, dict) and 'results' in body:
+                return body.get('results')
             else:
-                return self.response.json()
+                return body
     
-    def df(self):
-        # Set the maximum column width to None (or you can use -1)
-        pd.set_option("display.max_colwidth", None)
+    def df(self, columns: Optional[Sequence[str]] = None, typed: bool = False, dtype_backend: Optional[str] = None):
+        """
+        The results as a DataFrame.
 
-        # Optionally set the maximum number of columns and rows to display
-        pd.set_option("display.max_columns", None)
-        pd.set_option("display.max_rows", None)
-        
-        return pd.json_normalize(self.dict())
+        Args:
+            columns: only materialize these columns (dotted names for nested fields).
+            typed: convert columns using the endpoint's schema (categorical strings,
+                downcast numbers, parsed datetimes) to cut memory and speed up groupbys.
+            dtype_backend: "pyarrow" returns a zero-copy view of arrow(), backed by Arrow
+                dtypes instead of NumPy object columns (typed is ignored; Arrow columns
+                are already typed).
+        """
+        if dtype_backend not in (None, "pyarrow"):
+            raise ValueError(f"Unsupported dtype_backend: {dtype_backend}")
+
+        key = (tuple(columns) if columns is not None else None, typed, dtype_backend)
+        frame = self._frames.get(key)
+        if frame is None:
+            with self._lock:
+                frame = self._frames.get(key)
+                if frame is None:
+                    frame = self._frames[key] = self._build_df(columns, typed, dtype_backend)
+        return frame
+
+    def _build_df(self, columns: Optional[Sequence[str]], typed: bool, dtype_backend: Optional[str]):
+        # pandas is imported on first use to keep client imports light
+        import pandas as pd
+        from reagentpy.endpoints import get_endpoint
+        from reagentpy.schemas import apply_schema, project_records
+
+        configure_pandas_display()
+
+        if dtype_backend == "pyarrow":
+            table = self.arrow()
+            if columns is not None:
+                table = table.select([column for column in columns if column in table.column_names])
+            frame = table.to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            records = self.dict()
+            if columns is not None:
+                records = project_records(as_records(records), columns)
+            frame = pd.json_normalize(records)
+
+        if columns is not None:
+            frame = frame.reindex(columns=list(columns))
+        if typed and dtype_backend is None:
+            frame = apply_schema(frame, get_endpoint(self.endpoint).schema if self.endpoint else None)
+        return frame
 
     def json(self):
-        return self.df().to_json(orient="records")
+        if self._json is _UNSET:
+            with self._lock:
+                if self._json is _UNSET:
+                    self._json = self.df().to_json(orient="records")
+        return self._json
     
     def csv(self):
-        return self.df().to_csv(index=False)
+        if self._csv is _UNSET:
+            with self._lock:
+                if self._csv is _UNSET:
+                    self._csv = self.df().to_csv(index=False)
+        return self._csv
     
     def text(self):
         return self.csv()
+
+    def arrow(self, schema=None):
+        """
+        The results as a pyarrow.Table, built directly from the decoded JSON without pandas.
+
+        Nested objects are flattened into dotted column names, like df(). Pass a
+        pyarrow.Schema to declare column types; otherwise they are inferred.
+        """
+        if schema is not None:
+            return records_to_table(as_records(self.dict()), schema=schema)
+
+        if self._arrow is _UNSET:
+            with self._lock:
+                if self._arrow is _UNSET:
+                    self._arrow = records_to_table(as_records(self.dict()))
+        return self._arrow
+
+    def to_parquet(self, path, schema=None, **kwargs):
+        """
+        Write the results to a Parquet file (path or file-like). A streamed response is
+        written in row groups as it is decoded (kwargs go to pyarrow.parquet.ParquetWriter);
+        otherwise from arrow() (kwargs go to pyarrow.parquet.write_table).
+        """
+        if self.streamed:
+            write_parquet(self.iter_records(), path, schema=schema, **kwargs)
+            return
+
+        import_pyarrow()
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.arrow(schema=schema), path, **kwargs)
+
+    def to_csv(self, file) -> int:
+        """Write the results to CSV (path or text file) record by record; returns the number of rows."""
+        return write_csv(self.iter_records(), file)
@@ -0,0 +1,155 @@
+import time
+from typing import AsyncIterator, Optional
+from reagentpy.async_transport import AsyncReagentTransport
+from reagentpy.clients import ReagentResponse
+from reagentpy.clients.community import CommunityClient
+from reagentpy.clients.repo import RepoClient
+from reagentpy.clients.user import UserClient
+from reagentpy.clients.enrichments import EnrichmentsClient
+from reagentpy.clients.commit import CommitClient
+from reagentpy.clients.composite_scores import CompositeClient, CompositeReport
+from reagentpy.clients.generic import GenericClient
+from reagentpy.constants import VERSION, REAGENTPY_USER_AGENT, PAGINATION_OFFSET_PARAM
+from reagentpy.endpoints import get_endpoint
+from reagentpy.pagination import aiter_records
+
+
+class AsyncClientMixin:
+    """
+    Swap the blocking transport of a client for an AsyncReagentTransport.
+
+    Endpoint methods return the result of self._get/self._post, so on an async client
+    every endpoint method returns an awaitable ReagentResponse with the same signature
+    as its blocking counterpart, and every iter_* method returns an async generator.
+    """
+
+    transport: AsyncReagentTransport = None
+
+    def __init__(self, reagent_api_key: str = None, transport: Optional[AsyncReagentTransport] = None):
+        self.version = VERSION
+        self.user_agent = f"{REAGENTPY_USER_AGENT}/{self.version}"
+
+        if transport is None:
+            transport = AsyncReagentTransport(reagent_api_key=reagent_api_key)
+        self.transport = transport
+
+        self.reagent_base_url = transport.base_url
+        self.reagent_api_key = transport.reagent_api_key
+        self.session = None
+
+    def init_session(self):
+        """Open a new pooled httpx client on the underlying transport."""
+        self.transport.init_session()
+
+    async def _get(self, endpoint: str, params: Optional[dict] = None) -> ReagentResponse:
+        return await self.transport.request("GET", endpoint, params=params)
+
+    async def _post(self, endpoint: str, json: Optional[dict] = None) -> ReagentResponse:
+        return await self.transport.request("POST", endpoint, json=json)
+
+    def _iter_pages(self, endpoint: str, params: dict, page_size: Optional[int] = None,
+                    max_records: Optional[int] = None, prefetch: bool = True) -> AsyncIterator[dict]:
+        """Async generator over every record of a limit-based endpoint; use with "async for"."""
+        if not get_endpoint(endpoint).paginated:
+            raise ValueError(f"{endpoint} does not support pagination.")
+
+        async def fetch_page(offset: int, limit: int):
+            page_params = {**params, "limit": limit, PAGINATION_OFFSET_PARAM: offset}
+            return (await self._get(endpoint, params=page_params)).raise_for_status().dict()
+
+        return aiter_records(fetch_page, page_size=page_size, max_records=max_records, prefetch=prefetch)
+
+
+class AsyncCommunityClient(AsyncClientMixin, CommunityClient):
+    pass
+
+
+class AsyncRepoClient(AsyncClientMixin, RepoClient):
+    pass
+
+
+class AsyncUserClient(AsyncClientMixin, UserClient):
+    pass
+
+
+class AsyncEnrichmentsClient(AsyncClientMixin, EnrichmentsClient):
+    pass
+
+
+class AsyncCommitClient(AsyncClientMixin, CommitClient):
+    pass
+
+
+class AsyncCompositeClient(AsyncClientMixin, CompositeClient):
+
+    async def full_report(self, repo: str) -> CompositeReport:
+        """Async counterpart of CompositeClient.full_report(); the eight calls are gathered concurrently."""
+        import asyncio
+
+        calls = self._report_calls(AsyncRepoClient(transport=self.transport), AsyncEnrichmentsClient(transport=self.transport))
+
+        async def timed(call):
+            call_start = time.perf_counter()
+            response = await call(repo)
+            return response, time.perf_counter() - call_start
+
+        start = time.perf_counter()
+        results = dict(zip(calls, await asyncio.gather(*(timed(call) for call in calls.values()))))
+
+        return CompositeReport(
+            repo=repo,
+            timings={name: elapsed for name, (_, elapsed) in results.items()},
+            seconds=time.perf_counter() - start,
+            **{name: response for name, (response, _) in results.items()},
+        )
+
+
+class AsyncGenericClient(AsyncClientMixin, GenericClient):
+    pass
+
+
+class AsyncReagent:
+
+    transport: AsyncReagentTransport = None
+
+    def __init__(self, reagent_api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 transport: Optional[AsyncReagentTransport] = None, **transport_options):
+        """
+        Asyncio counterpart of Reagent. Every endpoint method of the returned clients is
+        awaitable and resolves to a ReagentResponse. All clients share one pooled
+        transport; extra keyword arguments (max_connections, max_concurrency, timeout, ...)
+        are passed to AsyncReagentTransport.
+        """
+        if transport is None:
+            transport = AsyncReagentTransport(reagent_api_key=reagent_api_key, base_url=base_url, **transport_options)
+        self.transport = transport
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    def community(self):
+        return AsyncCommunityClient(transport=self.transport)
+
+    def repo(self):
+        return AsyncRepoClient(transport=self.transport)
+
+    def user(self):
+        return AsyncUserClient(transport=self.transport)
+
+    def enrichments(self):
+        return AsyncEnrichmentsClient(transport=self.transport)
+
+    def commit(self):
+        return AsyncCommitClient(transport=self.transport)
+
+    def composite_scores(self):
+        return AsyncCompositeClient(transport=self.transport)
+
+    async def status(self):
+        return await AsyncGenericClient(transport=self.transport).get("/status")
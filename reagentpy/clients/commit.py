@@ -1,10 +1,10 @@
 from typing import Optional
-from reagentpy.clients import ReagentResponse
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
 
 class CommitClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
         
     def data(self, repo: Optional[str] = None, limit: int = 50, email: Optional[str] = None,
             timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, debug: bool = False):
@@ -20,4 +20,20 @@ class CommitClient(ReagentClient):
             "debug": debug
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/commit/data", params=query_params))
\ No newline at end of file
+        return self._get("/commit/data", params=query_params)
+
+    def iter_data(self, repo: Optional[str] = None, email: Optional[str] = None,
+            timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, debug: bool = False,
+            page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like data(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "email": email,
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date,
+            "debug": debug
+        }
+
+        return self._iter_pages("/commit/data", query_params, page_size=page_size, max_records=max_records)
\ No newline at end of file
@@ -1,10 +1,10 @@
 from typing import Optional
-from reagentpy.clients import ReagentResponse
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
 
 class CommunityClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
 
     def maintainers(self, repo: Optional[str] = None, limit: int = 10, email: Optional[str] = None,
                       name: Optional[str] = None, timezone: Optional[float] = None, file: Optional[str] = None, 
@@ -22,7 +22,25 @@ class CommunityClient(ReagentClient):
             "community": community,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/community/maintainers", params=query_params))
+        return self._get("/community/maintainers", params=query_params)
+
+    def iter_maintainers(self, repo: Optional[str] = None, email: Optional[str] = None,
+                      name: Optional[str] = None, timezone: Optional[float] = None, file: Optional[str] = None, 
+                      hibp: Optional[bool] = None, community: Optional[str] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like maintainers(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "timezone": timezone,
+            "email": email,
+            "name": name,
+            "file": file,
+            "hibp": hibp,
+            "community": community,
+        }
+
+        return self._iter_pages("/community/maintainers", query_params, page_size=page_size, max_records=max_records)
 
     def communities(self, repo: Optional[str] = None, limit: int = 10, timezone: Optional[float] = None,
                       start_date: Optional[str] = None, end_date: Optional[str] = None):
@@ -36,4 +54,18 @@ class CommunityClient(ReagentClient):
             "limit": limit,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/community/communities", params=query_params))
\ No newline at end of file
+        return self._get("/community/communities", params=query_params)
+
+    def iter_communities(self, repo: Optional[str] = None, timezone: Optional[float] = None,
+                      start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like communities(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+
+        return self._iter_pages("/community/communities", query_params, page_size=page_size, max_records=max_records)
\ No newline at end of file
@@ -1,10 +1,95 @@
-from typing import Optional
-from reagentpy.clients import ReagentResponse
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.clients import ReagentResponse
+from reagentpy.clients.enrichments import EnrichmentsClient
+from reagentpy.clients.repo import RepoClient
+from reagentpy.transport import ReagentTransport
+
+# The calls that make up a full report, in report order
+REPORT_FIELDS = (
+    "nonadversarial_components",
+    "nonadversarial_total",
+    "nonadversarial_timezones",
+    "adversarial_components",
+    "adversarial_timezones",
+    "adversarial_total",
+    "hygiene_summary",
+    "threat_score",
+)
+
+
+@dataclass
+class CompositeReport:
+    """Every composite score for one repo, plus its hygiene summary and threat score."""
+
+    repo: str
+    nonadversarial_components: ReagentResponse
+    nonadversarial_total: ReagentResponse
+    nonadversarial_timezones: ReagentResponse
+    adversarial_components: ReagentResponse
+    adversarial_timezones: ReagentResponse
+    adversarial_total: ReagentResponse
+    hygiene_summary: ReagentResponse
+    threat_score: ReagentResponse
+    # Seconds each call took, and wall time for the whole report
+    timings: Dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def raise_for_status(self):
+        """Raise requests.HTTPError if any call returned an error status."""
+        for name in REPORT_FIELDS:
+            getattr(self, name).raise_for_status()
+        return self
+
+    def dict(self) -> dict:
+        """The results of every call, keyed by report field."""
+        return {name: getattr(self, name).dict() for name in REPORT_FIELDS}
+
+
+def _timed(call: Callable, repo: str):
+    start = time.perf_counter()
+    response = call(repo)
+    return response, time.perf_counter() - start
+
 
 class CompositeClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
+
+    def _report_calls(self, repo_client, enrichments_client) -> Dict[str, Callable]:
+        calls = {name: getattr(self, name) for name in REPORT_FIELDS[:6]}
+        calls["hygiene_summary"] = repo_client.hygiene_summary
+        calls["threat_score"] = enrichments_client.threat_score
+        return calls
+
+    def full_report(self, repo: str) -> CompositeReport:
+        """
+        Given NON-OPTIONAL:
+            - repository name (formatted "parent/repo_name", case-sensitive)
+        get every composite score, the hygiene summary and the threat score in one go.
+
+        The eight calls run concurrently on this client's transport, so the report takes about
+        as long as the slowest call. Returns a CompositeReport with each response and its timing.
+        """
+        calls = self._report_calls(RepoClient(transport=self.transport), EnrichmentsClient(transport=self.transport))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="reagentpy-report") as pool:
+            # Each call sees the caller's cache mode and streaming() setting
+            futures = {name: pool.submit(contextvars.copy_context().run, _timed, call, repo)
+                       for name, call in calls.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+        return CompositeReport(
+            repo=repo,
+            timings={name: elapsed for name, (_, elapsed) in results.items()},
+            seconds=time.perf_counter() - start,
+            **{name: response for name, (response, _) in results.items()},
+        )
 
     def nonadversarial_components(self, repo: str):
         """
@@ -31,7 +116,7 @@ class CompositeClient(ReagentClient):
         """
         query_params = {"repo": repo}
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/metadata-risk/components", params=query_params))
+        return self._get("/metadata-risk/components", params=query_params)
 
     def nonadversarial_total(self, repo: str):
         """
@@ -50,7 +135,7 @@ class CompositeClient(ReagentClient):
         """
         query_params = {"repo": repo}
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/metadata-risk/total", params=query_params))
+        return self._get("/metadata-risk/total", params=query_params)
 
     def nonadversarial_timezones(self, repo: str):
         """
@@ -64,7 +149,7 @@ class CompositeClient(ReagentClient):
         """
         query_params = {"repo": repo}
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/metadata-risk/timezones", params=query_params))
+        return self._get("/metadata-risk/timezones", params=query_params)
     
     def adversarial_components(self, repo: str):
         """
@@ -76,7 +161,7 @@ class CompositeClient(ReagentClient):
         """
         query_params = {"repo": repo}
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/foreign-adversarial/components", params=query_params))
+        return self._get("/foreign-adversarial/components", params=query_params)
 
     def adversarial_timezones(self, repo: str):
         """
@@ -90,7 +175,7 @@ class CompositeClient(ReagentClient):
         """
         query_params = {"repo": repo}
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/foreign-adversarial/timezones", params=query_params))
+        return self._get("/foreign-adversarial/timezones", params=query_params)
 
     def adversarial_total(self, repo: str):
         """
@@ -106,4 +191,4 @@ class CompositeClient(ReagentClient):
         """
         query_params = {"repo": repo}
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/foreign-adversarial/total", params=query_params))
\ No newline at end of file
+        return self._get("/foreign-adversarial/total", params=query_params)
\ No newline at end of file
@@ -1,10 +1,10 @@
 from typing import Optional
-from reagentpy.clients import ReagentResponse
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
 
 class EnrichmentsClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
 
     def hibp(self, repo: Optional[str] = None, limit: int = 10, breach: Optional[str] = None,
                 email: Optional[str] = None, timezone: Optional[str] = None):
@@ -18,7 +18,21 @@ class EnrichmentsClient(ReagentClient):
             "timezone": timezone,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/hibp", params=query_params))
+        return self._get("/enrichments/hibp", params=query_params)
+
+    def iter_hibp(self, repo: Optional[str] = None, breach: Optional[str] = None,
+                email: Optional[str] = None, timezone: Optional[str] = None,
+                page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like hibp(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "breach": breach,
+            "email": email,
+            "timezone": timezone,
+        }
+
+        return self._iter_pages("/enrichments/hibp", query_params, page_size=page_size, max_records=max_records)
 
     def similar_repos(self, repo: Optional[str] = None, limit: int = 10, email: Optional[str] = None, 
                         timezone: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None):
@@ -33,7 +47,22 @@ class EnrichmentsClient(ReagentClient):
             "limit": limit,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/similar_repos", params=query_params))
+        return self._get("/enrichments/similar_repos", params=query_params)
+
+    def iter_similar_repos(self, repo: Optional[str] = None, email: Optional[str] = None, 
+                        timezone: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                        page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like similar_repos(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "email": email,
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+
+        return self._iter_pages("/enrichments/similar_repos", query_params, page_size=page_size, max_records=max_records)
     
     def timezone_spoof(self, repo: Optional[str] = None, limit: int = 10):
         """Given a repo name, get all fabricated timezone information."""
@@ -43,7 +72,16 @@ class EnrichmentsClient(ReagentClient):
             "limit": limit,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/timezone_spoof", params=query_params))
+        return self._get("/enrichments/timezone_spoof", params=query_params)
+
+    def iter_timezone_spoof(self, repo: Optional[str] = None, page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like timezone_spoof(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+        }
+
+        return self._iter_pages("/enrichments/timezone_spoof", query_params, page_size=page_size, max_records=max_records)
     
     def topics(self, repo: Optional[str] = None, limit: int = 10, email: Optional[str] = None,
                         timezone: Optional[str] = None, name: Optional[str] = None):
@@ -57,7 +95,21 @@ class EnrichmentsClient(ReagentClient):
             "timezone": timezone,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/topics", params=query_params))
+        return self._get("/enrichments/topics", params=query_params)
+
+    def iter_topics(self, repo: Optional[str] = None, email: Optional[str] = None,
+                        timezone: Optional[str] = None, name: Optional[str] = None,
+                        page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like topics(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "email": email,
+            "name": name,
+            "timezone": timezone,
+        }
+
+        return self._iter_pages("/enrichments/topics", query_params, page_size=page_size, max_records=max_records)
     
     def threat_summary(self, repo: Optional[str] = None, adversarial: Optional[bool] = None, limit: int = 10):
         """Given a kind of threat and repo name, get threat score info (project fragmentation, unfocused contribution, context switching, interactive churn)."""
@@ -67,7 +119,7 @@ class EnrichmentsClient(ReagentClient):
             "limit": limit,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/threat/summary", params=query_params))
+        return self._get("/enrichments/threat/summary", params=query_params)
     
     def threat_score(self, repo: Optional[str] = None):
         """Given a kind of threat and repo name, get threat score info (project fragmentation, unfocused contribution, context switching, interactive churn)."""
@@ -75,7 +127,7 @@ class EnrichmentsClient(ReagentClient):
             "repo": repo
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/threat/score", params=query_params))
+        return self._get("/enrichments/threat/score", params=query_params)
     
     def threat_scores_for_visualizations(self, repo: Optional[str] = None, limit: Optional[int] = None):
         """Given a repo name, get threat scores for visualization purposes."""
@@ -84,7 +136,7 @@ class EnrichmentsClient(ReagentClient):
             "limit": limit
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/visualizations/get_threat_scores", params=query_params))
+        return self._get("/enrichments/visualizations/get_threat_scores", params=query_params)
     
     def hibp_for_visualizations(self, repo: Optional[str] = None, limit: int = 50):
         """Given a repo name, get hibp data for visualization purposes."""
@@ -93,4 +145,4 @@ class EnrichmentsClient(ReagentClient):
             "limit": limit
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/enrichments/visualizations/hibp", params=query_params))
+        return self._get("/enrichments/visualizations/hibp", params=query_params)
@@ -1,14 +1,15 @@
-from reagentpy.clients import ReagentResponse
+from typing import Optional
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
 
 class GenericClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
 
     def get(self, endpoint: str, **kwargs):
         """Generic get request to the Reagent API."""
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}{endpoint}", params=kwargs))
+        return self._get(endpoint, params=kwargs)
     
     def post(self, endpoint: str, **kwargs):
         """Generic post request to the Reagent API."""
-        return ReagentResponse(self.session.post(f"{self.reagent_base_url}{endpoint}", json=kwargs))
\ No newline at end of file
+        return self._post(endpoint, json=kwargs)
\ No newline at end of file
@@ -1,10 +1,10 @@
 from typing import Optional
-from reagentpy.clients import ReagentResponse
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
 
 class RepoClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
 
     def email_domains(self, repo: Optional[str] = None, limit: int = 10, 
                       timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None):
@@ -18,7 +18,21 @@ class RepoClient(ReagentClient):
             "end_date": end_date,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/repo/email_domains", params=query_params))
+        return self._get("/repo/email_domains", params=query_params)
+
+    def iter_email_domains(self, repo: Optional[str] = None, 
+                      timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like email_domains(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+
+        return self._iter_pages("/repo/email_domains", query_params, page_size=page_size, max_records=max_records)
 
     def timezones(self, repo: Optional[str] = None, email: Optional[str] = None,
                       timezone: Optional[float] = None, name: Optional[str] = None):
@@ -31,7 +45,7 @@ class RepoClient(ReagentClient):
             "timezone": timezone,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/repo/timezones", params=query_params))
+        return self._get("/repo/timezones", params=query_params)
     
 
     def user_commit_data(self, repo: Optional[str] = None, limit: int = 10, email: Optional[str] = None, name: Optional[str] = None,
@@ -52,7 +66,27 @@ class RepoClient(ReagentClient):
             "format_in_rows": format_in_rows,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/repo/user_commit_data", params=query_params))
+        return self._get("/repo/user_commit_data", params=query_params)
+
+    def iter_user_commit_data(self, repo: Optional[str] = None, email: Optional[str] = None, name: Optional[str] = None,
+                      timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      order_by_date: Optional[bool] = None, include_other_repos: Optional[bool] = None, format_in_rows: Optional[bool] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like user_commit_data(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "email": email,
+            "name": name,
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date,
+            "order_by_date": order_by_date,
+            "include_other_repos": include_other_repos,
+            "format_in_rows": format_in_rows,
+        }
+
+        return self._iter_pages("/repo/user_commit_data", query_params, page_size=page_size, max_records=max_records)
     
 
     def hygiene_summary(self, repo: str):
@@ -62,7 +96,7 @@ class RepoClient(ReagentClient):
             "repo": repo
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/repo/hygiene_summary", params=query_param))
+        return self._get("/repo/hygiene_summary", params=query_param)
     
 
     def repo_list(self, limit: Optional[int] = 50, timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None):
@@ -75,4 +109,16 @@ class RepoClient(ReagentClient):
             "end_date": end_date
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/repo/list", params=query_params))
\ No newline at end of file
+        return self._get("/repo/list", params=query_params)
+
+    def iter_repo_list(self, timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like repo_list(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date
+        }
+
+        return self._iter_pages("/repo/list", query_params, page_size=page_size, max_records=max_records)
\ No newline at end of file
@@ -1,10 +1,10 @@
 from typing import Optional
-from reagentpy.clients import ReagentResponse
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
 
 class UserClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
 
     def commit_file_community(self, repo: Optional[str] = None, limit: int = 10, email: Optional[str] = None, name: Optional[str] = None,
                       order_by_date: Optional[bool] = None, format_in_rows: Optional[bool] = None,
@@ -23,7 +23,26 @@ class UserClient(ReagentClient):
             "format_in_rows": format_in_rows,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/user/commit_file_community", params=query_params))
+        return self._get("/user/commit_file_community", params=query_params)
+
+    def iter_commit_file_community(self, repo: Optional[str] = None, email: Optional[str] = None, name: Optional[str] = None,
+                      order_by_date: Optional[bool] = None, format_in_rows: Optional[bool] = None,
+                      timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like commit_file_community(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "email": email,
+            "name": name,
+            "timezone": timezone,
+            "order_by_date": order_by_date,
+            "start_date": start_date,
+            "end_date": end_date,
+            "format_in_rows": format_in_rows,
+        }
+
+        return self._iter_pages("/user/commit_file_community", query_params, page_size=page_size, max_records=max_records)
 
     def post_patch(self, repo: Optional[str] = None, limit: int = 10, email: Optional[str] = None,
                       timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None):
@@ -38,7 +57,22 @@ class UserClient(ReagentClient):
             "end_date": end_date,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/user/post_patch", params=query_params))
+        return self._get("/user/post_patch", params=query_params)
+
+    def iter_post_patch(self, repo: Optional[str] = None, email: Optional[str] = None,
+                      timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like post_patch(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "repo": repo,
+            "email": email,
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+
+        return self._iter_pages("/user/post_patch", query_params, page_size=page_size, max_records=max_records)
 
 
     def profile(self, limit: int = 10, email: Optional[str] = None, name: Optional[str] = None,
@@ -54,4 +88,19 @@ class UserClient(ReagentClient):
             "end_date": end_date,
         }
 
-        return ReagentResponse(self.session.get(f"{self.reagent_base_url}/user/profile", params=query_params))
\ No newline at end of file
+        return self._get("/user/profile", params=query_params)
+
+    def iter_profile(self, email: Optional[str] = None, name: Optional[str] = None,
+                      timezone: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      page_size: Optional[int] = None, max_records: Optional[int] = None):
+        """Like profile(), but yields every matching record, fetching pages of results as needed."""
+
+        query_params = {
+            "email": email,
+            "name": name,
+            "timezone": timezone,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+
+        return self._iter_pages("/user/profile", query_params, page_size=page_size, max_records=max_records)
\ No newline at end of file
@@ -1,3 +1,62 @@
 VERSION = "0.1.0"
 REAGENTPY_USER_AGENT = "reagentpy"
-REAGENT_BASE_URL = "https://api.reagentanalytics.com/v1"
\ No newline at end of file
+REAGENT_BASE_URL = "https://api.reagentanalytics.com/v1"
+
+# Connection pool defaults for the shared transport
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# (connect, read) timeout in seconds applied to every request
+DEFAULT_TIMEOUT = (10.0, 300.0)
+
+# Response cache defaults
+DEFAULT_CACHE_PATH = "~/.cache/reagentpy/responses.sqlite3"
+DEFAULT_CACHE_TTL = 60 * 60
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Per-endpoint TTL overrides in seconds, matched by longest endpoint prefix (0 disables caching)
+DEFAULT_CACHE_TTLS = {
+    "/status": 0,
+}
+
+# In-process response cache defaults
+DEFAULT_MEMORY_CACHE_ENTRIES = 1024
+DEFAULT_MEMORY_CACHE_TTL = 60
+
+# Date-partitioned cache defaults
+DEFAULT_PARTITION_GRANULARITY = "day"
+# Partitions this close to today may still receive records, so they expire quickly
+PARTITION_SETTLE_DAYS = 2
+DEFAULT_PARTITION_OPEN_TTL = 15 * 60
+DEFAULT_PARTITION_CLOSED_TTL = 7 * 24 * 60 * 60
+DEFAULT_PARTITION_ENTRIES = 100000
+# Queries limited to this many records go straight to the API unless every partition is cached
+DEFAULT_PARTITION_DIRECT_LIMIT = 500
+
+# Pagination of limit-based endpoints
+PAGINATION_OFFSET_PARAM = "offset"
+DEFAULT_PAGE_SIZE = 100
+MIN_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 5000
+# Pages are resized to take roughly this many seconds each
+TARGET_PAGE_SECONDS = 1.0
+
+# Retry defaults
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 60.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Batch defaults
+DEFAULT_BATCH_WORKERS = 16
+
+# Timezone boundaries for the map visualizations (timezone-boundary-builder's combined-now.json)
+DEFAULT_TIMEZONE_GEOJSON_PATH = "combined-now.json"
+DEFAULT_TIMEZONE_STORE_PATH = "~/.cache/reagentpy/timezone-boundaries.arrow"
+# Levels of detail for timezone maps: simplification tolerances in degrees (0 keeps full resolution)
+TIMEZONE_SIMPLIFY_TOLERANCES = (0.0, 0.01, 0.05, 0.2)
+# Width in pixels of the cached label image used by rasterized timezone maps (height is half)
+DEFAULT_TIMEZONE_RASTER_WIDTH = 2048
+# Charts a render_charts() worker process renders before it is replaced
+DEFAULT_RENDER_TASKS_PER_CHILD = 50
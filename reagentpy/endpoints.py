@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Union
+from reagentpy.schemas import (
+    ColumnSchema,
+    IDENTITY_COLUMNS,
+    COMMIT_COLUMNS,
+    TIMEZONE_COLUMNS,
+    ENRICHMENT_COLUMNS,
+    HYGIENE_COLUMNS,
+)
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """What the client knows about a Reagent API route."""
+
+    # Route relative to the base URL, e.g. "/commit/data"
+    path: str
+
+    # Takes limit/offset and returns a list of records, so it can be paged through
+    paginated: bool = False
+
+    # Column kinds used by ReagentResponse.df(typed=True); see reagentpy.schemas
+    schema: ColumnSchema = field(default_factory=dict, hash=False)
+
+    # Record field holding each row's date when results are one record per commit, filtered by
+    # start_date/end_date, so date ranges can be cached in partitions (see reagentpy.partitions).
+    # Aggregates over a range (per user, per file, ...) must not set it.
+    date_field: Optional[str] = None
+
+    # Dated records come back most recent first rather than oldest first
+    newest_first: bool = False
+
+    # Results come back in a stable order, so a query's first n records are the first n of
+    # the same query with a larger limit; smaller limits are then sliced from cached results.
+    # A function of the query params when the order depends on them.
+    deterministic_order: Union[bool, Callable[[dict], bool]] = False
+
+    def ordered(self, params: dict) -> bool:
+        """Whether results of a query with these params come back in a stable order."""
+        if callable(self.deterministic_order):
+            return self.deterministic_order(params)
+        return self.deterministic_order
+
+
+def _ordered_by_date(params: dict) -> bool:
+    value = params.get("order_by_date")
+    return value is True or str(value).lower() == "true"
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    endpoint.path: endpoint
+    for endpoint in [
+        Endpoint("/status"),
+        # community
+        Endpoint("/community/maintainers", paginated=True, schema=IDENTITY_COLUMNS),
+        Endpoint("/community/communities", paginated=True, schema=IDENTITY_COLUMNS),
+        # enrichments
+        Endpoint("/enrichments/hibp", paginated=True, schema=ENRICHMENT_COLUMNS),
+        Endpoint("/enrichments/similar_repos", paginated=True, schema=ENRICHMENT_COLUMNS),
+        Endpoint("/enrichments/timezone_spoof", paginated=True, schema=TIMEZONE_COLUMNS),
+        Endpoint("/enrichments/topics", paginated=True, schema=ENRICHMENT_COLUMNS),
+        Endpoint("/enrichments/threat/summary"),
+        Endpoint("/enrichments/threat/score"),
+        Endpoint("/enrichments/visualizations/get_threat_scores"),
+        Endpoint("/enrichments/visualizations/hibp", schema=ENRICHMENT_COLUMNS),
+        # repo
+        Endpoint("/repo/email_domains", paginated=True, schema=ENRICHMENT_COLUMNS),
+        Endpoint("/repo/timezones", schema=TIMEZONE_COLUMNS),
+        Endpoint("/repo/user_commit_data", paginated=True, schema=COMMIT_COLUMNS, deterministic_order=_ordered_by_date),
+        Endpoint("/repo/hygiene_summary", schema=HYGIENE_COLUMNS),
+        Endpoint("/repo/list", paginated=True, schema=HYGIENE_COLUMNS),
+        # user
+        Endpoint("/user/commit_file_community", paginated=True, schema=COMMIT_COLUMNS),
+        Endpoint("/user/post_patch", paginated=True, schema=COMMIT_COLUMNS, date_field="date", newest_first=True,
+                 deterministic_order=True),
+        Endpoint("/user/profile", paginated=True, schema=COMMIT_COLUMNS),
+        # commit
+        Endpoint("/commit/data", paginated=True, schema=COMMIT_COLUMNS, date_field="date", deterministic_order=True),
+        # composite scores
+        Endpoint("/metadata-risk/components"),
+        Endpoint("/metadata-risk/total"),
+        Endpoint("/metadata-risk/timezones", schema=TIMEZONE_COLUMNS),
+        Endpoint("/foreign-adversarial/components"),
+        Endpoint("/foreign-adversarial/timezones", schema=TIMEZONE_COLUMNS),
+        Endpoint("/foreign-adversarial/total"),
+    ]
+}
+
+
+def get_endpoint(path: str) -> Endpoint:
+    """Metadata for a route; unknown routes (e.g. via GenericClient) get the defaults."""
+    return ENDPOINTS.get(path) or Endpoint(path)
@@ -0,0 +1,217 @@
+import bisect
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Recent samples kept per endpoint for percentile estimates
+DEFAULT_RESERVOIR_SIZE = 2048
+
+
+@dataclass
+class RequestEvent:
+    """What a transport reports to hooks about one request."""
+
+    method: str
+    endpoint: str
+    params: Optional[dict] = None
+    started_at: float = field(default_factory=time.time)
+
+    # Filled in before after_request is called
+    status_code: Optional[int] = None
+    latency: Optional[float] = None
+    bytes: Optional[int] = None
+    cache_hit: bool = False
+    retries: int = 0
+    error: Optional[BaseException] = None
+
+
+class RequestHook:
+    """Base class for transport hooks; override either method."""
+
+    def before_request(self, event: RequestEvent):
+        pass
+
+    def after_request(self, event: RequestEvent):
+        pass
+
+
+class CallbackHook(RequestHook):
+    """Adapts plain callables to the hook interface."""
+
+    def __init__(self, before: Optional[Callable[[RequestEvent], None]] = None,
+                 after: Optional[Callable[[RequestEvent], None]] = None):
+        self.before = before
+        self.after = after
+
+    def before_request(self, event: RequestEvent):
+        if self.before is not None:
+            self.before(event)
+
+    def after_request(self, event: RequestEvent):
+        if self.after is not None:
+            self.after(event)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    """The q-th percentile (0-100) of already sorted values, by linear interpolation."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class _EndpointStats:
+    def __init__(self, buckets: Sequence[float], reservoir_size: int):
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.errors = 0
+        self.statuses: Dict[str, int] = defaultdict(int)
+        self.samples: Deque[float] = deque(maxlen=reservoir_size)
+
+
+class LatencyCollector(RequestHook):
+    """
+    Per-endpoint latency histograms and counters, fed by transport hooks.
+
+        collector = LatencyCollector()
+        reagent = Reagent(hooks=[collector])
+        ...
+        collector.summary()["/commit/data"]["p95"]
+        print(collector.to_openmetrics())
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, reservoir_size: int = DEFAULT_RESERVOIR_SIZE):
+        self.buckets = tuple(sorted(buckets))
+        self.reservoir_size = reservoir_size
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _EndpointStats] = {}
+
+    def after_request(self, event: RequestEvent):
+        with self._lock:
+            stats = self._stats.get(event.endpoint)
+            if stats is None:
+                stats = self._stats[event.endpoint] = _EndpointStats(self.buckets, self.reservoir_size)
+
+            stats.count += 1
+            stats.retries += event.retries
+            if event.cache_hit:
+                stats.cache_hits += 1
+            if event.bytes:
+                stats.bytes += event.bytes
+            if event.error is not None:
+                stats.errors += 1
+                stats.statuses["error"] += 1
+            else:
+                stats.statuses[str(event.status_code)] += 1
+            if event.latency is not None:
+                stats.latency_sum += event.latency
+                stats.bucket_counts[bisect.bisect_left(self.buckets, event.latency)] += 1
+                stats.samples.append(event.latency)
+
+    def endpoints(self) -> List[str]:
+        with self._lock:
+            return sorted(self._stats)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-endpoint count, mean and p50/p95/p99 latency (seconds), bytes, cache hits, retries and errors."""
+        with self._lock:
+            result = {}
+            for endpoint, stats in sorted(self._stats.items()):
+                samples = sorted(stats.samples)
+                result[endpoint] = {
+                    "count": stats.count,
+                    "mean": stats.latency_sum / stats.count if stats.count else None,
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "p99": percentile(samples, 99),
+                    "bytes": stats.bytes,
+                    "cache_hits": stats.cache_hits,
+                    "retries": stats.retries,
+                    "errors": stats.errors,
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_openmetrics(self, prefix: str = "reagent") -> str:
+        """Export the collected metrics in the OpenMetrics text format."""
+        return openmetrics_text(self, prefix=prefix)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def openmetrics_text(collector: LatencyCollector, prefix: str = "reagent") -> str:
+    """Render a LatencyCollector in the OpenMetrics text exposition format."""
+    with collector._lock:
+        stats_by_endpoint = sorted(collector._stats.items())
+        buckets = collector.buckets + (float("inf"),)
+
+        lines = [
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+            f"# UNIT {prefix}_request_duration_seconds seconds",
+            f"# HELP {prefix}_request_duration_seconds Reagent API request latency, including cache hits.",
+        ]
+        for endpoint, stats in stats_by_endpoint:
+            cumulative = 0
+            for bound, count in zip(buckets, stats.bucket_counts):
+                cumulative += count
+                lines.append(f"{prefix}_request_duration_seconds_bucket{_labels(endpoint=endpoint, le=_format_bound(bound))} {cumulative}")
+            lines.append(f"{prefix}_request_duration_seconds_count{_labels(endpoint=endpoint)} {sum(stats.bucket_counts)}")
+            lines.append(f"{prefix}_request_duration_seconds_sum{_labels(endpoint=endpoint)} {stats.latency_sum}")
+
+        lines += [
+            f"# TYPE {prefix}_request_latency_seconds summary",
+            f"# UNIT {prefix}_request_latency_seconds seconds",
+            f"# HELP {prefix}_request_latency_seconds Latency quantiles over recent Reagent API requests.",
+        ]
+        for endpoint, stats in stats_by_endpoint:
+            samples = sorted(stats.samples)
+            for q in (0.5, 0.95, 0.99):
+                value = percentile(samples, q * 100)
+                if value is not None:
+                    lines.append(f"{prefix}_request_latency_seconds{_labels(endpoint=endpoint, quantile=q)} {value}")
+            # Totals over every request, like the histogram's; the reservoir only feeds the quantiles
+            lines.append(f"{prefix}_request_latency_seconds_count{_labels(endpoint=endpoint)} {sum(stats.bucket_counts)}")
+            lines.append(f"{prefix}_request_latency_seconds_sum{_labels(endpoint=endpoint)} {stats.latency_sum}")
+
+        counters = [
+            ("requests", "Reagent API requests by status.", None),
+            ("response_bytes", "Bytes received from the Reagent API.", "bytes"),
+            ("cache_hits", "Requests answered from a cache.", "cache_hits"),
+            ("retries", "Retried attempts.", "retries"),
+        ]
+        for name, help_text, attribute in counters:
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            for endpoint, stats in stats_by_endpoint:
+                if attribute is None:
+                    for status, count in sorted(stats.statuses.items()):
+                        lines.append(f"{prefix}_{name}_total{_labels(endpoint=endpoint, status=status)} {count}")
+                else:
+                    lines.append(f"{prefix}_{name}_total{_labels(endpoint=endpoint)} {getattr(stats, attribute)}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,149 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
+from reagentpy.constants import DEFAULT_PAGE_SIZE, MIN_PAGE_SIZE, MAX_PAGE_SIZE, TARGET_PAGE_SECONDS
+
+
+class AdaptivePageSize:
+    """Grow the page size while pages come back quickly, shrink it when they are slow."""
+
+    def __init__(self, initial: int = DEFAULT_PAGE_SIZE, minimum: int = MIN_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE,
+                 target_seconds: float = TARGET_PAGE_SECONDS):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.target_seconds = target_seconds
+
+    def update(self, elapsed: float, count: int) -> int:
+        """Record how long the last page of count records took and return the next page size."""
+        if elapsed > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+        elif elapsed < self.target_seconds / 2 and count >= self.size:
+            self.size = min(self.maximum, self.size * 2)
+        return self.size
+
+
+class _PageWindow:
+    """Tracks the offset and how many records are still wanted."""
+
+    def __init__(self, sizer: AdaptivePageSize, max_records: Optional[int]):
+        self.sizer = sizer
+        self.offset = 0
+        self.remaining = max_records
+
+    def next_limit(self) -> int:
+        if self.remaining is None:
+            return self.sizer.size
+        return min(self.sizer.size, self.remaining)
+
+    def advance(self, records: List[dict], limit: int, elapsed: float) -> Tuple[List[dict], bool]:
+        """Consume one page; return the records to yield and whether paging is finished."""
+        self.offset += len(records)
+        self.sizer.update(elapsed, len(records))
+        if self.remaining is not None:
+            records = records[:self.remaining]
+            self.remaining -= len(records)
+        done = len(records) < limit or self.remaining == 0
+        return records, done
+
+
+def _timed(fetch_page: Callable[[int, int], List[dict]], offset: int, limit: int) -> Tuple[List[dict], float]:
+    start = time.perf_counter()
+    records = fetch_page(offset, limit)
+    return records, time.perf_counter() - start
+
+
+def iter_pages(fetch_page: Callable[[int, int], List[dict]], page_size: Optional[int] = None,
+               max_records: Optional[int] = None, prefetch: bool = True) -> Iterator[List[dict]]:
+    """
+    Yield pages of records from fetch_page(offset, limit) until a short page comes back.
+
+    The page size adapts to how long each page takes unless page_size is given. With
+    prefetch, the next page is requested in a background thread while the caller is
+    processing the current one.
+    """
+    if page_size is not None:
+        sizer = AdaptivePageSize(page_size, page_size, page_size)
+    else:
+        sizer = AdaptivePageSize()
+    window = _PageWindow(sizer, max_records)
+    if window.remaining == 0:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reagentpy-prefetch") if prefetch else None
+    # Pages are fetched under the caller's cache mode and streaming() setting, even when prefetched
+    context = contextvars.copy_context()
+    try:
+        limit = window.next_limit()
+        if executor is not None:
+            pending = executor.submit(context.run, _timed, fetch_page, window.offset, limit)
+        while True:
+            if executor is not None:
+                records, elapsed = pending.result()
+            else:
+                records, elapsed = _timed(fetch_page, window.offset, limit)
+
+            records, done = window.advance(records, limit, elapsed)
+            if not done:
+                limit = window.next_limit()
+                if executor is not None:
+                    pending = executor.submit(context.run, _timed, fetch_page, window.offset, limit)
+
+            if records:
+                yield records
+            if done:
+                return
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_records(fetch_page: Callable[[int, int], List[dict]], page_size: Optional[int] = None,
+                 max_records: Optional[int] = None, prefetch: bool = True) -> Iterator[dict]:
+    """Like iter_pages, but yields individual records."""
+    for page in iter_pages(fetch_page, page_size=page_size, max_records=max_records, prefetch=prefetch):
+        yield from page
+
+
+async def _atimed(fetch_page: Callable[[int, int], Awaitable[List[dict]]], offset: int, limit: int) -> Tuple[List[dict], float]:
+    start = time.perf_counter()
+    records = await fetch_page(offset, limit)
+    return records, time.perf_counter() - start
+
+
+async def aiter_records(fetch_page: Callable[[int, int], Awaitable[List[dict]]], page_size: Optional[int] = None,
+                        max_records: Optional[int] = None, prefetch: bool = True) -> AsyncIterator[dict]:
+    """Async counterpart of iter_records; prefetching runs the next page as a task."""
+    import asyncio
+
+    if page_size is not None:
+        sizer = AdaptivePageSize(page_size, page_size, page_size)
+    else:
+        sizer = AdaptivePageSize()
+    window = _PageWindow(sizer, max_records)
+    if window.remaining == 0:
+        return
+
+    limit = window.next_limit()
+    pending = asyncio.ensure_future(_atimed(fetch_page, window.offset, limit))
+    try:
+        while True:
+            records, elapsed = await pending
+            pending = None
+
+            records, done = window.advance(records, limit, elapsed)
+            if not done:
+                limit = window.next_limit()
+                if prefetch:
+                    pending = asyncio.ensure_future(_atimed(fetch_page, window.offset, limit))
+
+            for record in records:
+                yield record
+            if done:
+                return
+            if pending is None:
+                pending = asyncio.ensure_future(_atimed(fetch_page, window.offset, limit))
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,270 @@
+"""
+Date-partitioned caching of start_date/end_date queries.
+
+    reagent = Reagent(partition_cache=PartitionedCache(granularity="day"))
+    reagent.commit().data(repo="org/repo", start_date="2024-01-01", end_date="2024-03-31", limit=100000)
+    reagent.commit().data(repo="org/repo", start_date="2024-01-01", end_date="2024-04-07", limit=100000)  # fetches 7 days
+
+Requests to endpoints with a date_field (see reagentpy.endpoints) are answered from day or
+month partitions of records. Only partitions that are not cached are requested; adjacent
+ones are fetched as a single paged range query and split locally by each record's date.
+Partitions near today expire quickly so sliding windows refresh just their newest slice.
+Small limits over uncached partitions are cheaper to send as they are, so they skip the
+partitions entirely.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from reagentpy.cache import ResponseCache, cache_key
+from reagentpy.clients import ReagentResponse
+from reagentpy.endpoints import get_endpoint
+from reagentpy.constants import (
+    DEFAULT_PARTITION_GRANULARITY,
+    DEFAULT_PARTITION_OPEN_TTL,
+    DEFAULT_PARTITION_CLOSED_TTL,
+    DEFAULT_PARTITION_ENTRIES,
+    DEFAULT_PARTITION_DIRECT_LIMIT,
+    PARTITION_SETTLE_DAYS,
+    PAGINATION_OFFSET_PARAM,
+    MAX_PAGE_SIZE,
+)
+
+DAY = "day"
+MONTH = "month"
+GRANULARITIES = (DAY, MONTH)
+
+# Params that select the slice of a range rather than what is in it
+_RANGE_PARAMS = ("start_date", "end_date", "limit", PAGINATION_OFFSET_PARAM)
+
+
+def parse_day(value) -> date:
+    """The calendar day of a date, datetime or ISO 8601 string."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def partition_start(day: date, granularity: str) -> date:
+    return day.replace(day=1) if granularity == MONTH else day
+
+
+def partition_end(start: date, granularity: str) -> date:
+    if granularity == MONTH:
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+    return start
+
+
+def partitions_between(start: date, end: date, granularity: str) -> List[Tuple[date, date]]:
+    """(first day, last day) of every whole partition overlapping [start, end]."""
+    partitions = []
+    current = partition_start(start, granularity)
+    while current <= end:
+        last = partition_end(current, granularity)
+        partitions.append((current, last))
+        current = last + timedelta(days=1)
+    return partitions
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class PartitionedCache:
+    """
+    Caches date-range results per day or month partition.
+
+    Args:
+        granularity: "day" or "month".
+        open_ttl: seconds partitions within PARTITION_SETTLE_DAYS of today stay fresh.
+        closed_ttl: seconds older partitions stay fresh; None never expires.
+        max_entries: partitions kept in process (least recently used are dropped).
+        page_size: page size used to fetch a range of partitions.
+        direct_limit: queries with offset + limit up to this are sent to the API as they are
+            unless all of their partitions are cached.
+        store: a ResponseCache to keep partitions on disk instead of in process.
+        today: returns the current date (UTC by default).
+
+    Each partition keeps its records in the order the API returned them, and partitions are
+    merged in the endpoint's date order (see Endpoint.newest_first) before limit/offset are
+    applied, so results match what the API itself would return.
+    """
+
+    def __init__(self, granularity: str = DEFAULT_PARTITION_GRANULARITY, open_ttl: Optional[float] = DEFAULT_PARTITION_OPEN_TTL,
+                 closed_ttl: Optional[float] = DEFAULT_PARTITION_CLOSED_TTL, max_entries: int = DEFAULT_PARTITION_ENTRIES,
+                 page_size: int = MAX_PAGE_SIZE, direct_limit: int = DEFAULT_PARTITION_DIRECT_LIMIT,
+                 store: Optional[ResponseCache] = None, today: Optional[Callable[[], date]] = None):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Partition granularity must be one of {', '.join(GRANULARITIES)}, not {granularity!r}.")
+        self.granularity = granularity
+        self.open_ttl = open_ttl
+        self.closed_ttl = closed_ttl
+        self.max_entries = max_entries
+        self.page_size = page_size
+        self.direct_limit = direct_limit
+        self.store = store
+        self.today = today or _utc_today
+
+        self._lock = threading.Lock()
+        # key -> (records, expires_at)
+        self._entries: "OrderedDict[str, Tuple[List[dict], Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def applies(self, endpoint: str, params: Optional[dict]) -> bool:
+        """Whether a GET can be answered from partitions: a dated endpoint queried with both dates."""
+        return (get_endpoint(endpoint).date_field is not None and params is not None
+                and params.get("start_date") is not None and params.get("end_date") is not None)
+
+    def _key(self, endpoint: str, params: dict, start: date) -> str:
+        return cache_key("PARTITION", endpoint, {**params, "partition": f"{self.granularity}:{start.isoformat()}"})
+
+    def _ttl(self, last_day: date) -> Optional[float]:
+        if last_day >= self.today() - timedelta(days=PARTITION_SETTLE_DAYS):
+            return self.open_ttl
+        return self.closed_ttl
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        if self.store is not None:
+            hit = self.store.get(key)
+            return json.loads(hit[1]) if hit is not None else None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            records, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return records
+
+    def set(self, key: str, endpoint: str, records: List[dict], ttl: Optional[float]):
+        if ttl == 0:
+            return
+        if self.store is not None:
+            self.store.set(key, endpoint, 200, json.dumps(records).encode("utf-8"), ttl=ttl)
+            return
+
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (records, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _fetch_range(self, transport, endpoint: str, params: dict, start: date, end: date):
+        """Every record of [start, end], paging through the endpoint; returns (records, error_response)."""
+        records = []
+        offset = 0
+        while True:
+            page_params = {**params, "start_date": start.isoformat(), "end_date": end.isoformat(),
+                           "limit": self.page_size, PAGINATION_OFFSET_PARAM: offset}
+            response = transport.send("GET", endpoint, params=page_params)
+            if response.status_code != 200:
+                return None, response
+            page = response.dict() or []
+            records.extend(page)
+            if len(page) < self.page_size:
+                return records, None
+            offset += len(page)
+
+    def request(self, transport, endpoint: str, params: dict, refresh: bool = False,
+                metadata: bool = False) -> Optional[ReagentResponse]:
+        """
+        Answer a date-range GET from cached partitions, fetching the missing ones through transport.
+        Returns None when the query should be sent as it is instead: a small limit over partitions
+        that are not all cached, dates that aren't ISO 8601 or run backwards, or records without
+        a usable date.
+        """
+        definition = get_endpoint(endpoint)
+        date_field = definition.date_field
+        try:
+            start, end = parse_day(params["start_date"]), parse_day(params["end_date"])
+        except (TypeError, ValueError):
+            return None
+        if start > end:
+            return None
+        base = {key: value for key, value in params.items() if key not in _RANGE_PARAMS and value is not None}
+        offset = int(params.get(PAGINATION_OFFSET_PARAM) or 0)
+        limit = params.get("limit")
+
+        # In the order the endpoint returns them, so runs and merged records keep the API's order
+        partitions = partitions_between(start, end, self.granularity)
+        if definition.newest_first:
+            partitions.reverse()
+        cached: Dict[date, List[dict]] = {}
+        if not refresh:
+            for first, _ in partitions:
+                records = self.get(self._key(endpoint, base, first))
+                if records is not None:
+                    cached[first] = records
+
+        if len(cached) < len(partitions) and limit is not None and offset + int(limit) <= self.direct_limit:
+            return None
+
+        # Group uncached partitions into contiguous runs, one range query each
+        runs: List[List[Tuple[date, date]]] = []
+        for partition in partitions:
+            if partition[0] in cached:
+                continue
+            if runs and _adjacent(runs[-1][-1], partition, definition.newest_first):
+                runs[-1].append(partition)
+            else:
+                runs.append([partition])
+
+        fetched = {}
+        for run in runs:
+            low, high = min(run)[0], max(run)[1]
+            records, error = self._fetch_range(transport, endpoint, base, low, high)
+            if error is not None:
+                return error
+            split: Dict[date, List[dict]] = {first: [] for first, _ in run}
+            for record in records:
+                try:
+                    first = partition_start(parse_day(record[date_field]), self.granularity)
+                except (KeyError, TypeError, ValueError):
+                    # Can't tell which partition it belongs to
+                    return None
+                split.setdefault(first, []).append(record)
+            fetched.update(split)
+
+        with self._lock:
+            self.hits += len(cached)
+            self.misses += len(partitions) - len(cached)
+        for first, last in partitions:
+            if first in fetched:
+                self.set(self._key(endpoint, base, first), endpoint, fetched[first], self._ttl(last))
+                cached[first] = fetched[first]
+
+        merged = []
+        low, high = start.isoformat(), end.isoformat()
+        for first, _ in partitions:
+            for record in cached[first]:
+                # Whole partitions may extend past the requested range
+                if low <= str(record.get(date_field))[:10] <= high:
+                    merged.append(record)
+        merged = merged[offset:offset + int(limit)] if limit is not None else merged[offset:]
+
+        response = ReagentResponse.from_content(json.dumps({"results": merged}).encode("utf-8"),
+                                                metadata=metadata, keep_raw=transport.keep_raw)
+        response.endpoint = endpoint
+        response.from_cache = not runs
+        return response
+
+
+def _adjacent(previous: Tuple[date, date], partition: Tuple[date, date], newest_first: bool) -> bool:
+    if newest_first:
+        return partition[1] + timedelta(days=1) == previous[0]
+    return previous[1] + timedelta(days=1) == partition[0]
@@ -0,0 +1,141 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from reagentpy.constants import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_BACKOFF,
+    RETRY_STATUSES,
+    IDEMPOTENT_METHODS,
+)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket: `rate` requests per second on average, bursts of up to `burst`.
+
+    Callers reserve a token and sleep until it is theirs, so waiting threads are served in
+    order. pause() stops the bucket entirely, e.g. when the server answers 429.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("Rate limit must be a positive number of requests per second.")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens and return how many seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                # Nothing refills while paused
+                self._updated = max(self._updated, self._paused_until)
+            else:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+            self._tokens -= tokens
+            wait = max(0.0, self._paused_until - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self, tokens: float = 1):
+        """Block until tokens are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """Wait on the event loop until tokens are available."""
+        import asyncio
+
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller for at least `seconds`, e.g. to honor a server's Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+# One bucket per (API key, rate, burst) so every transport using a key shares its budget
+_buckets_lock = threading.Lock()
+_buckets: Dict[Tuple[str, float, Optional[int]], TokenBucket] = {}
+
+
+def get_rate_limiter(reagent_api_key: str, rate: float, burst: Optional[int] = None) -> TokenBucket:
+    """The process-wide token bucket for an API key."""
+    key = (reagent_api_key, rate, burst)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    429 responses are retried for every method since the server did not process them;
+    5xx responses and connection errors are only retried for idempotent methods. Delays
+    grow exponentially with full jitter, and never undercut the server's Retry-After.
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF, retry_statuses: Tuple[int, ...] = RETRY_STATUSES,
+                 retry_methods: Tuple[str, ...] = IDEMPOTENT_METHODS, respect_retry_after: bool = True, jitter: bool = True):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.jitter = jitter
+
+    def should_retry(self, method: str, status_code: int, attempt: int) -> bool:
+        """Whether a response with status_code on the given (0-based) attempt should be retried."""
+        if attempt >= self.max_retries or status_code not in self.retry_statuses:
+            return False
+        return status_code == 429 or method.upper() in self.retry_methods
+
+    def should_retry_error(self, method: str, attempt: int) -> bool:
+        """Whether a connection error or timeout on the given attempt should be retried."""
+        return attempt < self.max_retries and method.upper() in self.retry_methods
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before the next attempt."""
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.respect_retry_after:
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+        return delay
@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+# Column kinds understood by apply_schema
+CATEGORY = "category"    # repeated strings, stored once per distinct value
+STRING = "string"
+INT = "int"              # downcast to the smallest integer type that fits
+FLOAT = "float"          # downcast to float32 when possible
+BOOL = "bool"
+DATETIME = "datetime"    # parsed to UTC timestamps
+
+ColumnSchema = Mapping[str, str]
+
+
+# Columns shared by many endpoints
+IDENTITY_COLUMNS: Dict[str, str] = {
+    "repo": CATEGORY,
+    "email": CATEGORY,
+    "name": CATEGORY,
+    "timezone": CATEGORY,
+    "country": CATEGORY,
+    "major_city": CATEGORY,
+}
+
+DATE_COLUMNS: Dict[str, str] = {
+    "date": DATETIME,
+    "commit_date": DATETIME,
+    "authored_date": DATETIME,
+    "committed_date": DATETIME,
+    "created_at": DATETIME,
+    "last_activity_at": DATETIME,
+}
+
+COMMIT_COLUMNS: Dict[str, str] = {
+    **IDENTITY_COLUMNS,
+    **DATE_COLUMNS,
+    "sha": STRING,
+    "total_commits": INT,
+    "commits": INT,
+    "hour": INT,
+    "weekday": CATEGORY,
+}
+
+TIMEZONE_COLUMNS: Dict[str, str] = {
+    **IDENTITY_COLUMNS,
+    "total_commits": INT,
+    "percent_of_total_commits": FLOAT,
+}
+
+ENRICHMENT_COLUMNS: Dict[str, str] = {
+    **IDENTITY_COLUMNS,
+    **DATE_COLUMNS,
+    "breach": CATEGORY,
+    "hibp_item": CATEGORY,
+    "item_count": INT,
+    "domain": CATEGORY,
+    "instances": INT,
+    "topic": CATEGORY,
+}
+
+HYGIENE_COLUMNS: Dict[str, str] = {
+    **IDENTITY_COLUMNS,
+    **DATE_COLUMNS,
+    "description": STRING,
+    "total_contributors": INT,
+    "total_timezones": INT,
+    "forks": INT,
+    "has_license": BOOL,
+    "has_readme": BOOL,
+}
+
+
+def project_records(records: Iterable[dict], columns: Sequence[str]) -> List[dict]:
+    """Keep only the keys needed to build the requested (possibly dotted) columns."""
+    keys = {column.split(".", 1)[0] for column in columns}
+    return [{key: value for key, value in record.items() if key in keys} for record in records]
+
+
+def _lossless(series, converted):
+    """converted, unless it turned values that were there into nulls; then the original series."""
+    if converted.isna().sum() > series.isna().sum():
+        return series
+    return converted
+
+
+def _downcast_numeric(series, downcast: str):
+    import pandas as pd
+
+    return _lossless(series, pd.to_numeric(series, errors="coerce", downcast=downcast))
+
+
+def apply_schema(frame, schema: Optional[ColumnSchema] = None, downcast_numbers: bool = True):
+    """
+    Convert a DataFrame's columns in place to the dtypes declared in schema.
+
+    Columns missing from the frame are ignored, and numeric or datetime columns holding
+    values that don't convert are left as they are. With downcast_numbers, numeric columns
+    not in the schema are downcast too.
+    """
+    import pandas as pd
+
+    schema = schema or {}
+    for column, kind in schema.items():
+        if column not in frame.columns:
+            continue
+        series = frame[column]
+        if kind == CATEGORY:
+            # Unhashable values (lists, dicts) can't be categories
+            if series.map(lambda value: isinstance(value, (list, dict))).any():
+                continue
+            frame[column] = series.astype("category")
+        elif kind == STRING:
+            frame[column] = series.astype("string")
+        elif kind == INT:
+            frame[column] = _downcast_numeric(series, "integer")
+        elif kind == FLOAT:
+            frame[column] = _downcast_numeric(series, "float")
+        elif kind == BOOL:
+            frame[column] = series.astype("boolean")
+        elif kind == DATETIME:
+            frame[column] = _lossless(series, pd.to_datetime(series, errors="coerce", utc=True))
+        else:
+            raise ValueError(f"Unknown column kind {kind!r} for column {column!r}")
+
+    if downcast_numbers:
+        for column in frame.columns:
+            if column in schema:
+                continue
+            series = frame[column]
+            if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                frame[column] = pd.to_numeric(series, downcast="integer")
+            elif pd.api.types.is_float_dtype(series):
+                frame[column] = pd.to_numeric(series, downcast="float")
+
+    return frame
@@ -0,0 +1,301 @@
+"""
+Incremental decoding of large responses.
+
+    with streaming():
+        response = reagent.commit().data(repo="org/repo", limit=500000)
+    for record in response.iter_records():
+        ...
+
+Inside streaming(), GET bodies are left on the socket (unless a cache or a recording
+cassette needs them) and iter_records() decodes the "results" array one record at a
+time, so memory stays bounded by a chunk plus a record instead of the whole payload.
+"""
+import codecs
+import csv
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Union
+from reagentpy.arrow import flatten_table, import_pyarrow, records_to_table
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_BATCH_SIZE = 10000
+# Batches write_parquet holds back waiting for a type for columns that have only been null
+MAX_SCHEMA_BATCHES = 8
+
+_WHITESPACE = " \t\n\r"
+
+_streaming: ContextVar[bool] = ContextVar("reagentpy_streaming", default=False)
+
+
+def is_streaming() -> bool:
+    return _streaming.get()
+
+
+@contextmanager
+def streaming(enabled: bool = True):
+    """Leave response bodies on the socket for requests made in this block, so they can be streamed."""
+    token = _streaming.set(enabled)
+    try:
+        yield
+    finally:
+        _streaming.reset(token)
+
+
+class _Reader:
+    """A text buffer over byte chunks that decodes one JSON value at a time."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping what has been consumed; False at end of input."""
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self.text_decoder.decode(b"", final=True)
+        else:
+            text = self.text_decoder.decode(chunk)
+        self.buffer = self.buffer[self.position:] + text
+        self.position = 0
+        return chunk is not None
+
+    def peek(self) -> str:
+        """The next non-whitespace character, without consuming it ("" at end of input)."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill() and self.position >= len(self.buffer):
+                return ""
+
+    def expect(self, character: str):
+        if self.peek() != character:
+            raise ValueError(f"Malformed JSON: expected {character!r} at offset {self.position}.")
+        self.position += 1
+
+    def value(self):
+        """Decode the next JSON value, reading more chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end < len(self.buffer) or self.eof:
+                self.position = end
+                return value
+            self.fill()
+
+    def array_items(self) -> Iterator:
+        self.expect("[")
+        while True:
+            character = self.peek()
+            if character == "]":
+                self.position += 1
+                return
+            if character == ",":
+                self.position += 1
+                continue
+            if character == "":
+                raise ValueError("Malformed JSON: unterminated array.")
+            yield self.value()
+
+
+def iter_json_records(chunks: Iterable[bytes], key: str = "results") -> Iterator[dict]:
+    """
+    Yield the records of a JSON body incrementally, the way ReagentResponse.dict() sees them:
+    the items of body[key] when the body is an object with that key, the items of a
+    top-level array, or the body itself when it is an object without the key.
+    """
+    reader = _Reader(chunks)
+    character = reader.peek()
+    if character == "[":
+        yield from reader.array_items()
+        return
+    if character != "{":
+        value = reader.value() if character else None
+        if value is not None:
+            raise ValueError(f"Expected a JSON object or array, got {type(value).__name__}.")
+        return
+
+    reader.expect("{")
+    other_fields = {}
+    found = False
+    while True:
+        character = reader.peek()
+        if character == "}":
+            break
+        if character == ",":
+            reader.position += 1
+            continue
+        if character == "":
+            raise ValueError("Malformed JSON: unterminated object.")
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            found = True
+            if reader.peek() == "[":
+                yield from reader.array_items()
+            else:
+                value = reader.value()
+                if isinstance(value, dict):
+                    yield value
+                elif value is not None:
+                    yield from value
+        else:
+            other_fields[name] = reader.value()
+
+    if not found:
+        yield other_fields
+
+
+def iter_content_chunks(content: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    view = memoryview(content)
+    for start in range(0, len(content), chunk_size):
+        yield view[start:start + chunk_size].tobytes()
+
+
+def iter_batches(records: Iterable[dict], batch_size: int) -> Iterator[List[dict]]:
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def flatten_record(record: dict, prefix: str = "") -> dict:
+    """Flatten nested objects into dotted keys, like pd.json_normalize."""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten_record(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def write_csv(records: Iterable[dict], file: Union[str, IO[str]], batch_size: int = 1000) -> int:
+    """
+    Write records to CSV as they arrive and return how many were written.
+
+    Columns come from the first batch of records; later keys outside them are dropped.
+    """
+    if isinstance(file, str):
+        with open(file, "w", newline="", encoding="utf-8") as handle:
+            return write_csv(records, handle, batch_size=batch_size)
+
+    writer = None
+    count = 0
+    for batch in iter_batches((flatten_record(record) for record in records), batch_size):
+        if writer is None:
+            fieldnames = list(dict.fromkeys(key for record in batch for key in record))
+            writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+        writer.writerows(batch)
+        count += len(batch)
+    return count
+
+
+def write_ndjson(records: Iterable[dict], file: IO[str]) -> int:
+    """Write one JSON document per line as records arrive and return how many were written."""
+    count = 0
+    for record in records:
+        file.write(json.dumps(record, default=str))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def write_json(records: Iterable[dict], file: IO[str]) -> int:
+    """Write records as a JSON array, one element at a time, and return how many were written."""
+    count = 0
+    file.write("[")
+    for record in records:
+        file.write(",\n" if count else "\n")
+        file.write(json.dumps(record, default=str))
+        count += 1
+    file.write("\n]\n" if count else "]\n")
+    return count
+
+
+def _conform(table, schema):
+    """table with exactly schema's columns in its order: missing ones null, the rest cast to its types."""
+    pa = import_pyarrow()
+    columns = [
+        table.column(field.name).cast(field.type) if field.name in table.column_names else pa.nulls(len(table), field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def write_parquet(records: Iterable[dict], path, schema=None, batch_size: int = DEFAULT_BATCH_SIZE, **kwargs) -> int:
+    """
+    Write records to Parquet one row group per batch and return how many were written.
+
+    Column types come from the schema, or are inferred from the records. A column that is
+    all null so far has no type yet, so batches are held back (up to MAX_SCHEMA_BATCHES)
+    until a later one types it; columns still untyped then are written as strings. Keys
+    outside the file's columns in later batches are dropped. kwargs go to
+    pyarrow.parquet.ParquetWriter.
+    """
+    pa = import_pyarrow()
+    import pyarrow.parquet as pq
+
+    writer = None
+    written = None
+    held = []
+    count = 0
+
+    def write(table):
+        nonlocal writer
+        table = flatten_table(_conform(table, written))
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema, **kwargs)
+        writer.write_table(table)
+
+    try:
+        for batch in iter_batches(records, batch_size):
+            table = records_to_table(batch, schema=schema, flatten=False)
+            count += len(batch)
+            if written is not None:
+                write(table)
+                continue
+
+            held.append(table)
+            merged = pa.unify_schemas([table.schema for table in held], promote_options="permissive")
+            untyped = any(pa.types.is_null(field.type) for field in merged)
+            if untyped and len(held) < MAX_SCHEMA_BATCHES:
+                continue
+            written = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                 for field in merged])
+            for table in held:
+                write(table)
+            held.clear()
+
+        if held:
+            # The stream ended while a column was still all null; nothing can contradict it now
+            written = pa.unify_schemas([table.schema for table in held], promote_options="permissive")
+            for table in held:
+                write(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        pq.write_table(records_to_table([], schema=schema), path, **kwargs)
+    return count
@@ -0,0 +1,329 @@
+"""
+A local stand-in for the Reagent API, for tests and benchmarks.
+
+    with StubReagentServer(latency=0.02, error_rate=0.05) as server:
+        reagent = Reagent(reagent_api_key="test", base_url=server.base_url)
+        reagent.commit().data(repo="org/repo", limit=500).df()
+
+Every /v1 route used by the clients is served with deterministic synthetic payloads.
+Limit-based routes honor limit/offset, and commit-like routes generate records per day
+inside start_date/end_date so overlapping date ranges return consistent data.
+"""
+import json
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+from reagentpy.constants import PAGINATION_OFFSET_PARAM
+
+TIMEZONES = [-8.0, -7.0, -6.0, -5.0, -3.0, 0.0, 1.0, 2.0, 3.0, 5.5, 8.0, 9.0, 10.0]
+COUNTRIES = ["US", "CA", "BR", "GB", "DE", "FR", "IN", "CN", "JP", "AU", "RU", "NG", "Unspecified"]
+CITIES = ["Los Angeles", "Denver", "Chicago", "New York", "Sao Paulo", "London", "Berlin", "Kyiv", "Moscow",
+          "Kolkata", "Shanghai", "Tokyo", "Sydney"]
+
+# Last day covered by generated commit history when end_date is not given
+DEFAULT_HISTORY_END = date(2024, 12, 31)
+DEFAULT_HISTORY_DAYS = 365
+
+
+def _parse_date(value: Optional[str], default: date) -> date:
+    if not value:
+        return default
+    return date.fromisoformat(value[:10])
+
+
+class SyntheticData:
+    """Deterministic payload generators for every route."""
+
+    def __init__(self, total_records: int = 10000, records_per_day: int = 20, record_padding: int = 0):
+        self.total_records = total_records
+        self.records_per_day = records_per_day
+        self.padding = "x" * record_padding
+
+    def _pad(self, record: dict) -> dict:
+        if self.padding:
+            record["padding"] = self.padding
+        return record
+
+    # Limit-based routes
+
+    def commit(self, i: int, day: date, params: dict) -> dict:
+        developer = (i * 7919) % 300
+        return self._pad({
+            "sha": f"{i:040x}",
+            "repo": params.get("repo") or f"org{i % 50}/repo{i % 7}",
+            "email": params.get("email") or f"dev{developer}@example{developer % 20}.com",
+            "name": params.get("name") or f"Developer {developer}",
+            "timezone": TIMEZONES[developer % len(TIMEZONES)],
+            "country": COUNTRIES[developer % len(COUNTRIES)],
+            "date": f"{day.isoformat()}T{(i * 37) % 24:02d}:{(i * 11) % 60:02d}:00Z",
+            "total_commits": 1 + (i * 31) % 97,
+        })
+
+    def dated_page(self, params: dict, offset: int, limit: int, newest_first: bool = False) -> List[dict]:
+        """Records ordered by date (oldest first by default); each day in [start_date, end_date] has records_per_day records."""
+        end = _parse_date(params.get("end_date"), DEFAULT_HISTORY_END)
+        start = _parse_date(params.get("start_date"), end - timedelta(days=DEFAULT_HISTORY_DAYS - 1))
+        total = max(0, (end - start).days + 1) * self.records_per_day
+        records = []
+        for position in range(offset, min(offset + limit, total)):
+            if newest_first:
+                day = end - timedelta(days=position // self.records_per_day)
+            else:
+                day = start + timedelta(days=position // self.records_per_day)
+            # Index records by absolute day so the same day always yields the same records
+            i = (day - date(2000, 1, 1)).days * self.records_per_day + position % self.records_per_day
+            records.append(self.commit(i, day, params))
+        return records
+
+    def listed_page(self, make: Callable[[int, dict], dict], params: dict, offset: int, limit: int) -> List[dict]:
+        return [make(i, params) for i in range(offset, min(offset + limit, self.total_records))]
+
+    def repo(self, i: int, params: dict) -> dict:
+        return self._pad({
+            "repo": f"org{i % 50}/repo{i}",
+            "description": f"Synthetic repository {i}",
+            "total_contributors": 1 + (i * 13) % 400,
+            "total_timezones": 1 + i % 12,
+            "forks": (i * 17) % 5000,
+            "has_license": i % 3 != 0,
+            "has_readme": i % 5 != 0,
+            "last_activity_at": (DEFAULT_HISTORY_END - timedelta(days=i % 400)).isoformat(),
+        })
+
+    def breach(self, i: int, params: dict) -> dict:
+        return self._pad({
+            "repo": params.get("repo") or f"org{i % 50}/repo{i % 7}",
+            "email": f"dev{i % 300}@example{i % 20}.com",
+            "breach": f"Breach{i % 40}",
+            "timezone": TIMEZONES[i % len(TIMEZONES)],
+        })
+
+    def domain(self, i: int, params: dict) -> dict:
+        return self._pad({"domain": f"example{i}.com", "instances": 1 + (i * 29) % 500})
+
+    def named(self, i: int, params: dict) -> dict:
+        return self._pad({
+            "repo": params.get("repo") or f"org{i % 50}/repo{i % 7}",
+            "name": f"item-{i}",
+            "email": f"dev{i % 300}@example{i % 20}.com",
+            "timezone": TIMEZONES[i % len(TIMEZONES)],
+            "score": round((i * 0.37) % 10, 2),
+        })
+
+    # Single-result routes
+
+    def timezone_totals(self, params: dict) -> List[dict]:
+        return [{
+            "repo": params.get("repo"),
+            "timezone_commit_totals": [
+                {"timezone": timezone, "total_commits": 1 + (index * 53) % 900}
+                for index, timezone in enumerate(TIMEZONES)
+            ],
+        }]
+
+    def timezone_percents(self, params: dict, adversarial: bool = False) -> List[dict]:
+        weights = [1 + (index * 7) % 11 for index in range(len(TIMEZONES))]
+        total = sum(weights)
+        rows = []
+        for index, timezone in enumerate(TIMEZONES):
+            row = {"timezone": timezone, "percent_of_total_commits": round(100 * weights[index] / total, 2)}
+            if adversarial:
+                row["major_city"] = CITIES[index]
+                row["country"] = COUNTRIES[index]
+            rows.append(row)
+        return rows
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that hang up early (e.g. a CLI piped into head) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubReagentServer:
+    """
+    Serve the Reagent /v1 API locally on a background thread.
+
+    Args:
+        host, port: where to listen; port 0 picks a free port.
+        latency: seconds added to every response.
+        latency_jitter: extra random latency, uniform in [0, latency_jitter].
+        error_rate: fraction of requests answered with an error from error_statuses.
+        error_statuses: statuses used for injected errors; 429s carry Retry-After.
+        retry_after: Retry-After seconds sent with injected 429s.
+        total_records: records available on limit-based routes without dates.
+        records_per_day: records generated per day on commit-like routes.
+        record_padding: bytes of filler added to each record to grow payloads.
+        seed: seed for latency jitter and error injection.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, error_statuses: Sequence[int] = (429, 500, 503), retry_after: float = 0,
+                 total_records: int = 10000, records_per_day: int = 20, record_padding: int = 0, seed: int = 0):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.data = SyntheticData(total_records=total_records, records_per_day=records_per_day, record_padding=record_padding)
+
+        self.requests: List[dict] = []
+        # Requests being handled right now, and the most handled at once
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes = self._build_routes()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid delayed-ACK stalls on keep-alive
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._handle(self)
+
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = _QuietServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _build_routes(self) -> Dict[str, Callable[[dict, int, int], object]]:
+        data = self.data
+
+        def dated(params, offset, limit):
+            return data.dated_page(params, offset, limit)
+
+        def newest_first(params, offset, limit):
+            return data.dated_page(params, offset, limit, newest_first=True)
+
+        def listed(make):
+            return lambda params, offset, limit: data.listed_page(make, params, offset, limit)
+
+        def single(make):
+            return lambda params, offset, limit: make(params)
+
+        return {
+            "/status": lambda params, offset, limit: {"status": "ok"},
+            "/community/maintainers": listed(data.named),
+            "/community/communities": listed(data.named),
+            "/enrichments/hibp": listed(data.breach),
+            "/enrichments/similar_repos": listed(data.named),
+            "/enrichments/timezone_spoof": listed(data.named),
+            "/enrichments/topics": listed(data.named),
+            "/enrichments/threat/summary": single(lambda params: [{"adversarial_totals": [
+                {"timezone_spoofs": 2.5, "adversarial_timezones": 4.0, "purpose_built_accounts": 1.5}]}]),
+            "/enrichments/threat/score": single(lambda params: [{
+                "project_fragmentation": 3.2, "unfocused_contribution": 4.1, "context_switching": 2.7, "interactive_churn": 5.0}]),
+            "/enrichments/visualizations/get_threat_scores": listed(data.named),
+            "/enrichments/visualizations/hibp": single(lambda params: [
+                {"hibp_item": f"Breach{i}", "item_count": 5 + i * 3} for i in range(8)]),
+            "/repo/email_domains": listed(data.domain),
+            "/repo/timezones": single(data.timezone_totals),
+            "/repo/user_commit_data": dated,
+            "/repo/hygiene_summary": single(lambda params: [dict(data.repo(0, params), repo=params.get("repo"))]),
+            "/repo/list": listed(data.repo),
+            "/user/commit_file_community": dated,
+            "/user/post_patch": newest_first,
+            "/user/profile": dated,
+            "/commit/data": dated,
+            "/metadata-risk/components": single(lambda params: [{
+                "project_fragmentation": 32.0, "unfocused_contribution": 41.0, "context_switching": 27.0, "interactive_churn": 50.0}]),
+            "/metadata-risk/total": single(lambda params: [{"metadata_risk_score": 37.5}]),
+            "/metadata-risk/timezones": single(data.timezone_percents),
+            "/foreign-adversarial/components": single(lambda params: [{
+                "timezone_spoof_percent": 2.5, "adversarial_timezone_percent": 4.0, "purpose_built_account_percent": 1.5}]),
+            "/foreign-adversarial/timezones": single(lambda params: data.timezone_percents(params, adversarial=True)),
+            "/foreign-adversarial/total": single(lambda params: [{"foreign_adversarial_score": 3.2}]),
+        }
+
+    def _respond(self, handler: BaseHTTPRequestHandler, status: int, body: bytes, headers: Optional[dict] = None):
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            self._serve(handler)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _serve(self, handler: BaseHTTPRequestHandler):
+        url = urlsplit(handler.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path[len("/v1"):] if url.path.startswith("/v1") else None
+
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            handler.rfile.read(length)
+
+        with self._lock:
+            self.requests.append({"method": handler.command, "path": url.path, "params": params})
+            delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0)
+            inject_error = self.error_rate and self._random.random() < self.error_rate
+            error_status = self._random.choice(self.error_statuses) if inject_error else None
+
+        if delay:
+            time.sleep(delay)
+
+        if not handler.headers.get("Authorization"):
+            return self._respond(handler, 401, b'{"error": "missing credentials"}')
+        if path not in self._routes:
+            return self._respond(handler, 404, b'{"error": "not found"}')
+        if error_status is not None:
+            headers = {"Retry-After": str(self.retry_after)} if error_status == 429 else None
+            return self._respond(handler, error_status, b'{"error": "injected"}', headers)
+
+        limit = int(params.get("limit") or 10)
+        offset = int(params.get(PAGINATION_OFFSET_PARAM) or 0)
+        try:
+            results = self._routes[path](params, offset, limit)
+        except ValueError:
+            # e.g. dates that aren't ISO 8601
+            return self._respond(handler, 400, b'{"error": "invalid parameters"}')
+        body = results if isinstance(results, dict) else {"results": results}
+        self._respond(handler, 200, json.dumps(body).encode("utf-8"))
+
+    def start(self) -> "StubReagentServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="reagent-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubReagentServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,342 @@
+import os
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from reagentpy.partitions import PartitionedCache
+from reagentpy.cassette import Cassette, request_key, resolve_cassette
+from reagentpy.cache import (
+    ResponseCache, MemoryCache, CACHE_USE, CACHE_BYPASS, CACHE_REFRESH, CACHE_MISS, cache_key, get_cache_mode,
+    limit_key, encode_limited, decode_limited, limited_content,
+)
+from reagentpy.clients import ReagentResponse
+from reagentpy.metrics import CallbackHook, RequestEvent, RequestHook
+from reagentpy.streaming import is_streaming
+from reagentpy.ratelimit import RetryPolicy, TokenBucket, get_rate_limiter
+from reagentpy.constants import (
+    VERSION,
+    REAGENTPY_USER_AGENT,
+    REAGENT_BASE_URL,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+)
+
+
+# Credentials are resolved once per process; load_dotenv() walks the filesystem
+_credentials_lock = threading.Lock()
+_credentials_loaded: bool = False
+_resolved_api_key: Optional[str] = None
+
+
+def resolve_api_key(reagent_api_key: Optional[str] = None) -> Optional[str]:
+    """Return the given API key, or the one from the environment / .env file (loaded once per process)."""
+    global _credentials_loaded, _resolved_api_key
+
+    if reagent_api_key:
+        return reagent_api_key
+
+    with _credentials_lock:
+        if not _credentials_loaded:
+            # Load environment variables from a .env file
+            load_dotenv()
+            _resolved_api_key = os.getenv("REAGENT_API_KEY")
+            _credentials_loaded = True
+
+    return _resolved_api_key
+
+
+def resolve_base_url(base_url: Optional[str] = None) -> str:
+    """Return the given base URL, the REAGENT_BASE_URL environment override, or the default."""
+    return (base_url or os.getenv("REAGENT_BASE_URL") or REAGENT_BASE_URL).rstrip("/")
+
+
+class ReagentTransport:
+    """A pooled HTTP transport shared by every client created from the same Reagent facade."""
+
+    reagent_api_key: str = None
+
+    base_url: str = None
+
+    session: requests.Session = None
+
+    cassette: Optional[Cassette] = None
+
+    def __init__(self, reagent_api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False, keep_alive: bool = True,
+                 timeout: Union[float, Tuple[float, float], None] = DEFAULT_TIMEOUT, keep_raw: bool = True,
+                 cache: Optional[ResponseCache] = None, memory_cache: Optional[MemoryCache] = None,
+                 retry: Union[RetryPolicy, bool, None] = True, rate_limit: Optional[float] = None,
+                 rate_limit_burst: Optional[int] = None, rate_limiter: Optional[TokenBucket] = None,
+                 hooks: Optional[List[RequestHook]] = None, cassette: Union[Cassette, str, None] = None,
+                 partition_cache: Optional[PartitionedCache] = None):
+        """
+        Args:
+            reagent_api_key: API key; falls back to REAGENT_API_KEY from the environment or a .env file.
+            base_url: API base URL; falls back to the REAGENT_BASE_URL environment variable, then the default.
+            pool_connections: number of per-host connection pools to cache.
+            pool_maxsize: maximum number of connections kept open per host.
+            pool_block: block when the pool is exhausted instead of opening throwaway connections.
+            keep_alive: reuse connections between requests.
+            timeout: (connect, read) timeout in seconds applied to every request.
+            keep_raw: keep raw response bytes on each ReagentResponse after its body is decoded.
+            cache: persistent response cache consulted before GET requests hit the network.
+            memory_cache: in-process cache in front of the persistent cache; coalesces concurrent identical GETs.
+            retry: RetryPolicy for 429/5xx responses and connection errors; True uses the defaults, False disables retries.
+            rate_limit: requests per second allowed for this API key, shared by every transport in the process.
+            rate_limit_burst: requests allowed in a burst above rate_limit (defaults to the rate).
+            rate_limiter: an explicit TokenBucket to use instead of rate_limit.
+            hooks: RequestHook objects notified before and after every request (see reagentpy.metrics).
+            cassette: a Cassette (or cassette path) to record responses to or replay them from;
+                defaults to the REAGENT_CASSETTE environment variable. Replaying needs no API key.
+            partition_cache: PartitionedCache answering start_date/end_date GETs to dated endpoints
+                from day or month partitions, fetching only the partitions it is missing.
+        """
+        self.reagent_api_key = resolve_api_key(reagent_api_key)
+        self.base_url = resolve_base_url(base_url)
+        self.user_agent = f"{REAGENTPY_USER_AGENT}/{VERSION}"
+        self.timeout = timeout
+        self.keep_raw = keep_raw
+        self.cache = cache
+        self.memory_cache = memory_cache
+        self.partition_cache = partition_cache
+        self.retry = RetryPolicy() if retry is True else (retry or None)
+        if rate_limiter is None and rate_limit is not None:
+            rate_limiter = get_rate_limiter(self.reagent_api_key, rate_limit, rate_limit_burst)
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or [])
+        self.cassette = resolve_cassette(cassette)
+        self.keep_alive = keep_alive
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+
+        self.init_session()
+
+    def init_session(self):
+        """Initialize a new pooled requests session."""
+
+        # Create a requests session
+        self.session = requests.Session()
+
+        # Mount a pooled adapter for both schemes
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Set the authorization header; replaying a cassette never reaches the API
+        replaying = self.cassette is not None and self.cassette.replaying
+        if not self.reagent_api_key and not replaying:
+            raise ValueError("Reagent API key environment variable not set or missing. Try \"reagent login\" to set the API key.")
+        if self.reagent_api_key:
+            self.session.headers.update({
+                "Authorization": f"Basic {self.reagent_api_key}"
+            })
+
+        # Set user agent
+        self.session.headers.update(
+            {
+                "User-Agent": f"{self.user_agent}"
+            }
+        )
+
+        if not self.keep_alive:
+            self.session.headers.update({"Connection": "close"})
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}{endpoint}"
+
+    def add_hook(self, hook: Optional[RequestHook] = None, before=None, after=None) -> RequestHook:
+        """Register a RequestHook, or plain before(event)/after(event) callables."""
+        if hook is None:
+            hook = CallbackHook(before=before, after=after)
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: RequestHook):
+        self.hooks.remove(hook)
+
+    def request(self, method: str, endpoint: str, params: Optional[dict] = None, json: Optional[dict] = None) -> ReagentResponse:
+        """Send a request to the Reagent API and wrap the result, going through the caches for GETs."""
+        if not self.hooks:
+            response, _ = self._request(method, endpoint, params, json)
+            return response
+
+        event = RequestEvent(method=method, endpoint=endpoint, params=params)
+        for hook in self.hooks:
+            hook.before_request(event)
+
+        start = time.perf_counter()
+        try:
+            response, cache_hit = self._request(method, endpoint, params, json)
+        except BaseException as error:
+            event.latency = time.perf_counter() - start
+            event.error = error
+            for hook in self.hooks:
+                hook.after_request(event)
+            raise
+
+        event.latency = time.perf_counter() - start
+        event.status_code = response.status_code
+        event.cache_hit = cache_hit
+        event.retries = 0 if cache_hit else response.retries
+        if response.streamed:
+            # Reading the body here would defeat streaming; trust the declared length
+            length = response.response.headers.get("Content-Length")
+            event.bytes = int(length) if length else None
+        else:
+            content = response.content()
+            event.bytes = len(content) if content is not None else None
+        for hook in self.hooks:
+            hook.after_request(event)
+        return response
+
+    def _request(self, method: str, endpoint: str, params: Optional[dict], json: Optional[dict]) -> Tuple[ReagentResponse, bool]:
+        """Return the response and whether it was served from a cache."""
+        mode = get_cache_mode()
+        if (self.partition_cache is not None and method.upper() == "GET" and mode != CACHE_BYPASS
+                and self.partition_cache.applies(endpoint, params)):
+            response = self.partition_cache.request(self, endpoint, params, refresh=mode == CACHE_REFRESH)
+            if response is not None:
+                return response, response.from_cache
+
+        if self._can_stream(method):
+            return self.send(method, endpoint, params=params, json=json, stream=True), False
+
+        if self.memory_cache is not None and method.upper() == "GET" and mode != CACHE_BYPASS:
+            limited = limit_key(method, endpoint, params)
+            if limited is not None and mode == CACHE_USE:
+                entry = self.memory_cache.get(limited[0])
+                if entry is not None:
+                    content = limited_content(entry[1].body(), entry[0], limited[1])
+                    if content is not None:
+                        return self._cached_response(200, content, endpoint), True
+
+            response, outcome = self.memory_cache.get_or_fetch(
+                cache_key(method, endpoint, params),
+                endpoint,
+                lambda: self.fetch(method, endpoint, params=params, json=json),
+                refresh=mode == CACHE_REFRESH,
+            )
+            if limited is not None and outcome == CACHE_MISS and response.status_code == 200:
+                # A refresh replaces the entry outright, so older and larger results can't outlive it;
+                # otherwise a miss that raced another fetch keeps the larger result
+                entry = self.memory_cache.get(limited[0])
+                if mode == CACHE_REFRESH or entry is None or limited[1] > entry[0]:
+                    self.memory_cache.set(limited[0], endpoint, (limited[1], response))
+            return response, outcome != CACHE_MISS or response.from_cache
+
+        response = self.fetch(method, endpoint, params=params, json=json)
+        return response, response.from_cache
+
+    def _can_stream(self, method: str) -> bool:
+        """Inside streaming(), leave the body on the socket unless a cache or recording cassette needs it."""
+        if not is_streaming() or method.upper() != "GET":
+            return False
+        if self.memory_cache is not None or (self.cache is not None and get_cache_mode() != CACHE_BYPASS):
+            return False
+        return self.cassette is None or not self.cassette.recording
+
+    def fetch(self, method: str, endpoint: str, params: Optional[dict] = None, json: Optional[dict] = None) -> ReagentResponse:
+        """Send a request through the persistent cache, skipping the in-process cache."""
+        mode = get_cache_mode()
+        use_cache = self.cache is not None and method.upper() == "GET" and mode != CACHE_BYPASS
+        # Endpoints with a deterministic order keep one entry per query, which answers any smaller limit
+        limited = limit_key(method, endpoint, params) if use_cache else None
+        key = limited[0] if limited is not None else cache_key(method, endpoint, params) if use_cache else None
+
+        if use_cache and mode == CACHE_USE:
+            hit = self.cache.get(key)
+            if hit is not None:
+                status_code, content = hit
+                if limited is not None:
+                    cached_limit, body = decode_limited(content)
+                    content = limited_content(body, cached_limit, limited[1])
+                if content is not None:
+                    return self._cached_response(status_code, content, endpoint)
+
+        response = self.send(method, endpoint, params=params, json=json)
+
+        if use_cache and response.status_code == 200:
+            content = response.content()
+            if limited is not None:
+                # A refresh replaces the entry with its own limit, dropping older results for larger ones
+                content = encode_limited(limited[1], content)
+            self.cache.set(key, endpoint, response.status_code, content)
+
+        return response
+
+    def _cached_response(self, status_code: int, content: bytes, endpoint: str) -> ReagentResponse:
+        response = ReagentResponse.from_content(content, status_code=status_code, keep_raw=self.keep_raw)
+        response.from_cache = True
+        response.endpoint = endpoint
+        return response
+
+    def send(self, method: str, endpoint: str, params: Optional[dict] = None, json: Optional[dict] = None,
+             stream: bool = False) -> ReagentResponse:
+        """
+        Send a request over the network (or the cassette), skipping any cache, with rate limiting and retries.
+        With stream, the body is left unread for ReagentResponse.iter_records().
+        """
+        if self.cassette is None:
+            return self._send(method, endpoint, params, json, stream)
+
+        if self.cassette.replaying:
+            status_code, content = self.cassette.replay(method, endpoint, params, json)
+            response = ReagentResponse.from_content(content, status_code=status_code, keep_raw=self.keep_raw)
+            response.endpoint = endpoint
+            return response
+
+        response = self._send(method, endpoint, params, json, stream and not self.cassette.recording)
+        if self.cassette.recording:
+            self.cassette.record(request_key(method, endpoint, params, json), endpoint, response.status_code, response.content())
+        return response
+
+    def _send(self, method: str, endpoint: str, params: Optional[dict], json: Optional[dict], stream: bool = False) -> ReagentResponse:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                raw = self.session.request(method, self.url(endpoint), params=params, json=json, timeout=self.timeout,
+                                           stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if self.retry is None or not self.retry.should_retry_error(method, attempt):
+                    raise
+                delay = self.retry.backoff(attempt)
+            else:
+                if self.retry is None or not self.retry.should_retry(method, raw.status_code, attempt):
+                    response = ReagentResponse(raw, keep_raw=self.keep_raw)
+                    response.streamed = stream
+                    response.retries = attempt
+                    response.endpoint = endpoint
+                    return response
+                delay = self.retry.backoff(attempt, raw.headers.get("Retry-After"))
+                if raw.status_code == 429 and self.rate_limiter is not None:
+                    # Hold back every caller sharing this key, not just this one
+                    self.rate_limiter.pause(delay)
+                raw.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        """Close every pooled connection and save any cassette recordings."""
+        if self.session is not None:
+            self.session.close()
+        if self.cassette is not None:
+            self.cassette.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
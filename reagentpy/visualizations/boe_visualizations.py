@@ -3,24 +3,26 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
 from reagentpy.clients.repo import RepoClient
 from reagentpy.clients.composite_scores import CompositeClient
+from reagentpy.visualizations.rendering import finish_chart
 
 
 class BOEVisClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
         self.colormap = plt.get_cmap("RdYlGn")
 
 
-    def total_chart(self, repo: str, adversarial: Optional[bool] =True):
+    def total_chart(self, repo: str, adversarial: Optional[bool] =True, output=None):
 
         if adversarial:
-            data = CompositeClient().adversarial_total(repo).dict()
+            data = CompositeClient(transport=self.transport).adversarial_total(repo).dict()
             title = "Foreign Adversarial Score out of 100%"
             score = data[0]["foreign_adversarial_score"]
         else:
-            data = CompositeClient().nonadversarial_total(repo).dict()
+            data = CompositeClient(transport=self.transport).nonadversarial_total(repo).dict()
             title = "Metadata Risk Score out of 100%"
             score = data[0]["metadata_risk_score"]
         if len(data) != 1:
@@ -46,25 +48,26 @@ class BOEVisClient(ReagentClient):
             ax.text(score, 0, f"{score:.2f}%", ha="left", va="center")
 
         plt.tight_layout()
-        plt.show()
+        return finish_chart(output)
         
 
-    def create_percent_chart(self, repo: str):
+    def create_percent_chart(self, repo: str, output=None):
+        """One bar per metric, stacked in a single figure"""
 
-        data = CompositeClient().nonadversarial_components(repo).dict()
+        data = CompositeClient(transport=self.transport).nonadversarial_components(repo).dict()
         if len(data) != 1:
             raise ValueError("Expected a single dictionary of values, but got multiple.")
         values = data[0]
 
-        # Create and display charts for each metric
-        for raw_title in values:
+        _, axes = plt.subplots(len(values), 1, figsize=(10, 1.5 * len(values)), squeeze=False)
+
+        # Create a chart for each metric
+        for ax, raw_title in zip(axes[:, 0], values):
 
             score = values[raw_title]
 
             title = f"{raw_title.replace('_', ' ').title()} out of 100%"
 
-            _, ax = plt.subplots(figsize=(10, 1.5))
-
             # colormap
             colormap = self.colormap
             normalized_values = (score)
@@ -82,14 +85,14 @@ class BOEVisClient(ReagentClient):
             else:
                 ax.text(score, 0, f"{score:.2f}%", ha="left", va="center")
 
-            plt.tight_layout()
-            plt.show()
+        plt.tight_layout()
+        return finish_chart(output)
 
     
-    def plot_percent_timezone_color(self, repo: str):
+    def plot_percent_timezone_color(self, repo: str, output=None):
         """Shows distribution across all timezones, coloring bars based on count"""
 
-        data = CompositeClient().nonadversarial_timezones(repo)
+        data = CompositeClient(transport=self.transport).nonadversarial_timezones(repo)
         timezone_commit_data = data.dict()
 
         timezone_dict = {}
@@ -119,13 +122,13 @@ class BOEVisClient(ReagentClient):
         plt.grid(axis="y", zorder=0)
         plt.gca().set_axisbelow(True)
         plt.tight_layout()
-        plt.show()
+        return finish_chart(output)
 
     
-    def show_percents_logarithmic_bar_chart(self, repo: str):
+    def show_percents_logarithmic_bar_chart(self, repo: str, output=None):
         """Show a bar chart of commits with log scale"""
 
-        data = CompositeClient().nonadversarial_timezones(repo)
+        data = CompositeClient(transport=self.transport).nonadversarial_timezones(repo)
         values = data.dict()
 
         # Create DataFrame
@@ -164,13 +167,13 @@ class BOEVisClient(ReagentClient):
         )  # Grid lines for both major and minor ticks
 
         plt.tight_layout()  # Adjust the layout
-        plt.show()
+        return finish_chart(output)
 
 
-    def plot_adversarial_percent_timezone_color(self, repo: str):
+    def plot_adversarial_percent_timezone_color(self, repo: str, output=None):
 #         """Shows distribution across all timezones, coloring bars based on count"""
 # 
-#         data = CompositeClient().adversarial_timezones(repo)
+#         data = CompositeClient(transport=self.transport).adversarial_timezones(repo)
 #         timezone_commit_data = data.dict()
 # 
 #         timezone_dict = {}
@@ -202,7 +205,7 @@ class BOEVisClient(ReagentClient):
 #         plt.tight_layout()
 #         plt.show()
         # Prepare data for the pie chart
-        data = CompositeClient().adversarial_timezones(repo)
+        data = CompositeClient(transport=self.transport).adversarial_timezones(repo)
         timezone_commit_data = data.dict()
         labels = [tz["country"] + ": " + tz["major_city"] if tz["major_city"] != "Non-Adversarial" else "Non-Adversarial" for tz in list(timezone_commit_data)]
         sizes = [tz["percent_of_total_commits"] for tz in list(timezone_commit_data)]
@@ -218,13 +221,13 @@ class BOEVisClient(ReagentClient):
         plt.axis("equal")  # Equal aspect ratio ensures that pie chart is drawn as a circle.
 
         # Show the pie chart
-        plt.show()
+        return finish_chart(output)
 
     
-    def show_adversarial_percents_logarithmic_bar_chart(self, repo: str):
+    def show_adversarial_percents_logarithmic_bar_chart(self, repo: str, output=None):
         """Show a bar chart of commits with log scale"""
 
-        data = CompositeClient().adversarial_timezones(repo)
+        data = CompositeClient(transport=self.transport).adversarial_timezones(repo)
         values = data.dict()
 
         timezone_dict = {}
@@ -260,4 +263,4 @@ class BOEVisClient(ReagentClient):
         )  # Grid lines for both major and minor ticks
 
         plt.tight_layout()  # Adjust the layout
-        plt.show()
+        return finish_chart(output)
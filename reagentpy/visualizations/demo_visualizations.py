@@ -7,11 +7,13 @@ from reagentpy.clients.composite_scores import CompositeClient
 from reagentpy.clients.repo import RepoClient
 from datetime import datetime, timedelta
 from reagentpy.ReagentClient import ReagentClient
+from reagentpy.transport import ReagentTransport
+from reagentpy.visualizations.rendering import finish_chart
 
 
 class DemoVisClient(ReagentClient):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reagent_api_key: str = None, transport: Optional[ReagentTransport] = None):
+        super().__init__(reagent_api_key=reagent_api_key, transport=transport)
 
     def to_title_case(self, start_string: str) -> str:
         return start_string.replace("_", " ").title()
@@ -23,8 +25,8 @@ class DemoVisClient(ReagentClient):
         return target_date >= three_months_ago
 
 
-    def wordcloud(self, repo: Optional[str] = None):
-        data = RepoClient().email_domains(repo).dict()
+    def wordcloud(self, repo: Optional[str] = None, output=None):
+        data = RepoClient(transport=self.transport).email_domains(repo).dict()
 
         word_freq_dict = {item['domain']: item['instances'] for item in data}
         
@@ -39,11 +41,11 @@ class DemoVisClient(ReagentClient):
         plt.imshow(wc)
         plt.axis("off")
         plt.tight_layout(pad=0)
-        plt.show()
+        return finish_chart(output)
 
 
     def print_hygiene_summary(self, repo: str):
-        data = RepoClient().hygiene_summary(repo).dict()[0]
+        data = RepoClient(transport=self.transport).hygiene_summary(repo).dict()[0]
 
         name_and_desc = ("\033[1mRepository Overview:\033[0m \033[94m"
             + repo + "\033[0m\n"
@@ -80,22 +82,23 @@ class DemoVisClient(ReagentClient):
         print(name_and_desc + contribution_pattern + fork_count + license_presence + readme_presence + recent_commit)
 
 
-    def create_out_of_ten_chart(self, repo: Optional[str] = None):
+    def create_out_of_ten_chart(self, repo: Optional[str] = None, output=None):
+        """One bar per metric, stacked in a single figure"""
 
-        data = EnrichmentsClient().threat_score(repo).dict()
+        data = EnrichmentsClient(transport=self.transport).threat_score(repo).dict()
         if len(data) != 1:
             raise ValueError("Expected a single dictionary of values, but got multiple.")
         values = data[0]
 
-        # Create and display charts for each metric
-        for raw_title in values:
+        fig, axes = plt.subplots(len(values), 1, figsize=(10, 1.5 * len(values)), squeeze=False)
+
+        # Create a chart for each metric
+        for ax, raw_title in zip(axes[:, 0], values):
 
             score = values[raw_title]
 
             title = f"{raw_title.replace('_', ' ').title()} out of Ten"
 
-            fig, ax = plt.subplots(figsize=(10, 1.5))
-
             ax.barh(y=0, width=10, color="skyblue", align="center")
             # Create the foreground bar (actual score)
             ax.barh(y=0, width=score, color="orange", align="center")
@@ -109,11 +112,11 @@ class DemoVisClient(ReagentClient):
             else:
                 ax.text(score, 0, f"{score:.2f}", ha="left", va="center")
 
-            plt.tight_layout()
-            plt.show()
+        plt.tight_layout()
+        return finish_chart(output)
 
 
-    def nationality_pie_chart(self, country_counts, repo):
+    def nationality_pie_chart(self, country_counts, repo, output=None):
         # Prepare data for the pie chart
         labels = list(country_counts.countries.keys())
         sizes = list(country_counts.countries.values())
@@ -125,10 +128,10 @@ class DemoVisClient(ReagentClient):
         plt.axis("equal")  # Equal aspect ratio ensures that pie chart is drawn as a circle.
 
         # Show the pie chart
-        plt.show()
+        return finish_chart(output)
 
 
-    def nationality_horizontal_bar_chart(self, country_counts, repo):
+    def nationality_horizontal_bar_chart(self, country_counts, repo, output=None):
         # Prepare data for the bar chart
         labels = list(country_counts.countries.keys())
         sizes = list(country_counts.countries.values())
@@ -174,12 +177,12 @@ class DemoVisClient(ReagentClient):
         ax.set_xlabel("Contributions (%)")
 
         # Show the bar chart
-        plt.show()
+        return finish_chart(output)
 
 
-    def hibp_pie_chart(self, repo: str, include_unbreached: Optional[bool] = False):
+    def hibp_pie_chart(self, repo: str, include_unbreached: Optional[bool] = False, output=None):
         try:
-            hibp_counts = EnrichmentsClient().hibp_for_visualizations(repo).dict()
+            hibp_counts = EnrichmentsClient(transport=self.transport).hibp_for_visualizations(repo).dict()
 
         except Exception as e:
             print("An error occurred: ", e, file=sys.stderr)
@@ -201,10 +204,10 @@ class DemoVisClient(ReagentClient):
         plt.axis("equal")  # Equal aspect ratio ensures that pie chart is drawn as a circle.
 
         # Show the pie chart
-        plt.show()
+        return finish_chart(output)
 
 
-    def political_chart(self, country_counts, repo):
+    def political_chart(self, country_counts, repo, output=None):
         # Define the countries that fall under "theirs"
         their_countries = [
             "CN",
@@ -281,12 +284,12 @@ class DemoVisClient(ReagentClient):
         ax.set_xlabel("Contributions (%)")
 
         # Show the bar chart
-        plt.show()
+        return finish_chart(output)
 
 
-    def adversarial_pie_chart(self, repo: str):
+    def adversarial_pie_chart(self, repo: str, output=None):
 
-        values = EnrichmentsClient().threat_summary(repo, adversarial=True).dict()[0]["adversarial_totals"][0]
+        values = EnrichmentsClient(transport=self.transport).threat_summary(repo, adversarial=True).dict()[0]["adversarial_totals"][0]
 
         # Prepare data for the pie chart
         labels = []
@@ -305,4 +308,4 @@ class DemoVisClient(ReagentClient):
         plt.axis("equal")  # Equal aspect ratio ensures that pie chart is drawn as a circle.
 
         # Show the pie chart
-        plt.show()
+        return finish_chart(output)
@@ -0,0 +1,172 @@
+"""
+Showing charts, or rendering them to files without a display.
+
+Every chart method of the visualization clients takes output=. Without it the chart is
+shown with plt.show(); with a path or a binary file object it is saved instead (PNG, SVG or
+PDF, from the file extension) and the figure is closed, so nothing is left open:
+
+    reagent.boe_visualizations().total_chart("org/repo", output="org-repo-total.pdf")
+
+render_charts() renders many charts across a pool of worker processes, each on the
+non-interactive Agg backend:
+
+    jobs = [ChartJob("timezone", "build_and_show_timezone_map", (repo,), f"maps/{repo.replace('/', '_')}.png")
+            for repo in repos]
+    for result in render_charts(jobs, reagent_api_key=key, max_workers=8):
+        print(result.output, result.error or "ok")
+"""
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Tuple
+from reagentpy.constants import DEFAULT_RENDER_TASKS_PER_CHILD
+
+CHART_FORMATS = ("png", "svg", "pdf")
+
+# ChartJob.client -> Reagent facade method returning that visualization client
+CHART_CLIENTS = {
+    "timezone": "timezone_visualizations",
+    "boe": "boe_visualizations",
+    "demo": "demo_visualizations",
+}
+
+
+def chart_format(output, format: Optional[str] = None) -> str:
+    """The format to save output in: format if given, else the extension of its path or name, else png."""
+    if format is None:
+        name = output if isinstance(output, (str, os.PathLike)) else getattr(output, "name", None)
+        extension = os.path.splitext(os.fspath(name))[1] if isinstance(name, (str, os.PathLike)) else ""
+        format = extension[1:] or "png"
+    format = format.lower()
+    if format not in CHART_FORMATS:
+        raise ValueError(f"Charts are saved as {', '.join(CHART_FORMATS)}, not {format!r}.")
+    return format
+
+
+def finish_chart(output=None, figure=None, format: Optional[str] = None, **savefig_kwargs):
+    """
+    Show figure (the current one by default), or save it to output and close it.
+    Returns output, or None when the chart was shown.
+    """
+    import matplotlib.pyplot as plt
+
+    if output is None:
+        plt.show()
+        return None
+    figure = figure if figure is not None else plt.gcf()
+    try:
+        figure.savefig(output, format=chart_format(output, format), **savefig_kwargs)
+    finally:
+        plt.close(figure)
+    return output
+
+
+@dataclass(frozen=True)
+class ChartJob:
+    """A chart to render: client ("timezone", "boe" or "demo"), its method and arguments, and where to save it."""
+    client: str
+    method: str
+    args: Tuple = ()
+    output: str = None
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class ChartResult:
+    job: ChartJob
+    output: Optional[str]
+    seconds: float
+    error: Optional[BaseException] = None
+
+
+def _check(job: ChartJob):
+    if job.client not in CHART_CLIENTS or job.output is None:
+        raise ValueError(f"Chart jobs need a client ({', '.join(CHART_CLIENTS)}) and an output: {job!r}")
+
+
+# Per worker process: the Reagent facade its jobs share
+_worker_reagent = None
+
+
+def _start_worker(transport_options: dict):
+    global _worker_reagent
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    from reagentpy import Reagent
+    _worker_reagent = Reagent(**transport_options)
+
+
+def _render(job: ChartJob) -> Tuple[Optional[str], float]:
+    import matplotlib.pyplot as plt
+
+    started = time.perf_counter()
+    try:
+        client = getattr(_worker_reagent, CHART_CLIENTS[job.client])()
+        getattr(client, job.method)(*job.args, output=job.output, **job.kwargs)
+    finally:
+        # Whatever the method left open (e.g. after an error) goes before the next job
+        plt.close("all")
+    if not os.path.exists(job.output):
+        raise RuntimeError(f"{job.method} did not write {job.output}.")
+    return job.output, time.perf_counter() - started
+
+
+def iter_render_charts(jobs: Iterable[ChartJob], max_workers: Optional[int] = None,
+                       max_tasks_per_child: Optional[int] = DEFAULT_RENDER_TASKS_PER_CHILD,
+                       **transport_options) -> Iterator[ChartResult]:
+    """
+    Render jobs in worker processes, yielding a ChartResult for each as it finishes.
+
+    Args:
+        jobs: ChartJobs, each with an output path; consumed lazily.
+        max_workers: worker processes (the CPU count by default).
+        max_tasks_per_child: jobs a worker renders before it is replaced, which bounds what
+            long batches can accumulate; None keeps workers for the whole batch.
+        transport_options: passed to the Reagent each worker builds (reagent_api_key, base_url, ...).
+
+    At most two jobs per worker are queued at a time, so memory stays flat however many
+    jobs there are. A job that raises is reported in its result's error.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    options = {"max_workers": max_workers, "initializer": _start_worker, "initargs": (transport_options,)}
+    # Recycling workers needs Python 3.11; earlier versions keep them for the whole batch
+    if max_tasks_per_child is not None and sys.version_info >= (3, 11):
+        options["max_tasks_per_child"] = max_tasks_per_child
+    with ProcessPoolExecutor(**options) as executor:
+        pending = {}
+        jobs = iter(jobs)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * max_workers:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                _check(job)
+                pending[executor.submit(_render, job)] = job
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    yield ChartResult(job, None, 0.0, error)
+                else:
+                    output, seconds = future.result()
+                    yield ChartResult(job, output, seconds)
+
+
+def render_charts(jobs: Iterable[ChartJob], max_workers: Optional[int] = None,
+                  max_tasks_per_child: Optional[int] = DEFAULT_RENDER_TASKS_PER_CHILD,
+                  **transport_options) -> list:
+    """Render every job (see iter_render_charts) and return their ChartResults in job order."""
+    jobs = list(jobs)
+    for job in jobs:
+        _check(job)
+    order = {id(job): i for i, job in enumerate(jobs)}
+    results = list(iter_render_charts(jobs, max_workers=max_workers, max_tasks_per_child=max_tasks_per_child,
+                                      **transport_options))
+    return sorted(results, key=lambda result: order[id(result.job)])
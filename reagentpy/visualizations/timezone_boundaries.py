@@ -0,0 +1,405 @@
+"""
+Timezone boundaries in a compact, memory-mapped store.
+
+Parsing timezone-boundary-builder's combined-now.json (~70MB of GeoJSON) takes tens of
+seconds and about 1GB of memory. build_boundary_store() converts it once into an
+uncompressed Arrow IPC (Feather) file holding each tzid and its geometry as WKB, sorted
+by tzid:
+
+    reagent timezone-visualizations build-boundary-store combined-now.json
+
+load_boundaries() memory-maps that file and keeps it for the rest of the process, so maps
+only decode the geometries they draw. load_offset_boundaries() does the same for stores
+derived from the first: one dissolved geometry per UTC offset, at several levels of detail,
+and those geometries projected into the map projections that have been drawn.
+
+The stores need pyarrow (the optional arrow extra). Without it, load_boundaries() and
+load_offset_boundaries() read the GeoJSON itself and dissolve it in memory, once per process.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+from reagentpy.arrow import import_pyarrow
+from reagentpy.constants import DEFAULT_TIMEZONE_GEOJSON_PATH, DEFAULT_TIMEZONE_STORE_PATH, TIMEZONE_SIMPLIFY_TOLERANCES
+from reagentpy.visualizations.timezone_ids import OFFSET_TZIDS
+
+_loaded_lock = threading.Lock()
+# store path (or GeoJSON path and kind) -> (modification time, TimezoneBoundaries or OffsetBoundaries)
+_loaded: Dict[str, Tuple[float, Any]] = {}
+
+# Identifies the offset -> tzid grouping a dissolved store was built with
+OFFSET_TZIDS_VERSION = hashlib.sha256(json.dumps(OFFSET_TZIDS, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def resolve_geojson_path(path: Optional[str] = None) -> str:
+    """The boundary GeoJSON: the given path, REAGENT_TIMEZONE_GEOJSON, or combined-now.json in the working directory."""
+    return os.path.expanduser(path or os.getenv("REAGENT_TIMEZONE_GEOJSON") or DEFAULT_TIMEZONE_GEOJSON_PATH)
+
+
+def resolve_store_path(path: Optional[str] = None) -> str:
+    """The boundary store: the given path, REAGENT_TIMEZONE_STORE, or one under ~/.cache/reagentpy."""
+    return os.path.expanduser(path or os.getenv("REAGENT_TIMEZONE_STORE") or DEFAULT_TIMEZONE_STORE_PATH)
+
+
+def offset_store_path(store_path: Optional[str] = None, tolerance: float = 0.0) -> str:
+    """Where the dissolved per-offset store (simplified to tolerance) derived from a boundary store is kept."""
+    suffix = f"-offsets-{tolerance:g}.arrow" if tolerance else "-offsets.arrow"
+    return os.path.splitext(resolve_store_path(store_path))[0] + suffix
+
+
+def pick_tolerance(width_inches: float, dpi: float, degrees_wide: float = 360.0,
+                   tolerances: Sequence[float] = TIMEZONE_SIMPLIFY_TOLERANCES) -> float:
+    """
+    The coarsest simplification tolerance that stays under a pixel on a map spanning
+    degrees_wide of longitude, drawn width_inches wide at dpi.
+    """
+    pixel = degrees_wide / (width_inches * dpi)
+    return max((tolerance for tolerance in tolerances if tolerance <= pixel), default=0.0)
+
+
+def simplify_coverage(geometries: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify polygons that tile the map without opening gaps or overlaps between them
+    (shapely.coverage_simplify on shapely >= 2.1, else per-polygon topology-preserving simplify).
+    """
+    import shapely
+
+    if not tolerance:
+        return geometries
+    if hasattr(shapely, "coverage_simplify"):
+        try:
+            return shapely.coverage_simplify(geometries, tolerance)
+        except shapely.errors.GEOSException:
+            # Not a valid coverage (e.g. overlapping boundaries)
+            pass
+    return shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+
+def _load_derived(path: str, source: bytes, build: Callable[[], Any], wrap: Callable[[Any], Any]):
+    """
+    Load a store derived from another one; build() returns the table to write when the file
+    is missing or was built from a different source (recorded in its metadata).
+    """
+    pa = import_pyarrow()
+
+    if os.path.exists(path):
+        with pa.memory_map(path, "r") as source_file:
+            built_from = (pa.ipc.open_file(source_file).schema.metadata or {}).get(b"source")
+        if built_from == source:
+            return _load_table(path, wrap)
+
+    table = build()
+    _write_table(table.replace_schema_metadata({**(table.schema.metadata or {}), b"source": source}), path)
+    return _load_table(path, wrap)
+
+
+def _write_table(table, path: str):
+    import pyarrow.feather as feather
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    # Uncompressed so the file can be memory-mapped without decoding
+    feather.write_feather(table, temporary, compression="uncompressed")
+    os.replace(temporary, path)
+
+
+def _load_once(path: str, load: Callable[[], Any], kind: str = ""):
+    """load() for a file, reused until the file changes; kind tells apart things loaded from the same file."""
+    key = os.path.abspath(path) + kind
+    modified = os.path.getmtime(path)
+    with _loaded_lock:
+        loaded = _loaded.get(key)
+        if loaded is None or loaded[0] != modified:
+            loaded = _loaded[key] = (modified, load())
+        return loaded[1]
+
+
+def _load_table(path: str, wrap: Callable[[Any], Any]):
+    """wrap(memory-mapped table) for a store file, reused until the file changes."""
+    pa = import_pyarrow()
+
+    return _load_once(path, lambda: wrap(pa.ipc.open_file(pa.memory_map(path, "r")).read_all()))
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import_pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def build_boundary_store(geojson_path: Optional[str] = None, store_path: Optional[str] = None) -> str:
+    """Convert the boundary GeoJSON into a boundary store and return the store's path."""
+    import geopandas as gpd
+    import shapely
+    pa = import_pyarrow()
+
+    geojson_path = resolve_geojson_path(geojson_path)
+    store_path = resolve_store_path(store_path)
+
+    frame = gpd.read_file(geojson_path).sort_values("tzid", kind="stable")
+    metadata = {b"crs": frame.crs.to_string().encode("utf-8")} if frame.crs is not None else None
+    table = pa.table(
+        {
+            "tzid": pa.array(frame["tzid"].tolist(), type=pa.string()),
+            "geometry": pa.array(shapely.to_wkb(frame.geometry.values), type=pa.binary()),
+        },
+        metadata=metadata,
+    )
+
+    _write_table(table, store_path)
+    return store_path
+
+
+class TimezoneBoundaries:
+    """Timezone boundaries read from a boundary store (or, without pyarrow, a GeoDataFrame), indexed by tzid."""
+
+    def __init__(self, table, crs: Optional[str] = None, frame=None):
+        self.table = table
+        self.crs = crs
+        self.tzids = table.column("tzid").to_pylist() if table is not None else frame["tzid"].tolist()
+        self.index = {tzid: row for row, tzid in enumerate(self.tzids)}
+        self._frame = frame
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_table(cls, table) -> "TimezoneBoundaries":
+        crs = (table.schema.metadata or {}).get(b"crs")
+        return cls(table, crs.decode("utf-8") if crs else None)
+
+    @classmethod
+    def from_frame(cls, frame) -> "TimezoneBoundaries":
+        """Boundaries held in memory: a GeoDataFrame with tzid and geometry columns."""
+        frame = frame[["tzid", "geometry"]].sort_values("tzid", kind="stable").reset_index(drop=True)
+        return cls(None, frame.crs.to_string() if frame.crs is not None else None, frame=frame)
+
+    def __len__(self) -> int:
+        return len(self.tzids)
+
+    def __contains__(self, tzid: str) -> bool:
+        return tzid in self.index
+
+    def rows(self, tzids: Iterable[str]) -> np.ndarray:
+        """Row numbers of the given tzids; unknown tzids are skipped."""
+        return np.array([self.index[tzid] for tzid in tzids if tzid in self.index], dtype=np.int64)
+
+    def geometries(self, tzids: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Shapely geometries of the given tzids (all of them by default), decoded from WKB."""
+        if self.table is None:
+            values = self._frame.geometry.values
+            return np.asarray(values if tzids is None else values[self.rows(tzids)], dtype=object)
+
+        import shapely
+
+        column = self.table.column("geometry")
+        if tzids is not None:
+            column = column.take(self.rows(tzids))
+        return shapely.from_wkb(column.to_numpy(zero_copy_only=False))
+
+    def frame(self):
+        """All boundaries as a GeoDataFrame with tzid and geometry columns, built once."""
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    import geopandas as gpd
+                    self._frame = gpd.GeoDataFrame({"tzid": self.tzids}, geometry=self.geometries(), crs=self.crs)
+        return self._frame
+
+
+def load_boundaries(store_path: Optional[str] = None, geojson_path: Optional[str] = None) -> TimezoneBoundaries:
+    """
+    Memory-map the boundary store, building it from the GeoJSON first if it doesn't exist.
+    Each store is loaded once per process (and again if it is rebuilt). Without pyarrow the
+    GeoJSON is read instead, also once per process.
+    """
+    store_path = resolve_store_path(store_path)
+    geojson_path = resolve_geojson_path(geojson_path)
+    if not _has_pyarrow() and (os.path.exists(geojson_path) or not os.path.exists(store_path)):
+        if not os.path.exists(geojson_path):
+            raise FileNotFoundError(
+                f"No timezone boundary GeoJSON at {geojson_path}. Download combined-now.json from "
+                "timezone-boundary-builder, and install pyarrow (\"pip install reagentpy[arrow]\") "
+                "to convert it with \"reagent timezone-visualizations build-boundary-store combined-now.json\"."
+            )
+        import geopandas as gpd
+        return _load_once(geojson_path, lambda: TimezoneBoundaries.from_frame(gpd.read_file(geojson_path)))
+
+    if not os.path.exists(store_path):
+        if not os.path.exists(geojson_path):
+            raise FileNotFoundError(
+                f"No timezone boundary store at {store_path} and no boundary GeoJSON at {geojson_path}. "
+                "Download combined-now.json from timezone-boundary-builder and run "
+                "\"reagent timezone-visualizations build-boundary-store combined-now.json\"."
+            )
+        build_boundary_store(geojson_path, store_path)
+
+    return _load_table(store_path, TimezoneBoundaries.from_table)
+
+
+class OffsetBoundaries:
+    """
+    One dissolved geometry per UTC offset, sorted by offset; WKB is decoded on first use.
+
+    Boundaries loaded from a store (path is set) keep their simplified levels and projections
+    in derived stores next to it; others compute them in memory.
+    """
+
+    def __init__(self, offsets, geometries=None, wkb=None, tolerance: float = 0.0,
+                 store_path: Optional[str] = None, path: Optional[str] = None):
+        self.offsets = np.asarray(offsets, dtype=np.float64)
+        self._wkb = wkb
+        if geometries is None:
+            geometries = np.full(len(self.offsets), None, dtype=object)
+        self._geometries = np.asarray(geometries, dtype=object)
+        # Simplification tolerance in degrees
+        self.tolerance = tolerance
+        # The boundary store these were dissolved from, and the file they were loaded from
+        self.store_path = store_path
+        self.path = path
+        self._lock = threading.Lock()
+        self._levels: Dict[float, "OffsetBoundaries"] = {}
+        self._projected: Dict[str, "OffsetBoundaries"] = {}
+
+    @classmethod
+    def from_table(cls, table, **kwargs) -> "OffsetBoundaries":
+        return cls(table.column("offset").to_numpy(), wkb=table.column("geometry"), **kwargs)
+
+    @classmethod
+    def dissolve(cls, tzids: Iterable[str], geometries: Callable[[list], np.ndarray]) -> "OffsetBoundaries":
+        """
+        Union the boundaries of each offset's tzids (see OFFSET_TZIDS); geometries(tzids)
+        returns the boundaries of the known ones among the given tzids.
+        """
+        import shapely
+
+        known = set(tzids)
+        offsets, dissolved = [], []
+        for offset, offset_tzids in sorted(OFFSET_TZIDS.items()):
+            present = [tzid for tzid in offset_tzids if tzid in known]
+            if present:
+                offsets.append(offset)
+                dissolved.append(shapely.union_all(geometries(present)))
+        return cls(offsets, geometries=dissolved)
+
+    @classmethod
+    def from_frame(cls, frame) -> "OffsetBoundaries":
+        """Dissolve a GeoDataFrame of boundaries with tzid and geometry columns."""
+        index = {tzid: row for row, tzid in enumerate(frame["tzid"])}
+        values = frame.geometry.values
+        return cls.dissolve(index, lambda tzids: values[[index[tzid] for tzid in tzids]])
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def positions(self, offsets) -> np.ndarray:
+        """Row of each offset, or -1 for offsets without boundaries."""
+        offsets = np.atleast_1d(np.asarray(offsets, dtype=np.float64))
+        if not len(self.offsets):
+            return np.full(len(offsets), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.offsets, offsets), len(self.offsets) - 1)
+        return np.where(self.offsets[positions] == offsets, positions, -1)
+
+    def geometries(self, offsets=None) -> np.ndarray:
+        """The dissolved geometry of each offset (all of them by default); None for offsets without boundaries."""
+        positions = self.positions(self.offsets if offsets is None else offsets)
+        found = positions[positions >= 0]
+        undecoded = np.unique([position for position in found if self._geometries[position] is None]).astype(np.int64)
+        if len(undecoded):
+            import shapely
+            with self._lock:
+                self._geometries[undecoded] = shapely.from_wkb(self._wkb.take(undecoded).to_numpy(zero_copy_only=False))
+
+        result = np.full(len(positions), None, dtype=object)
+        result[positions >= 0] = self._geometries[found]
+        return result
+
+    def simplified(self, tolerance: float) -> "OffsetBoundaries":
+        """These boundaries simplified to tolerance degrees (see pick_tolerance), computed once."""
+        if tolerance == self.tolerance:
+            return self
+        if self.store_path is not None:
+            return load_offset_boundaries(self.store_path, tolerance=tolerance)
+        with self._lock:
+            level = self._levels.get(tolerance)
+        if level is None:
+            base = self.simplified(0.0) if self.tolerance else self
+            level = OffsetBoundaries(self.offsets, simplify_coverage(base.geometries(), tolerance), tolerance=tolerance)
+            with self._lock:
+                level = self._levels.setdefault(tolerance, level)
+        return level
+
+    def projected(self, projection) -> "OffsetBoundaries":
+        """
+        These boundaries projected into a cartopy projection, computed once per projection (and
+        stored next to the store they came from), so maps can draw them with crs=projection.
+        """
+        import cartopy.crs as ccrs
+
+        key = projection.proj4_init
+        with self._lock:
+            projected = self._projected.get(key)
+        if projected is not None:
+            return projected
+
+        def project() -> "OffsetBoundaries":
+            source = ccrs.PlateCarree()
+            geometries = [projection.project_geometry(geometry, source) for geometry in self.geometries()]
+            return OffsetBoundaries(self.offsets, geometries, tolerance=self.tolerance)
+
+        if self.path is None:
+            projected = project()
+        else:
+            digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+            path = f"{os.path.splitext(self.path)[0]}-{digest}.arrow"
+            source = f"{os.path.getmtime(self.path)}:{key}".encode("utf-8")
+            projected = _load_derived(
+                path, source, lambda: project().to_table(),
+                lambda table: OffsetBoundaries.from_table(table, tolerance=self.tolerance, path=path),
+            )
+        with self._lock:
+            return self._projected.setdefault(key, projected)
+
+    def to_table(self, metadata: Optional[dict] = None):
+        import shapely
+        pa = import_pyarrow()
+
+        return pa.table(
+            {
+                "offset": pa.array(self.offsets, type=pa.float64()),
+                "geometry": pa.array(shapely.to_wkb(self.geometries()), type=pa.binary()),
+            },
+            metadata=metadata,
+        )
+
+
+def load_offset_boundaries(store_path: Optional[str] = None, geojson_path: Optional[str] = None,
+                           tolerance: float = 0.0) -> OffsetBoundaries:
+    """
+    Memory-map the dissolved per-offset store simplified to tolerance degrees, building it
+    when it is missing or stale (the boundary store or OFFSET_TZIDS changed). Simplified
+    levels are derived from the full-resolution one. Each is loaded once per process.
+    Without pyarrow they are dissolved from the GeoJSON and simplified in memory instead.
+    """
+    store_path = resolve_store_path(store_path)
+    boundaries = load_boundaries(store_path, geojson_path)
+    if boundaries.table is None:
+        full = _load_once(resolve_geojson_path(geojson_path), kind="#offsets", load=lambda: OffsetBoundaries.dissolve(
+            boundaries.tzids, boundaries.geometries))
+        return full.simplified(tolerance)
+
+    def build():
+        if tolerance:
+            full = load_offset_boundaries(store_path, tolerance=0.0)
+            return OffsetBoundaries(full.offsets, simplify_coverage(full.geometries(), tolerance)).to_table()
+        return OffsetBoundaries.dissolve(boundaries.tzids, boundaries.geometries).to_table()
+
+    path = offset_store_path(store_path, tolerance)
+    source = f"{os.path.getmtime(store_path)}:{OFFSET_TZIDS_VERSION}:{tolerance:g}".encode("utf-8")
+    return _load_derived(path, source, build, lambda table: OffsetBoundaries.from_table(
+        table, tolerance=tolerance, store_path=store_path, path=path))
@@ -0,0 +1,636 @@
+"""UTC offsets and the IANA timezone ids (tzids in the timezone boundaries) observed at each."""
+from typing import Dict, List
+
+# TODO: there might be some missing?
+OFFSET_TZIDS: Dict[float, List[str]] = {
+    -12.0: ["Etc/GMT+12"],
+    -11.0: [
+        "Etc/GMT+11",
+        "Pacific/Midway",
+        "Pacific/Niue",
+        "Pacific/Pago_Pago",
+        "Pacific/Samoa",
+        "US/Samoa",
+    ],
+    -10.0: [
+        "America/Adak",
+        "America/Atka",
+        "Etc/GMT+10",
+        "HST",
+        "Pacific/Honolulu",
+        "Pacific/Johnston",
+        "Pacific/Rarotonga",
+        "Pacific/Tahiti",
+        "US/Aleutian",
+        "US/Hawaii",
+    ],
+    -9.0: [
+        "America/Anchorage",
+        "America/Juneau",
+        "America/Metlakatla",
+        "America/Nome",
+        "America/Sitka",
+        "America/Yakutat",
+        "Etc/GMT+9",
+        "Pacific/Gambier",
+        "US/Alaska",
+    ],
+    -8.5: ["Pacific/Marquesas"],
+    -8.0: [
+        "America/Ensenada",
+        "America/Los_Angeles",
+        "America/Santa_Isabel",
+        "America/Tijuana",
+        "America/Vancouver",
+        "Canada/Pacific",
+        "Etc/GMT+8",
+        "Mexico/BajaNorte",
+        "PST8PDT",
+        "Pacific/Pitcairn",
+        "US/Pacific",
+    ],
+    -7.0: [
+        "America/Boise",
+        "America/Cambridge_Bay",
+        "America/Ciudad_Juarez",
+        "America/Creston",
+        "America/Dawson",
+        "America/Dawson_Creek",
+        "America/Denver",
+        "America/Edmonton",
+        "America/Fort_Nelson",
+        "America/Hermosillo",
+        "America/Inuvik",
+        "America/Mazatlan",
+        "America/Phoenix",
+        "America/Shiprock",
+        "America/Whitehorse",
+        "America/Yellowknife",
+        "Canada/Mountain",
+        "Canada/Yukon",
+        "Etc/GMT+7",
+        "MST",
+        "MST7MDT",
+        "Mexico/BajaSur",
+        "Navajo",
+        "US/Arizona",
+        "US/Mountain",
+    ],
+    -6.0: [
+        "America/Bahia_Banderas",
+        "America/Belize",
+        "America/Chicago",
+        "America/Chihuahua",
+        "America/Costa_Rica",
+        "America/El_Salvador",
+        "America/Guatemala",
+        "America/Indiana/Knox",
+        "America/Indiana/Tell_City",
+        "America/Knox_IN",
+        "America/Managua",
+        "America/Matamoros",
+        "America/Menominee",
+        "America/Merida",
+        "America/Mexico_City",
+        "America/Monterrey",
+        "America/North_Dakota/Beulah",
+        "America/North_Dakota/Center",
+        "America/North_Dakota/New_Salem",
+        "America/Ojinaga",
+        "America/Rainy_River",
+        "America/Rankin_Inlet",
+        "America/Regina",
+        "America/Resolute",
+        "America/Swift_Current",
+        "America/Tegucigalpa",
+        "America/Winnipeg",
+        "CST6CDT",
+        "Canada/Central",
+        "Canada/Saskatchewan",
+        "Etc/GMT+6",
+        "Mexico/General",
+        "Pacific/Galapagos",
+        "US/Central",
+        "US/Indiana-Starke",
+    ],
+    -5.0: [
+        "America/Atikokan",
+        "America/Bogota",
+        "America/Cancun",
+        "America/Cayman",
+        "America/Coral_Harbour",
+        "America/Detroit",
+        "America/Eirunepe",
+        "America/Fort_Wayne",
+        "America/Grand_Turk",
+        "America/Guayaquil",
+        "America/Havana",
+        "America/Indiana/Indianapolis",
+        "America/Indiana/Marengo",
+        "America/Indiana/Petersburg",
+        "America/Indiana/Vevay",
+        "America/Indiana/Vincennes",
+        "America/Indiana/Winamac",
+        "America/Indianapolis",
+        "America/Iqaluit",
+        "America/Jamaica",
+        "America/Kentucky/Louisville",
+        "America/Kentucky/Monticello",
+        "America/Lima",
+        "America/Louisville",
+        "America/Montreal",
+        "America/Nassau",
+        "America/New_York",
+        "America/Nipigon",
+        "America/Panama",
+        "America/Pangnirtung",
+        "America/Port-au-Prince",
+        "America/Porto_Acre",
+        "America/Rio_Branco",
+        "America/Thunder_Bay",
+        "America/Toronto",
+        "Brazil/Acre",
+        "Canada/Eastern",
+        "Chile/EasterIsland",
+        "Cuba",
+        "EST",
+        "EST5EDT",
+        "Etc/GMT+5",
+        "Jamaica",
+        "Pacific/Easter",
+        "US/East-Indiana",
+        "US/Eastern",
+        "US/Michigan",
+    ],
+    -4.5: ["Error/Timezone"],
+    -4.0: [
+        "America/Anguilla",
+        "America/Antigua",
+        "America/Aruba",
+        "America/Barbados",
+        "America/Blanc-Sablon",
+        "America/Boa_Vista",
+        "America/Campo_Grande",
+        "America/Caracas",
+        "America/Cuiaba",
+        "America/Curacao",
+        "America/Dominica",
+        "America/Glace_Bay",
+        "America/Goose_Bay",
+        "America/Grenada",
+        "America/Guadeloupe",
+        "America/Guyana",
+        "America/Halifax",
+        "America/Kralendijk",
+        "America/La_Paz",
+        "America/Lower_Princes",
+        "America/Manaus",
+        "America/Marigot",
+        "America/Martinique",
+        "America/Moncton",
+        "America/Montserrat",
+        "America/Port_of_Spain",
+        "America/Porto_Velho",
+        "America/Puerto_Rico",
+        "America/Santo_Domingo",
+        "America/St_Barthelemy",
+        "America/St_Kitts",
+        "America/St_Lucia",
+        "America/St_Thomas",
+        "America/St_Vincent",
+        "America/Thule",
+        "America/Tortola",
+        "America/Virgin",
+        "Atlantic/Bermuda",
+        "Brazil/West",
+        "Canada/Atlantic",
+        "Etc/GMT+4",
+    ],
+    -3.0: [
+        "America/Araguaina",
+        "America/Argentina/Buenos_Aires",
+        "America/Argentina/Catamarca",
+        "America/Argentina/ComodRivadavia",
+        "America/Argentina/Cordoba",
+        "America/Argentina/Jujuy",
+        "America/Argentina/La_Rioja",
+        "America/Argentina/Mendoza",
+        "America/Argentina/Rio_Gallegos",
+        "America/Argentina/Salta",
+        "America/Argentina/San_Juan",
+        "America/Argentina/San_Luis",
+        "America/Argentina/Tucuman",
+        "America/Argentina/Ushuaia",
+        "America/Asuncion",
+        "America/Bahia",
+        "America/Belem",
+        "America/Buenos_Aires",
+        "America/Catamarca",
+        "America/Cayenne",
+        "America/Cordoba",
+        "America/Fortaleza",
+        "America/Jujuy",
+        "America/Maceio",
+        "America/Mendoza",
+        "America/Miquelon",
+        "America/Montevideo",
+        "America/Paramaribo",
+        "America/Punta_Arenas",
+        "America/Recife",
+        "America/Rosario",
+        "America/Santarem",
+        "America/Santiago",
+        "America/Sao_Paulo",
+        "Atlantic/Stanley",
+        "Brazil/East",
+        "Chile/Continental",
+        "Etc/GMT+3",
+    ],
+    -2.5: ["America/St_Johns", "Canada/Newfoundland"],
+    -2.0: [
+        "America/Godthab",
+        "America/Noronha",
+        "America/Nuuk",
+        "Atlantic/South_Georgia",
+        "Brazil/DeNoronha",
+        "Etc/GMT+2",
+    ],
+    -1.0: [
+        "America/Scoresbysund",
+        "Atlantic/Azores",
+        "Atlantic/Cape_Verde",
+        "Etc/GMT+1",
+    ],
+    0.0: [
+        "Africa/Abidjan",
+        "Africa/Accra",
+        "Africa/Bamako",
+        "Africa/Banjul",
+        "Africa/Bissau",
+        "Africa/Conakry",
+        "Africa/Dakar",
+        "Africa/Freetown",
+        "Africa/Lome",
+        "Africa/Monrovia",
+        "Africa/Nouakchott",
+        "Africa/Ouagadougou",
+        "Africa/Sao_Tome",
+        "Africa/Timbuktu",
+        "America/Danmarkshavn",
+        "Atlantic/Canary",
+        "Atlantic/Faeroe",
+        "Atlantic/Faroe",
+        "Atlantic/Madeira",
+        "Atlantic/Reykjavik",
+        "Atlantic/St_Helena",
+        "Eire",
+        "Etc/GMT",
+        "Etc/GMT+0",
+        "Etc/GMT-0",
+        "Etc/GMT0",
+        "Etc/Greenwich",
+        "Etc/UCT",
+        "Etc/UTC",
+        "Etc/Universal",
+        "Etc/Zulu",
+        "Europe/Belfast",
+        "Europe/Dublin",
+        "Europe/Guernsey",
+        "Europe/Isle_of_Man",
+        "Europe/Jersey",
+        "Europe/Lisbon",
+        "Europe/London",
+        "GB",
+        "GB-Eire",
+        "GMT",
+        "GMT+0",
+        "GMT-0",
+        "GMT0",
+        "Greenwich",
+        "Iceland",
+        "Portugal",
+        "UCT",
+        "UTC",
+        "Universal",
+        "WET",
+        "Zulu",
+    ],
+    1.0: [
+        "Africa/Algiers",
+        "Africa/Bangui",
+        "Africa/Brazzaville",
+        "Africa/Casablanca",
+        "Africa/Ceuta",
+        "Africa/Douala",
+        "Africa/El_Aaiun",
+        "Africa/Kinshasa",
+        "Africa/Lagos",
+        "Africa/Libreville",
+        "Africa/Luanda",
+        "Africa/Malabo",
+        "Africa/Ndjamena",
+        "Africa/Niamey",
+        "Africa/Porto-Novo",
+        "Africa/Tunis",
+        "Arctic/Longyearbyen",
+        "Atlantic/Jan_Mayen",
+        "CET",
+        "Etc/GMT-1",
+        "Europe/Amsterdam",
+        "Europe/Andorra",
+        "Europe/Belgrade",
+        "Europe/Berlin",
+        "Europe/Bratislava",
+        "Europe/Brussels",
+        "Europe/Budapest",
+        "Europe/Busingen",
+        "Europe/Copenhagen",
+        "Europe/Gibraltar",
+        "Europe/Ljubljana",
+        "Europe/Luxembourg",
+        "Europe/Madrid",
+        "Europe/Malta",
+        "Europe/Monaco",
+        "Europe/Oslo",
+        "Europe/Paris",
+        "Europe/Podgorica",
+        "Europe/Prague",
+        "Europe/Rome",
+        "Europe/San_Marino",
+        "Europe/Sarajevo",
+        "Europe/Skopje",
+        "Europe/Stockholm",
+        "Europe/Tirane",
+        "Europe/Vaduz",
+        "Europe/Vatican",
+        "Europe/Vienna",
+        "Europe/Warsaw",
+        "Europe/Zagreb",
+        "Europe/Zurich",
+        "MET",
+        "Poland",
+    ],
+    2.0: [
+        "Africa/Blantyre",
+        "Africa/Bujumbura",
+        "Africa/Cairo",
+        "Africa/Gaborone",
+        "Africa/Harare",
+        "Africa/Johannesburg",
+        "Africa/Juba",
+        "Africa/Khartoum",
+        "Africa/Kigali",
+        "Africa/Lubumbashi",
+        "Africa/Lusaka",
+        "Africa/Maputo",
+        "Africa/Maseru",
+        "Africa/Mbabane",
+        "Africa/Tripoli",
+        "Africa/Windhoek",
+        "Asia/Beirut",
+        "Asia/Famagusta",
+        "Asia/Gaza",
+        "Asia/Hebron",
+        "Asia/Jerusalem",
+        "Asia/Nicosia",
+        "Asia/Tel_Aviv",
+        "EET",
+        "Egypt",
+        "Etc/GMT-2",
+        "Europe/Athens",
+        "Europe/Bucharest",
+        "Europe/Chisinau",
+        "Europe/Helsinki",
+        "Europe/Kaliningrad",
+        "Europe/Kiev",
+        "Europe/Kyiv",
+        "Europe/Mariehamn",
+        "Europe/Nicosia",
+        "Europe/Riga",
+        "Europe/Sofia",
+        "Europe/Tallinn",
+        "Europe/Tiraspol",
+        "Europe/Uzhgorod",
+        "Europe/Vilnius",
+        "Europe/Zaporozhye",
+        "Israel",
+        "Libya",
+    ],
+    3.0: [
+        "Africa/Addis_Ababa",
+        "Africa/Asmara",
+        "Africa/Asmera",
+        "Africa/Dar_es_Salaam",
+        "Africa/Djibouti",
+        "Africa/Kampala",
+        "Africa/Mogadishu",
+        "Africa/Nairobi",
+        "Asia/Aden",
+        "Asia/Amman",
+        "Asia/Baghdad",
+        "Asia/Bahrain",
+        "Asia/Damascus",
+        "Asia/Istanbul",
+        "Asia/Kuwait",
+        "Asia/Qatar",
+        "Asia/Riyadh",
+        "Etc/GMT-3",
+        "Europe/Istanbul",
+        "Europe/Kirov",
+        "Europe/Minsk",
+        "Europe/Moscow",
+        "Europe/Simferopol",
+        "Europe/Volgograd",
+        "Indian/Antananarivo",
+        "Indian/Comoro",
+        "Indian/Mayotte",
+        "Turkey",
+        "W-SU",
+    ],
+    3.5: ["Asia/Tehran", "Iran"],
+    4.0: [
+        "Asia/Baku",
+        "Asia/Dubai",
+        "Asia/Muscat",
+        "Asia/Tbilisi",
+        "Asia/Yerevan",
+        "Etc/GMT-4",
+        "Europe/Astrakhan",
+        "Europe/Samara",
+        "Europe/Saratov",
+        "Europe/Ulyanovsk",
+        "Indian/Mahe",
+        "Indian/Mauritius",
+        "Indian/Reunion",
+    ],
+    4.5: ["Asia/Kabul"],
+    5.0: [
+        "Asia/Almaty",
+        "Asia/Aqtau",
+        "Asia/Aqtobe",
+        "Asia/Ashgabat",
+        "Asia/Ashkhabad",
+        "Asia/Atyrau",
+        "Asia/Dushanbe",
+        "Asia/Karachi",
+        "Asia/Oral",
+        "Asia/Qostanay",
+        "Asia/Qyzylorda",
+        "Asia/Samarkand",
+        "Asia/Tashkent",
+        "Asia/Yekaterinburg",
+        "Etc/GMT-5",
+        "Indian/Kerguelen",
+        "Indian/Maldives",
+    ],
+    5.5: ["Asia/Calcutta", "Asia/Colombo", "Asia/Kolkata"],
+    5.75: ["Asia/Kathmandu", "Asia/Katmandu"],
+    6.0: [
+        "Asia/Bishkek",
+        "Asia/Dacca",
+        "Asia/Dhaka",
+        "Asia/Kashgar",
+        "Asia/Omsk",
+        "Asia/Thimbu",
+        "Asia/Thimphu",
+        "Asia/Urumqi",
+        "Etc/GMT-6",
+        "Indian/Chagos",
+    ],
+    6.5: ["Asia/Rangoon", "Asia/Yangon", "Indian/Cocos"],
+    7.0: [
+        "Asia/Bangkok",
+        "Asia/Barnaul",
+        "Asia/Ho_Chi_Minh",
+        "Asia/Hovd",
+        "Asia/Jakarta",
+        "Asia/Krasnoyarsk",
+        "Asia/Novokuznetsk",
+        "Asia/Novosibirsk",
+        "Asia/Phnom_Penh",
+        "Asia/Pontianak",
+        "Asia/Saigon",
+        "Asia/Tomsk",
+        "Asia/Vientiane",
+        "Etc/GMT-7",
+        "Indian/Christmas",
+    ],
+    8.0: [
+        "Asia/Brunei",
+        "Asia/Choibalsan",
+        "Asia/Chongqing",
+        "Asia/Chungking",
+        "Asia/Harbin",
+        "Asia/Hong_Kong",
+        "Asia/Irkutsk",
+        "Asia/Kuala_Lumpur",
+        "Asia/Kuching",
+        "Asia/Macao",
+        "Asia/Macau",
+        "Asia/Makassar",
+        "Asia/Manila",
+        "Asia/Shanghai",
+        "Asia/Singapore",
+        "Asia/Taipei",
+        "Asia/Ujung_Pandang",
+        "Asia/Ulaanbaatar",
+        "Asia/Ulan_Bator",
+        "Australia/Perth",
+        "Australia/West",
+        "Etc/GMT-8",
+        "Hongkong",
+        "PRC",
+        "ROC",
+        "Singapore",
+    ],
+    8.75: ["Australia/Eucla"],
+    9.0: [
+        "Asia/Chita",
+        "Asia/Dili",
+        "Asia/Jayapura",
+        "Asia/Khandyga",
+        "Asia/Pyongyang",
+        "Asia/Seoul",
+        "Asia/Tokyo",
+        "Asia/Yakutsk",
+        "Etc/GMT-9",
+        "Japan",
+        "Pacific/Palau",
+        "ROK",
+    ],
+    9.5: ["Australia/Darwin", "Australia/North"],
+    10.0: [
+        "Asia/Ust-Nera",
+        "Asia/Vladivostok",
+        "Australia/Brisbane",
+        "Australia/Lindeman",
+        "Australia/Queensland",
+        "Etc/GMT-10",
+        "Pacific/Chuuk",
+        "Pacific/Guam",
+        "Pacific/Port_Moresby",
+        "Pacific/Saipan",
+        "Pacific/Truk",
+        "Pacific/Yap",
+    ],
+    10.5: [
+        "Australia/Adelaide",
+        "Australia/Broken_Hill",
+        "Australia/South",
+        "Australia/Yancowinna",
+    ],
+    11.0: [
+        "Asia/Magadan",
+        "Asia/Sakhalin",
+        "Asia/Srednekolymsk",
+        "Australia/ACT",
+        "Australia/Canberra",
+        "Australia/Currie",
+        "Australia/Hobart",
+        "Australia/LHI",
+        "Australia/Lord_Howe",
+        "Australia/Melbourne",
+        "Australia/NSW",
+        "Australia/Sydney",
+        "Australia/Tasmania",
+        "Australia/Victoria",
+        "Etc/GMT-11",
+        "Pacific/Bougainville",
+        "Pacific/Efate",
+        "Pacific/Guadalcanal",
+        "Pacific/Kosrae",
+        "Pacific/Noumea",
+        "Pacific/Pohnpei",
+        "Pacific/Ponape",
+    ],
+    12.0: [
+        "Asia/Anadyr",
+        "Asia/Kamchatka",
+        "Etc/GMT-12",
+        "Kwajalein",
+        "Pacific/Fiji",
+        "Pacific/Funafuti",
+        "Pacific/Kwajalein",
+        "Pacific/Majuro",
+        "Pacific/Nauru",
+        "Pacific/Norfolk",
+        "Pacific/Tarawa",
+        "Pacific/Wake",
+        "Pacific/Wallis",
+    ],
+    13.0: [
+        "Etc/GMT-13",
+        "NZ",
+        "Pacific/Apia",
+        "Pacific/Auckland",
+        "Pacific/Enderbury",
+        "Pacific/Fakaofo",
+        "Pacific/Kanton",
+        "Pacific/Tongatapu",
+    ],
+    13.75: ["NZ-CHAT", "Pacific/Chatham"],
+    14.0: ["Etc/GMT-14", "Pacific/Kiritimati"],
+}
+
+# tzid -> UTC offset
+TZID_OFFSETS: Dict[str, float] = {tzid: offset for offset, tzids in OFFSET_TZIDS.items() for tzid in tzids}
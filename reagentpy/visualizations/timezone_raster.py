@@ -0,0 +1,143 @@
+"""
+Timezone maps as images, for rendering many choropleths over the same base map.
+
+load_timezone_raster() draws the per-offset boundaries once into an integer label image
+(one label per UTC offset) and the coastlines plus boundary lines into a transparent
+overlay. Each map after that is a lookup table indexed by the label image, composited
+under the overlay: milliseconds instead of drawing every polygon again.
+
+    raster = load_timezone_raster(load_offset_boundaries())
+    image = raster.colorize([-5.0, 1.0], [(1, 0, 0, 1), (0, 0, 1, 1)])
+"""
+import os
+import threading
+import weakref
+from typing import Dict, Sequence, Tuple
+import numpy as np
+from reagentpy.constants import DEFAULT_TIMEZONE_RASTER_WIDTH
+from reagentpy.visualizations.timezone_boundaries import OffsetBoundaries, pick_tolerance
+
+GLOBAL_EXTENT = (-180.0, 180.0, -90.0, 90.0)
+
+_rasters_lock = threading.Lock()
+# OffsetBoundaries -> (width, coastlines) -> TimezoneRaster
+_rasters: "weakref.WeakKeyDictionary[OffsetBoundaries, Dict[Tuple[int, bool], TimezoneRaster]]" = weakref.WeakKeyDictionary()
+
+
+def _draw(width: int, height: int, draw) -> np.ndarray:
+    """RGBA pixels of a transparent, frameless global PlateCarree map drawn by draw(ax)."""
+    import cartopy.crs as ccrs
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(width / 100, height / 100), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    figure.patch.set_alpha(0.0)
+    ax = figure.add_axes((0, 0, 1, 1), projection=ccrs.PlateCarree())
+    ax.set_extent(GLOBAL_EXTENT, crs=ccrs.PlateCarree())
+    ax.patch.set_visible(False)
+    ax.spines["geo"].set_visible(False)
+    draw(ax)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+class TimezoneRaster:
+    """
+    A label image of the world (0 where no offset has boundaries, i + 1 for offsets[i]) and
+    an RGBA overlay of the lines drawn over it, both covering GLOBAL_EXTENT.
+    """
+
+    def __init__(self, labels: np.ndarray, offsets: np.ndarray, base: np.ndarray):
+        self.labels = labels
+        self.offsets = np.asarray(offsets, dtype=np.float64)
+        self.base = base
+        self.extent = GLOBAL_EXTENT
+        # Most of the overlay is transparent; only the pixels under lines need blending
+        self._line_pixels = np.flatnonzero(base[..., 3])
+        lines = base.reshape(-1, 4)[self._line_pixels].astype(np.float32) / 255
+        self._line_rgb = lines[:, :3]
+        self._line_alpha = lines[:, 3:]
+
+    @classmethod
+    def render(cls, boundaries: OffsetBoundaries, width: int = DEFAULT_TIMEZONE_RASTER_WIDTH,
+               coastlines: bool = True) -> "TimezoneRaster":
+        """Rasterize boundaries (simplified to the image's resolution) at width x width / 2 pixels."""
+        if len(boundaries) > 255:
+            raise ValueError(f"A label image holds at most 255 offsets, not {len(boundaries)}.")
+        height = width // 2
+        shapes = boundaries.simplified(pick_tolerance(width, 1))
+        geometries = shapes.geometries()
+
+        def draw_labels(ax):
+            # Each offset's label in the red channel, without antialiasing so every pixel is exact
+            for label, geometry in enumerate(geometries, start=1):
+                ax.add_geometries([geometry], crs=ax.projection, facecolor=(label / 255, 0, 0),
+                                  edgecolor="none", linewidth=0, antialiased=False)
+
+        def draw_base(ax):
+            ax.add_geometries(geometries, crs=ax.projection, facecolor="none", edgecolor="black", linewidth=0.5)
+            if coastlines:
+                ax.coastlines()
+
+        pixels = _draw(width, height, draw_labels)
+        labels = np.where(pixels[..., 3] > 0, pixels[..., 0], 0).astype(np.uint8)
+        return cls(labels, shapes.offsets, _draw(width, height, draw_base))
+
+    def colorize(self, offsets: Sequence[float], colors, alpha: float = 1.0, background=(1.0, 1.0, 1.0, 1.0)) -> np.ndarray:
+        """
+        An RGBA (uint8) image with each offset's area filled with its color (blended over the
+        background with alpha, like a translucent polygon) and the lines drawn on top.
+        """
+        colors = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+        background = np.asarray(background, dtype=np.float32)[:3]
+
+        lookup = np.tile(background, (len(self.offsets) + 1, 1))
+        positions = np.searchsorted(self.offsets, np.asarray(offsets, dtype=np.float64))
+        positions = np.minimum(positions, max(len(self.offsets) - 1, 0))
+        for position, offset, color in zip(positions, offsets, colors):
+            if len(self.offsets) and self.offsets[position] == offset:
+                lookup[position + 1] = color[:3] * alpha + background * (1 - alpha)
+        table = np.empty((len(lookup), 4), dtype=np.uint8)
+        table[:, :3] = np.round(lookup * 255)
+        table[:, 3] = 255
+
+        # Gather whole RGBA pixels as uint32 words
+        image = table.view(np.uint32).ravel()[self.labels].view(np.uint8).reshape(self.labels.shape + (4,))
+        pixels = image.reshape(-1, 4)
+        under = pixels[self._line_pixels, :3].astype(np.float32) / 255
+        blended = self._line_rgb * self._line_alpha + under * (1 - self._line_alpha)
+        pixels[self._line_pixels, :3] = np.round(blended * 255)
+        return image
+
+
+def load_timezone_raster(boundaries: OffsetBoundaries, width: int = DEFAULT_TIMEZONE_RASTER_WIDTH,
+                         coastlines: bool = True) -> TimezoneRaster:
+    """
+    The label image and overlay of boundaries, rendered once per process and, for boundaries
+    loaded from a store, kept next to it until the store changes.
+    """
+    key = (width, coastlines)
+    with _rasters_lock:
+        raster = _rasters.get(boundaries, {}).get(key)
+    if raster is not None:
+        return raster
+
+    path = None
+    if boundaries.path is not None:
+        path = f"{os.path.splitext(boundaries.path)[0]}-raster-{width}{'' if coastlines else '-bare'}.npz"
+        source = f"{os.path.getmtime(boundaries.path)}"
+        if os.path.exists(path):
+            with np.load(path) as stored:
+                if str(stored["source"]) == source:
+                    raster = TimezoneRaster(stored["labels"], stored["offsets"], stored["base"])
+
+    if raster is None:
+        raster = TimezoneRaster.render(boundaries, width=width, coastlines=coastlines)
+        if path is not None:
+            temporary = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez(temporary, labels=raster.labels, offsets=raster.offsets, base=raster.base, source=np.array(source))
+            os.replace(temporary, path)
+
+    with _rasters_lock:
+        return _rasters.setdefault(boundaries, {}).setdefault(key, raster)
@@ -0,0 +1,90 @@
+# FILE: test_async_client.py
+import asyncio
+import pytest
+from unittest.mock import patch
+
+httpx = pytest.importorskip("httpx")
+
+from reagentpy import AsyncReagent
+
+
+def make_reagent(handler, **options):
+    reagent = AsyncReagent(reagent_api_key="test-key", base_url="http://reagent.test/v1", **options)
+    reagent.transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return reagent
+
+
+def test_async_endpoint_returns_reagent_response():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"results": [{"repo": "org/repo", "score": 1}]})
+
+    async def run():
+        async with make_reagent(handler) as reagent:
+            return await reagent.repo().hygiene_summary("org/repo")
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert response.dict() == [{"repo": "org/repo", "score": 1}]
+    assert str(seen[0].url) == "http://reagent.test/v1/repo/hygiene_summary?repo=org%2Frepo"
+
+
+def test_async_params_match_requests_encoding():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"results": []})
+
+    async def run():
+        async with make_reagent(handler) as reagent:
+            await reagent.repo().user_commit_data(repo="org/repo", include_other_repos=True)
+
+    asyncio.run(run())
+
+    assert dict(seen[0].url.params) == {"repo": "org/repo", "limit": "10", "include_other_repos": "True"}
+
+
+def test_async_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"results": []})
+
+    async def run():
+        async with make_reagent(handler, max_concurrency=3) as reagent:
+            client = reagent.composite_scores()
+            await asyncio.gather(*(client.adversarial_total(f"org/repo{i}") for i in range(20)))
+
+    asyncio.run(run())
+
+    assert peak == 3
+
+
+def test_async_init_session_opens_a_new_client():
+    async def run():
+        async with AsyncReagent(reagent_api_key="test-key", base_url="http://reagent.test/v1") as reagent:
+            client = reagent.repo()
+            old = reagent.transport.client
+            client.init_session()
+            new = reagent.transport.client
+            await old.aclose()
+            return old, new
+
+    old, new = asyncio.run(run())
+
+    assert new is not old and new.is_closed
+    assert new.headers["Authorization"] == "Basic test-key"
+
+
+if __name__ == "__main__":
+    pytest.main()
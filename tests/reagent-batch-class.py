@@ -0,0 +1,123 @@
+# FILE: test_batch.py
+import threading
+from concurrent.futures import CancelledError, Future
+import pytest
+from reagentpy import Reagent
+from reagentpy.batch import Batch
+from reagentpy.cache import MemoryCache, bypass_cache
+from reagentpy.testing import StubReagentServer
+
+
+@pytest.fixture
+def server():
+    with StubReagentServer(latency=0.05) as server:
+        yield server
+
+
+def test_batch_returns_futures_and_waits_on_exit(server):
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+        with reagent.batch() as b:
+            timezones = b.repo.timezones("org/repo")
+            hygiene = b.repo.hygiene_summary("org/repo")
+            score = b.composite_scores.adversarial_total(repo="org/repo")
+            status = b.status()
+
+        assert all(future.done() for future in b.futures)
+        assert timezones.result().dict()[0]["repo"] == "org/repo"
+        assert hygiene.result().status_code == 200
+        assert score.result().dict() == [{"foreign_adversarial_score": 3.2}]
+        assert status.result().dict() == {"status": "ok"}
+
+
+def test_identical_calls_are_made_once(server):
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+        with reagent.batch() as b:
+            first = b.repo.timezones("org/repo")
+            same = b.repo.timezones(repo="org/repo", email=None)
+            other = b.repo.timezones("org/other")
+            status, same_status = b.status(), b.status()
+
+    assert first is same and status is same_status and other is not first
+    assert len(server.requests) == 3
+
+
+def test_max_workers_bounds_calls_in_flight(server):
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def before(event):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+
+    def after(event):
+        with lock:
+            in_flight[0] -= 1
+
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+        reagent.transport.add_hook(before=before, after=after)
+        with reagent.batch(max_workers=2) as b:
+            futures = [b.composite_scores.adversarial_total(f"org/repo{i}") for i in range(8)]
+
+    assert all(future.result().status_code == 200 for future in futures)
+    assert peak[0] == 2
+
+
+def test_errors_and_iterators(server):
+    def fail():
+        raise ValueError("boom")
+
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+        with reagent.batch() as b:
+            failed = b.submit(fail)
+            repos = b.repo.iter_repo_list(page_size=50, max_records=120)
+
+    assert isinstance(failed.exception(), ValueError)
+    assert len(repos.result()) == 120
+
+
+def test_leaving_on_error_cancels_queued_calls(server):
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+        with pytest.raises(RuntimeError):
+            with reagent.batch(max_workers=1) as b:
+                futures = [b.composite_scores.adversarial_total(f"org/repo{i}") for i in range(5)]
+                raise RuntimeError("stop")
+
+    assert futures[0].result().status_code == 200
+    assert all(future.cancelled() for future in futures[1:])
+
+
+class CancellingExecutor:
+    """Cancels everything submitted, as a pool shutting down with cancel_futures=True does."""
+
+    def submit(self, function, *args, **kwargs):
+        future = Future()
+        future.cancel()
+        return future
+
+
+def test_calls_cancelled_by_the_pool_fail_instead_of_hanging(server):
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+        b = Batch(reagent, CancellingExecutor(), max_workers=1)
+        futures = [b.status(), b.composite_scores.adversarial_total("org/repo")]
+        b.wait(timeout=5)
+
+    assert all(future.done() for future in futures)
+    for future in futures:
+        with pytest.raises(CancelledError):
+            future.result()
+
+
+def test_calls_run_in_the_submitters_context(server):
+    memory_cache = MemoryCache()
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url, memory_cache=memory_cache) as reagent:
+        with bypass_cache():
+            for _ in range(2):
+                # One worker, so later calls are started from the previous one's callback
+                with reagent.batch(max_workers=1) as b:
+                    b.status()
+                    b.repo.timezones("org/repo")
+                    b.repo.hygiene_summary("org/repo")
+
+    assert len(server.requests) == 6
+    assert memory_cache.stats()["hits"] == memory_cache.stats()["misses"] == 0
@@ -0,0 +1,203 @@
+# FILE: test_cache.py
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from reagentpy.cache import ResponseCache, MemoryCache, cache_key, limited_content, bypass_cache, refresh_cache
+from reagentpy.testing import StubReagentServer
+from reagentpy.transport import ReagentTransport
+
+
+def make_http_response(body):
+    raw = MagicMock()
+    raw.status_code = 200
+    raw.content = json.dumps(body).encode()
+    raw.json.return_value = body
+    return raw
+
+
+def make_transport(cache):
+    transport = ReagentTransport(reagent_api_key="test-key", cache=cache)
+    transport.session.request = MagicMock(return_value=make_http_response({"results": [{"a": 1}]}))
+    return transport
+
+
+def test_cache_key_drops_none_and_sorts_params():
+    assert cache_key("get", "/repo/timezones", {"repo": "org/repo", "email": None, "name": "x"}) == \
+        cache_key("GET", "/repo/timezones", {"name": "x", "repo": "org/repo"})
+
+
+def test_hit_skips_network():
+    transport = make_transport(ResponseCache(":memory:"))
+
+    first = transport.request("GET", "/repo/timezones", params={"repo": "org/repo", "email": None})
+    second = transport.request("GET", "/repo/timezones", params={"repo": "org/repo"})
+
+    transport.session.request.assert_called_once()
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.dict() == [{"a": 1}]
+
+
+def test_bypass_and_refresh():
+    cache = ResponseCache(":memory:")
+    transport = make_transport(cache)
+
+    with bypass_cache():
+        transport.request("GET", "/repo/timezones", params={"repo": "org/repo"})
+    assert len(cache) == 0
+
+    transport.request("GET", "/repo/timezones", params={"repo": "org/repo"})
+    with refresh_cache():
+        transport.request("GET", "/repo/timezones", params={"repo": "org/repo"})
+    assert transport.session.request.call_count == 3
+
+
+def test_ttl_expiry_and_per_endpoint_ttls():
+    cache = ResponseCache(":memory:", default_ttl=10, ttls={"/repo": 100, "/repo/timezones": 0})
+
+    assert cache.ttl_for("/repo/list") == 100
+    assert cache.ttl_for("/repo/timezones") == 0
+    assert cache.ttl_for("/commit/data") == 10
+    assert cache.ttl_for("/status") == 0
+
+    with patch("reagentpy.cache.time.time", return_value=1000.0):
+        cache.set("k", "/commit/data", 200, b"{}")
+        assert cache.get("k") == (200, b"{}")
+    with patch("reagentpy.cache.time.time", return_value=1011.0):
+        assert cache.get("k") is None
+
+
+def test_lru_eviction():
+    cache = ResponseCache(":memory:", default_ttl=None, max_bytes=50, compression_level=0)
+
+    with patch("reagentpy.cache.time.time", return_value=1.0):
+        cache.set("a", "/x", 200, b"a" * 10)
+    with patch("reagentpy.cache.time.time", return_value=2.0):
+        cache.set("b", "/x", 200, b"b" * 10)
+    with patch("reagentpy.cache.time.time", return_value=3.0):
+        cache.get("a")
+    with patch("reagentpy.cache.time.time", return_value=4.0):
+        cache.set("c", "/x", 200, b"c" * 10)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_memory_cache_coalesces_concurrent_requests():
+    memory_cache = MemoryCache()
+    transport = ReagentTransport(reagent_api_key="test-key", memory_cache=memory_cache)
+    release = threading.Event()
+
+    def slow_request(*args, **kwargs):
+        release.wait(5)
+        return make_http_response({"results": [{"foreign_adversarial_score": 1.5}]})
+
+    transport.session.request = MagicMock(side_effect=slow_request)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(transport.request("GET", "/foreign-adversarial/total", params={"repo": "org/repo"})))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    transport.session.request.assert_called_once()
+    assert len({id(result) for result in results}) == 1
+    assert memory_cache.stats()["misses"] == 1
+    assert memory_cache.stats()["coalesced"] == 7
+
+    transport.request("GET", "/foreign-adversarial/total", params={"repo": "org/repo"})
+    assert memory_cache.stats()["hits"] == 1
+
+
+def test_memory_cache_lru_and_errors():
+    memory_cache = MemoryCache(max_entries=2)
+
+    for key in ("a", "b", "c"):
+        memory_cache.get_or_fetch(key, "/x", lambda: key)
+    assert memory_cache.get("a") is None
+    assert memory_cache.stats()["evictions"] == 1
+
+    def fail():
+        raise ConnectionError("boom")
+
+    with pytest.raises(ConnectionError):
+        memory_cache.get_or_fetch("d", "/x", fail)
+    assert memory_cache.get_or_fetch("d", "/x", lambda: "ok") == ("ok", "miss")
+
+
+if __name__ == "__main__":
+    pytest.main()
+
+
+@pytest.mark.parametrize("caches", [
+    {"cache": ResponseCache(":memory:")},
+    {"memory_cache": MemoryCache()},
+])
+def test_smaller_limits_are_sliced_from_cached_results(caches):
+    with StubReagentServer(records_per_day=2) as server:
+        with ReagentTransport(reagent_api_key="test-key", base_url=server.base_url, **caches) as transport:
+            params = {"repo": "org/repo", "start_date": "2024-01-01"}
+            larger = transport.request("GET", "/commit/data", params={**params, "limit": 50})
+            smaller = transport.request("GET", "/commit/data", params={**params, "limit": 10})
+            assert smaller.from_cache
+            assert smaller.dict() == larger.dict()[:10]
+            assert len(server.requests) == 1
+
+            # Not covered by the cached limit, or a different query
+            transport.request("GET", "/commit/data", params={**params, "limit": 80})
+            transport.request("GET", "/commit/data", params={"repo": "org/other", "start_date": "2024-01-01", "limit": 10})
+            assert transport.request("GET", "/commit/data", params={**params, "limit": 60}).from_cache
+            # Endpoints without a deterministic order are only reused for the exact query
+            transport.request("GET", "/repo/list", params={"limit": 50})
+            transport.request("GET", "/repo/list", params={"limit": 10})
+    assert [request["params"].get("limit") for request in server.requests] == ["50", "80", "10", "50", "10"]
+
+
+def test_limited_content_knows_when_results_are_complete():
+    body = {"results": [1, 2, 3]}
+    assert json.loads(limited_content(body, 10, 2)) == {"results": [1, 2]}
+    # Three records for a limit of ten is everything there is
+    assert json.loads(limited_content(body, 10, 5)) == body
+    # Three records for a limit of three may have been cut off
+    assert limited_content(body, 3, 5) is None
+
+
+@pytest.mark.parametrize("caches", [
+    {"cache": ResponseCache(":memory:")},
+    {"memory_cache": MemoryCache()},
+])
+def test_refreshing_a_smaller_limit_replaces_the_larger_result(caches):
+    with StubReagentServer(records_per_day=2) as server:
+        with ReagentTransport(reagent_api_key="test-key", base_url=server.base_url, **caches) as transport:
+            params = {"repo": "org/repo", "start_date": "2024-01-01"}
+            transport.request("GET", "/commit/data", params={**params, "limit": 50})
+            with refresh_cache():
+                refreshed = transport.request("GET", "/commit/data", params={**params, "limit": 10})
+            # Smaller limits are sliced from the refreshed result; the stale larger one is gone
+            smaller = transport.request("GET", "/commit/data", params={**params, "limit": 5})
+            assert smaller.from_cache
+            assert smaller.dict() == refreshed.dict()[:5]
+            assert not transport.request("GET", "/commit/data", params={**params, "limit": 40}).from_cache
+    assert [request["params"].get("limit") for request in server.requests] == ["50", "10", "40"]
+
+
+def test_order_dependent_endpoints_are_sliced_only_when_ordered():
+    with StubReagentServer(records_per_day=2) as server:
+        with ReagentTransport(reagent_api_key="test-key", base_url=server.base_url, memory_cache=MemoryCache()) as transport:
+            params = {"repo": "org/repo"}
+            transport.request("GET", "/repo/user_commit_data", params={**params, "limit": 50})
+            assert not transport.request("GET", "/repo/user_commit_data", params={**params, "limit": 10}).from_cache
+
+            ordered = {**params, "order_by_date": True}
+            transport.request("GET", "/repo/user_commit_data", params={**ordered, "limit": 50})
+            assert transport.request("GET", "/repo/user_commit_data", params={**ordered, "limit": 10}).from_cache
+    assert len(server.requests) == 3
@@ -0,0 +1,54 @@
+# FILE: test_cassette.py
+import pytest
+from reagentpy import Reagent
+from reagentpy.cassette import Cassette, request_key
+from reagentpy.testing import StubReagentServer
+
+
+def test_record_then_replay_without_network(tmp_path, monkeypatch):
+    path = str(tmp_path / "session.cassette")
+    with StubReagentServer() as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, cassette=path) as reagent:
+            assert reagent.transport.cassette.recording
+            recorded = reagent.commit().data(repo="org/repo", limit=25).dict()
+            reagent.repo().timezones("org/repo")
+        requests_sent = len(server.requests)
+
+    # No key and an unreachable server: everything must come from the cassette
+    monkeypatch.delenv("REAGENT_API_KEY", raising=False)
+    monkeypatch.setattr("reagentpy.transport._resolved_api_key", None)
+    monkeypatch.setattr("reagentpy.transport._credentials_loaded", True)
+    with Reagent(base_url="http://127.0.0.1:9", cassette=Cassette(path, mode="replay")) as reagent:
+        assert reagent.commit().data(repo="org/repo", limit=25).dict() == recorded
+        assert reagent.repo().timezones("org/repo").status_code == 200
+        assert len(reagent.transport.cassette) == 2
+        with pytest.raises(LookupError):
+            reagent.repo().timezones("other/repo")
+    assert requests_sent == 2
+
+
+def test_rerecording_keeps_other_entries(tmp_path):
+    path = str(tmp_path / "session.cassette")
+    with Cassette(path, mode="record") as cassette:
+        cassette.record(request_key("GET", "/a"), "/a", 200, b'{"results": [1]}')
+        cassette.record(request_key("GET", "/b"), "/b", 200, b'{"results": [2]}')
+
+    with Cassette(path, mode="record") as cassette:
+        cassette.record(request_key("GET", "/b"), "/b", 404, b'{"error": "gone"}')
+
+    with Cassette(path, mode="replay") as cassette:
+        assert cassette.replay("GET", "/a") == (200, b'{"results": [1]}')
+        assert cassette.replay("GET", "/b") == (404, b'{"error": "gone"}')
+        assert len(cassette) == 2
+
+
+def test_keys_include_params_and_body(tmp_path):
+    assert request_key("get", "/x", {"a": 1, "b": None}) == request_key("GET", "/x", {"a": 1})
+    assert request_key("POST", "/x", body={"q": 1}) != request_key("POST", "/x", body={"q": 2})
+
+
+def test_rejects_files_that_are_not_cassettes(tmp_path):
+    path = tmp_path / "not.cassette"
+    path.write_bytes(b"hello world" * 10)
+    with pytest.raises(ValueError):
+        Cassette(str(path))
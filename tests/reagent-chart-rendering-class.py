@@ -0,0 +1,110 @@
+# FILE: test_chart_rendering.py
+import io
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pytest
+from click.testing import CliRunner
+from reagentpy import Reagent
+from reagentpy.cli import cli
+from reagentpy.testing import StubReagentServer
+from reagentpy.visualizations.rendering import ChartJob, chart_format, render_charts
+
+SIGNATURES = {"png": b"\x89PNG", "pdf": b"%PDF", "svg": b"<?xml"}
+
+
+@pytest.fixture
+def reagent():
+    with StubReagentServer() as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+            yield reagent
+
+
+@pytest.mark.parametrize("client, method", [
+    ("boe_visualizations", "total_chart"),
+    ("boe_visualizations", "create_percent_chart"),
+    ("boe_visualizations", "plot_percent_timezone_color"),
+    ("boe_visualizations", "show_percents_logarithmic_bar_chart"),
+    ("boe_visualizations", "plot_adversarial_percent_timezone_color"),
+    ("boe_visualizations", "show_adversarial_percents_logarithmic_bar_chart"),
+    ("demo_visualizations", "create_out_of_ten_chart"),
+    ("demo_visualizations", "hibp_pie_chart"),
+    ("demo_visualizations", "adversarial_pie_chart"),
+    ("timezone_visualizations", "show_logarithmic_bar_chart"),
+    ("timezone_visualizations", "plot_timezone_distribution"),
+    ("timezone_visualizations", "plot_timezone_distribution_color"),
+])
+def test_chart_methods_save_to_output_and_close_their_figure(reagent, tmp_path, monkeypatch, client, method):
+    monkeypatch.setattr("matplotlib.pyplot.show", lambda: pytest.fail("plt.show() called with an output"))
+    output = tmp_path / f"{method}.svg"
+    assert getattr(getattr(reagent, client)(), method)("org/repo", output=str(output)) == str(output)
+    assert SIGNATURES["svg"] in output.read_bytes()[:100]
+    assert plt.get_fignums() == []
+
+
+def test_file_objects_are_saved_by_name_or_as_png(reagent):
+    charts = reagent.boe_visualizations()
+    buffer = io.BytesIO()
+    charts.total_chart("org/repo", output=buffer)
+    assert buffer.getvalue().startswith(SIGNATURES["png"])
+
+    assert chart_format("chart.PDF") == "pdf"
+    with pytest.raises(ValueError, match="png, svg, pdf"):
+        chart_format("chart.jpg")
+
+
+def test_without_output_charts_are_shown(reagent, monkeypatch):
+    shown = []
+    monkeypatch.setattr("matplotlib.pyplot.show", lambda: shown.append(plt.get_fignums()))
+    assert reagent.boe_visualizations().total_chart("org/repo") is None
+    plt.close("all")
+    assert len(shown) == 1 and len(shown[0]) == 1
+
+
+def test_render_charts_fans_jobs_across_processes(tmp_path):
+    repos = [f"org/repo-{i}" for i in range(6)]
+    jobs = [ChartJob("boe", "total_chart", (repo,), str(tmp_path / f"{repo.split('/')[1]}.{format}"))
+            for repo, format in zip(repos, ["png", "pdf", "svg"] * 2)]
+    jobs.append(ChartJob("boe", "no_such_chart", ("org/repo",), str(tmp_path / "missing.png")))
+
+    with StubReagentServer() as server:
+        results = render_charts(jobs, max_workers=2, max_tasks_per_child=3,
+                                reagent_api_key="test-key", base_url=server.base_url)
+
+    assert [result.job for result in results] == jobs
+    for result in results[:-1]:
+        assert result.error is None
+        with open(result.output, "rb") as file:
+            assert SIGNATURES[result.output.rsplit(".", 1)[1]] in file.read(100)
+    assert isinstance(results[-1].error, AttributeError)
+    assert not (tmp_path / "missing.png").exists()
+
+
+def test_map_without_boundaries_raises_instead_of_writing_nothing(reagent, tmp_path, monkeypatch):
+    monkeypatch.setenv("REAGENT_TIMEZONE_GEOJSON", str(tmp_path / "missing.json"))
+    monkeypatch.setenv("REAGENT_TIMEZONE_STORE", str(tmp_path / "missing.arrow"))
+    with pytest.raises(FileNotFoundError, match="build-boundary-store"):
+        reagent.timezone_visualizations().build_and_show_timezone_map("org/repo", output=str(tmp_path / "map.png"))
+    assert not (tmp_path / "map.png").exists()
+
+
+def test_chart_commands_save_to_the_global_output(tmp_path, monkeypatch):
+    monkeypatch.setattr("reagentpy.transport._resolved_api_key", "test-key")
+    monkeypatch.setattr("reagentpy.transport._credentials_loaded", True)
+    output = tmp_path / "chart.pdf"
+    with StubReagentServer() as server:
+        monkeypatch.setenv("REAGENT_BASE_URL", server.base_url)
+        result = CliRunner().invoke(cli, ["--output", str(output), "timezone-visualizations",
+                                          "plot-timezone-distribution", "--repo", "org/repo"])
+        counts = CliRunner().invoke(cli, ["--output", str(tmp_path / "political.svg"), "demo-visualizations",
+                                          "political-chart", "--repo", "org/repo", "--country-counts", '{"US": 3, "CN": 1}'])
+    assert result.exit_code == 0, result.output
+    assert result.output.strip() == str(output)
+    assert output.read_bytes().startswith(SIGNATURES["pdf"])
+    assert counts.exit_code == 0, counts.output
+    assert plt.get_fignums() == []
+
+
+def test_chart_jobs_need_an_output():
+    with pytest.raises(ValueError, match="output"):
+        render_charts([ChartJob("boe", "total_chart", ("org/repo",))])
@@ -0,0 +1,92 @@
+# FILE: test_cli.py
+import json
+import pytest
+from click.testing import CliRunner
+from reagentpy.cli import cli
+from reagentpy.streaming import is_streaming
+from reagentpy.testing import StubReagentServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StubReagentServer() as server:
+        monkeypatch.setenv("REAGENT_BASE_URL", server.base_url)
+        monkeypatch.setattr("reagentpy.transport._resolved_api_key", "test-key")
+        monkeypatch.setattr("reagentpy.transport._credentials_loaded", True)
+        yield server
+
+
+def test_csv_is_the_default_format(server):
+    result = CliRunner().invoke(cli, ["repo", "repo-list", "--limit", "3"])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].startswith("repo,description,total_contributors")
+    assert len(lines) == 4
+
+
+def test_ndjson_and_json_formats(server):
+    result = CliRunner().invoke(cli, ["--format", "ndjson", "repo", "user-commit-data", "--repo", "org/repo", "--limit", "5"])
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert len(rows) == 5 and rows[0]["repo"] == "org/repo"
+
+    result = CliRunner().invoke(cli, ["--format", "json", "status"])
+    assert json.loads(result.output) == [{"status": "ok"}]
+
+
+def test_output_file_and_parquet(server, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "commits.parquet"
+
+    result = CliRunner().invoke(cli, ["--format", "parquet", "--output", str(path),
+                                      "repo", "user-commit-data", "--repo", "org/repo", "--limit", "250"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output == ""
+    assert pq.read_table(str(path)).num_rows == 250
+
+
+def test_commands_run_inside_streaming(server, monkeypatch):
+    seen = []
+    monkeypatch.setattr("reagentpy.cli.write_csv", lambda records, file: seen.append(is_streaming()))
+
+    CliRunner().invoke(cli, ["repo", "repo-list", "--limit", "3"])
+
+    assert seen == [True]
+    assert not is_streaming()
+
+
+def test_batch_runs_a_command_per_repo_and_continues_past_errors(monkeypatch, tmp_path):
+    repos = tmp_path / "repos.txt"
+    repos.write_text("# dependencies\n" + "\n".join(f"org/repo{i}" for i in range(12)) + "\n\n")
+
+    with StubReagentServer(error_rate=0.3, error_statuses=(404,), seed=3) as server:
+        monkeypatch.setenv("REAGENT_BASE_URL", server.base_url)
+        monkeypatch.setattr("reagentpy.transport._resolved_api_key", "test-key")
+        monkeypatch.setattr("reagentpy.transport._credentials_loaded", True)
+        result = CliRunner().invoke(cli, ["batch", "composite_scores", "adversarial_total",
+                                          "--repos-file", str(repos), "--concurrency", "4"])
+        requested = sorted(request["params"]["repo"] for request in server.requests)
+
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(line["repo"] for line in lines) == sorted(f"org/repo{i}" for i in range(12)) == requested
+    failed = [line for line in lines if line["status"] == "error"]
+    assert failed and all("404" in line["error"] for line in failed)
+    assert all(line["results"] == [{"foreign_adversarial_score": 3.2}] for line in lines if line["status"] == "ok")
+    assert "12 repos in" in result.stderr and f"{len(failed)} failed" in result.stderr
+
+
+def test_batch_passes_options_through(server, tmp_path):
+    repos = tmp_path / "repos.txt"
+    repos.write_text("org/a\norg/b\n")
+
+    result = CliRunner().invoke(cli, ["batch", "repo", "user-commit-data", "--limit", "2", "--repos-file", str(repos)])
+
+    assert result.exit_code == 0, result.output
+    lines = {line["repo"]: line for line in map(json.loads, result.stdout.splitlines())}
+    assert [record["repo"] for record in lines["org/b"]["results"]] == ["org/b", "org/b"]
+
+    result = CliRunner().invoke(cli, ["batch", "repo", "repo-list", "--repos-file", str(repos)])
+    assert result.exit_code == 2
+    assert "does not take a --repo option" in result.output
@@ -0,0 +1,59 @@
+# FILE: test_composite_report.py
+import asyncio
+import pytest
+from reagentpy import Reagent
+from reagentpy.cache import MemoryCache, bypass_cache
+from reagentpy.clients.composite_scores import REPORT_FIELDS, CompositeReport
+from reagentpy.testing import StubReagentServer
+
+LATENCY = 0.2
+
+
+@pytest.fixture
+def server():
+    with StubReagentServer(latency=LATENCY) as server:
+        yield server
+
+
+def test_full_report_runs_every_call_concurrently(server):
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+        report = reagent.composite_scores().full_report("org/repo")
+
+    assert isinstance(report, CompositeReport)
+    assert sorted(request["path"] for request in server.requests) == sorted([
+        "/v1/metadata-risk/components", "/v1/metadata-risk/total", "/v1/metadata-risk/timezones",
+        "/v1/foreign-adversarial/components", "/v1/foreign-adversarial/timezones", "/v1/foreign-adversarial/total",
+        "/v1/repo/hygiene_summary", "/v1/enrichments/threat/score",
+    ])
+    assert all(request["params"] == {"repo": "org/repo"} for request in server.requests)
+    assert set(report.timings) == set(REPORT_FIELDS)
+    assert min(report.timings.values()) >= LATENCY
+    # The calls overlap on the server rather than arriving one after another
+    assert server.peak_in_flight > 1
+    assert report.raise_for_status().dict()["adversarial_total"] == [{"foreign_adversarial_score": 3.2}]
+
+
+def test_full_report_follows_the_callers_cache_mode(server):
+    memory_cache = MemoryCache()
+    with Reagent(reagent_api_key="test-key", base_url=server.base_url, memory_cache=memory_cache) as reagent:
+        with bypass_cache():
+            reagent.composite_scores().full_report("org/repo")
+            reagent.composite_scores().full_report("org/repo")
+
+    assert len(server.requests) == 2 * len(REPORT_FIELDS)
+    assert memory_cache.stats()["hits"] == memory_cache.stats()["misses"] == 0
+
+
+def test_async_full_report(server):
+    pytest.importorskip("httpx")
+    from reagentpy.clients.aio import AsyncReagent
+
+    async def main():
+        async with AsyncReagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+            return await reagent.composite_scores().full_report("org/repo")
+
+    report = asyncio.run(main())
+
+    assert report.nonadversarial_total.dict() == [{"metadata_risk_score": 37.5}]
+    assert report.hygiene_summary.status_code == 200
+    assert server.peak_in_flight > 1
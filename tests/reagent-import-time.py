@@ -0,0 +1,38 @@
+# FILE: test_import_time.py
+import os
+import subprocess
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from import_time import REPO_ROOT, measure
+
+# Generous enough for slow CI machines; a regression that pulls in the plotting
+# stack costs seconds, not tenths of a second.
+CLI_IMPORT_BUDGET_SECONDS = 1.0
+
+
+def test_cli_cold_start_skips_plotting_stack():
+    result = measure("reagentpy.cli", runs=3)
+
+    assert result["heavy_modules_loaded"] == []
+    assert result["median_seconds"] < CLI_IMPORT_BUDGET_SECONDS
+
+
+def test_data_client_import_skips_plotting_stack():
+    result = measure("reagentpy.clients.repo", runs=1)
+
+    assert result["heavy_modules_loaded"] == []
+
+
+def test_visualization_clients_still_importable_from_package():
+    output = subprocess.run(
+        [sys.executable, "-c", "from reagentpy import BOEVisClient, AsyncReagent; print(BOEVisClient.__name__, AsyncReagent.__name__)"],
+        check=True, capture_output=True, text=True, cwd=REPO_ROOT,
+    ).stdout
+
+    assert output.split() == ["BOEVisClient", "AsyncReagent"]
+
+
+if __name__ == "__main__":
+    pytest.main()
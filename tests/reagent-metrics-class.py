@@ -0,0 +1,90 @@
+# FILE: test_metrics.py
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from reagentpy import Reagent
+from reagentpy.cache import MemoryCache
+from reagentpy.metrics import LatencyCollector, RequestEvent, percentile
+
+
+def make_http_response(status_code=200, body=None):
+    body = body if body is not None else {"results": [{"a": 1}]}
+    raw = MagicMock()
+    raw.status_code = status_code
+    raw.headers = {}
+    raw.content = json.dumps(body).encode()
+    raw.json.return_value = body
+    return raw
+
+
+def test_hooks_receive_before_and_after_events():
+    before, after = [], []
+    reagent = Reagent(reagent_api_key="test-key", memory_cache=MemoryCache())
+    reagent.transport.add_hook(before=before.append, after=after.append)
+    reagent.transport.session.request = MagicMock(return_value=make_http_response())
+
+    reagent.repo().hygiene_summary("org/repo")
+    reagent.repo().hygiene_summary("org/repo")
+
+    assert [event.endpoint for event in before] == ["/repo/hygiene_summary"] * 2
+    assert after[0].params == {"repo": "org/repo"}
+    assert after[0].status_code == 200
+    assert after[0].bytes == len(b'{"results": [{"a": 1}]}')
+    assert after[0].latency >= 0
+    assert [event.cache_hit for event in after] == [False, True]
+
+
+@patch("reagentpy.transport.time.sleep")
+def test_hooks_see_retries_and_errors(mock_sleep):
+    after = []
+    reagent = Reagent(reagent_api_key="test-key")
+    reagent.transport.add_hook(after=after.append)
+    reagent.transport.session.request = MagicMock(side_effect=[make_http_response(503), make_http_response(200)])
+
+    reagent.commit().data(repo="org/repo")
+    assert after[-1].retries == 1
+
+    reagent.transport.session.request = MagicMock(side_effect=ValueError("bad"))
+    with pytest.raises(ValueError):
+        reagent.commit().data(repo="org/repo")
+    assert isinstance(after[-1].error, ValueError)
+
+
+def test_latency_collector_percentiles_and_openmetrics():
+    collector = LatencyCollector(buckets=(0.1, 1.0))
+    for latency in (0.05, 0.2, 0.3, 2.0):
+        collector.after_request(RequestEvent("GET", "/commit/data", status_code=200, latency=latency, bytes=10))
+    collector.after_request(RequestEvent("GET", "/repo/list", status_code=200, latency=0.01, cache_hit=True))
+
+    summary = collector.summary()
+    assert summary["/commit/data"]["count"] == 4
+    assert summary["/commit/data"]["p50"] == pytest.approx(0.25)
+    assert summary["/commit/data"]["bytes"] == 40
+    assert summary["/repo/list"]["cache_hits"] == 1
+
+    text = collector.to_openmetrics()
+    assert 'reagent_request_duration_seconds_bucket{endpoint="/commit/data",le="0.1"} 1' in text
+    assert 'reagent_request_duration_seconds_bucket{endpoint="/commit/data",le="1.0"} 3' in text
+    assert 'reagent_request_duration_seconds_bucket{endpoint="/commit/data",le="+Inf"} 4' in text
+    assert 'reagent_requests_total{endpoint="/commit/data",status="200"} 4' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_summary_totals_keep_counting_past_the_reservoir():
+    collector = LatencyCollector(reservoir_size=8)
+    for _ in range(20):
+        collector.after_request(RequestEvent("GET", "/commit/data", status_code=200, latency=0.5))
+
+    text = collector.to_openmetrics()
+    assert 'reagent_request_latency_seconds_count{endpoint="/commit/data"} 20' in text
+    assert 'reagent_request_latency_seconds_sum{endpoint="/commit/data"} 10.0' in text
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([1.0, 2.0], 99) == pytest.approx(1.99)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,121 @@
+# FILE: test_pagination.py
+import asyncio
+import json as json_module
+import pytest
+from unittest.mock import MagicMock
+from reagentpy import Reagent
+from reagentpy.cache import CACHE_BYPASS, MemoryCache, bypass_cache, get_cache_mode
+from reagentpy.pagination import AdaptivePageSize, iter_pages
+
+
+RECORDS = [{"sha": f"{i:04x}", "repo": "org/repo"} for i in range(1234)]
+
+
+def make_reagent():
+    reagent = Reagent(reagent_api_key="test-key")
+    requests_seen = []
+
+    def fake_request(method, url, params=None, json=None, timeout=None, stream=False):
+        requests_seen.append(dict(params))
+        offset, limit = params["offset"], params["limit"]
+        body = {"results": RECORDS[offset:offset + limit]}
+        raw = MagicMock()
+        raw.status_code = 200
+        raw.json.return_value = body
+        raw.iter_content.return_value = [json_module.dumps(body).encode()]
+        return raw
+
+    reagent.transport.session.request = MagicMock(side_effect=fake_request)
+    return reagent, requests_seen
+
+
+def test_iter_yields_every_record_across_pages():
+    reagent, requests_seen = make_reagent()
+
+    records = list(reagent.commit().iter_data(repo="org/repo", page_size=100))
+
+    assert records == RECORDS
+    assert len(requests_seen) == 13
+    assert all(params["repo"] == "org/repo" for params in requests_seen)
+    assert [params["offset"] for params in requests_seen] == list(range(0, 1300, 100))
+
+
+def test_prefetched_pages_follow_the_callers_cache_mode():
+    memory_cache = MemoryCache()
+    reagent = Reagent(reagent_api_key="test-key", memory_cache=memory_cache)
+    seen = []
+
+    def fake_request(method, url, params=None, json=None, timeout=None, stream=False):
+        seen.append(get_cache_mode())
+        raw = MagicMock()
+        raw.status_code = 200
+        raw.json.return_value = {"results": RECORDS[:10]}
+        raw.content = json_module.dumps({"results": RECORDS[:10]}).encode()
+        return raw
+
+    reagent.transport.session.request = MagicMock(side_effect=fake_request)
+    with bypass_cache():
+        for _ in range(2):
+            assert list(reagent.commit().iter_data(repo="org/repo", page_size=100)) == RECORDS[:10]
+
+    assert seen == [CACHE_BYPASS, CACHE_BYPASS]
+    assert memory_cache.stats()["hits"] == memory_cache.stats()["misses"] == 0
+
+
+def test_iter_stops_at_max_records():
+    reagent, requests_seen = make_reagent()
+
+    records = list(reagent.repo().iter_user_commit_data(repo="org/repo", page_size=50, max_records=120))
+
+    assert records == RECORDS[:120]
+    assert [params["limit"] for params in requests_seen] == [50, 50, 20]
+
+
+def test_adaptive_page_size_grows_and_shrinks():
+    sizer = AdaptivePageSize(initial=100, minimum=10, maximum=400, target_seconds=1.0)
+
+    assert sizer.update(0.1, 100) == 200
+    assert sizer.update(0.1, 200) == 400
+    assert sizer.update(0.1, 400) == 400
+    assert sizer.update(2.0, 400) == 200
+
+
+def test_iter_pages_stops_on_short_page():
+    calls = []
+
+    def fetch_page(offset, limit):
+        calls.append((offset, limit))
+        return list(range(offset, min(offset + limit, 25)))
+
+    pages = list(iter_pages(fetch_page, page_size=10, prefetch=False))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert calls == [(0, 10), (10, 10), (20, 10)]
+
+
+def test_unpaginated_endpoint_is_rejected():
+    reagent, _ = make_reagent()
+
+    with pytest.raises(ValueError):
+        reagent.repo()._iter_pages("/repo/hygiene_summary", {"repo": "org/repo"})
+
+
+def test_async_iter_yields_every_record():
+    httpx = pytest.importorskip("httpx")
+    from reagentpy import AsyncReagent
+
+    def handler(request):
+        offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+        return httpx.Response(200, json={"results": RECORDS[offset:offset + limit]})
+
+    async def run():
+        reagent = AsyncReagent(reagent_api_key="test-key")
+        reagent.transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with reagent:
+            return [record async for record in reagent.commit().iter_data(repo="org/repo", page_size=500)]
+
+    assert asyncio.run(run()) == RECORDS
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,125 @@
+# FILE: test_partitions.py
+from datetime import date
+from reagentpy import Reagent
+from reagentpy.cache import cache_mode, CACHE_BYPASS
+from reagentpy.partitions import PartitionedCache, partitions_between
+from reagentpy.testing import StubReagentServer
+
+
+def ranges_requested(server):
+    return [(request["params"]["start_date"], request["params"]["end_date"]) for request in server.requests]
+
+
+def test_only_missing_partitions_are_fetched():
+    cache = PartitionedCache(today=lambda: date(2025, 6, 1))
+    with StubReagentServer(records_per_day=3) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, partition_cache=cache) as reagent:
+            first = reagent.commit().data(repo="org/repo", start_date="2024-02-01", end_date="2024-03-01", limit=1000)
+            assert len(first.dict()) == 30 * 3
+            assert not first.from_cache
+
+            widened = reagent.commit().data(repo="org/repo", start_date="2024-01-01", end_date="2024-03-31", limit=1000)
+            assert ranges_requested(server) == [
+                ("2024-02-01", "2024-03-01"),
+                ("2024-01-01", "2024-01-31"),
+                ("2024-03-02", "2024-03-31"),
+            ]
+
+            again = reagent.commit().data(repo="org/repo", start_date="2024-01-15", end_date="2024-02-15", limit=1000)
+            assert again.from_cache
+            assert len(server.requests) == 3
+
+            with cache_mode(CACHE_BYPASS):
+                direct = reagent.commit().data(repo="org/repo", start_date="2024-01-01", end_date="2024-03-31", limit=1000)
+    assert widened.dict() == direct.dict()
+
+
+def test_sliding_window_refetches_open_partitions():
+    today = date(2024, 6, 30)
+    cache = PartitionedCache(open_ttl=0, today=lambda: today)
+    with StubReagentServer(records_per_day=2) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, partition_cache=cache) as reagent:
+            reagent.commit().data(repo="org/repo", start_date="2024-06-01", end_date="2024-06-30", limit=1000)
+            response = reagent.commit().data(repo="org/repo", start_date="2024-06-02", end_date="2024-07-01", limit=1000)
+    assert len(response.dict()) == 30 * 2
+    # Settled days are reused; only the days near today and the new day are requested again
+    assert ranges_requested(server)[1:] == [("2024-06-28", "2024-07-01")]
+
+
+def test_month_partitions_are_trimmed_to_the_range():
+    cache = PartitionedCache(granularity="month", today=lambda: date(2025, 1, 1))
+    with StubReagentServer(records_per_day=1) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, partition_cache=cache) as reagent:
+            records = reagent.commit().data(repo="org/repo", start_date="2024-01-10", end_date="2024-02-29", limit=1000).dict()
+            response = reagent.commit().data(repo="org/repo", start_date="2024-01-20", end_date="2024-02-10", limit=5)
+    assert len(records) == 22 + 29
+    assert response.from_cache
+    assert [record["date"][:10] for record in response.dict()] == [f"2024-01-{day}" for day in range(20, 25)]
+    assert ranges_requested(server) == [("2024-01-01", "2024-02-29")]
+
+
+def test_partitions_keep_the_order_of_newest_first_endpoints():
+    cache = PartitionedCache(today=lambda: date(2025, 1, 1))
+    with StubReagentServer(records_per_day=2) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, partition_cache=cache) as reagent:
+            reagent.user().post_patch(repo="org/repo", start_date="2024-01-10", end_date="2024-01-20", limit=1000)
+            widened = reagent.user().post_patch(repo="org/repo", start_date="2024-01-01", end_date="2024-01-31", limit=1000)
+            latest = reagent.user().post_patch(repo="org/repo", start_date="2024-01-01", end_date="2024-01-31", limit=10)
+            with cache_mode(CACHE_BYPASS):
+                direct = reagent.user().post_patch(repo="org/repo", start_date="2024-01-01", end_date="2024-01-31", limit=1000)
+    assert ranges_requested(server)[1:3] == [("2024-01-21", "2024-01-31"), ("2024-01-01", "2024-01-09")]
+    assert widened.dict() == direct.dict()
+    assert latest.from_cache
+    assert latest.dict() == direct.dict()[:10]
+    assert latest.dict()[0]["date"][:10] == "2024-01-31"
+
+
+def test_small_limits_over_uncached_partitions_go_straight_to_the_api():
+    cache = PartitionedCache(today=lambda: date(2025, 1, 1))
+    with StubReagentServer(records_per_day=3) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, partition_cache=cache) as reagent:
+            response = reagent.commit().data(repo="org/repo", start_date="2024-01-01", end_date="2024-12-31", limit=10)
+    assert len(response.dict()) == 10
+    assert [request["params"]["limit"] for request in server.requests] == ["10"]
+    assert cache.misses == 0
+
+
+def test_unparseable_and_backwards_ranges_are_sent_as_they_are():
+    cache = PartitionedCache(today=lambda: date(2025, 1, 1))
+    with StubReagentServer(records_per_day=3) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, partition_cache=cache) as reagent:
+            unparseable = reagent.commit().data(repo="org/repo", start_date="01/02/2024", end_date="2024-03-31", limit=1000)
+            backwards = reagent.commit().data(repo="org/repo", start_date="2024-03-31", end_date="2024-01-01", limit=1000)
+    assert unparseable.status_code == 400
+    assert backwards.dict() == []
+    assert ranges_requested(server) == [("01/02/2024", "2024-03-31"), ("2024-03-31", "2024-01-01")]
+    assert cache.hits == cache.misses == 0
+
+
+def test_aggregate_endpoints_bypass_partitions():
+    cache = PartitionedCache(today=lambda: date(2025, 1, 1))
+    with StubReagentServer(records_per_day=3) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url, partition_cache=cache) as reagent:
+            reagent.user().profile(email="dev@example.com", start_date="2024-01-01", end_date="2024-03-31", limit=1000)
+            reagent.user().commit_file_community(repo="org/repo", start_date="2024-01-01", end_date="2024-03-31", limit=1000)
+    assert not cache.applies("/user/profile", {"start_date": "2024-01-01", "end_date": "2024-03-31"})
+    assert ranges_requested(server) == [("2024-01-01", "2024-03-31")] * 2
+    assert cache.hits == cache.misses == 0
+
+
+def test_partitions_between():
+    assert partitions_between(date(2024, 1, 30), date(2024, 3, 2), "month") == [
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 31)),
+    ]
+    assert len(partitions_between(date(2024, 1, 30), date(2024, 2, 2), "day")) == 4
+
+
+def test_metadata_flag_is_kept():
+    cache = PartitionedCache(today=lambda: date(2025, 1, 1))
+    with StubReagentServer(records_per_day=1) as server:
+        with Reagent(reagent_api_key="test-key", base_url=server.base_url) as reagent:
+            params = {"repo": "org/repo", "start_date": "2024-01-01", "end_date": "2024-01-05", "limit": 1000}
+            response = cache.request(reagent.transport, "/commit/data", params, metadata=True)
+    assert len(response.dict()["results"]) == 5
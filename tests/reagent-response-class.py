@@ -0,0 +1,125 @@
+# FILE: test_response.py
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+from reagentpy.clients import ReagentResponse
+from reagentpy.schemas import DATETIME, INT, apply_schema
+
+
+def make_response(body):
+    raw = MagicMock()
+    raw.status_code = 200
+    raw.json.return_value = body
+    return raw
+
+
+def test_body_is_decoded_once():
+    raw = make_response({"results": [{"repo": "org/repo", "commits": 3}]})
+    response = ReagentResponse(raw)
+
+    response.dict()
+    response.df()
+    response.json()
+    response.csv()
+    response.text()
+
+    raw.json.assert_called_once()
+
+
+def test_views_are_cached():
+    response = ReagentResponse(make_response({"results": [{"repo": "org/repo", "commits": 3}]}))
+
+    assert response.df() is response.df()
+    assert response.csv() is response.text()
+    assert response.json() == '[{"repo":"org\\/repo","commits":3}]'
+
+
+def test_metadata_returns_full_body():
+    body = {"results": [{"a": 1}], "count": 1}
+
+    assert ReagentResponse(make_response(body)).dict() == [{"a": 1}]
+    assert ReagentResponse(make_response(body), metadata=True).dict() == body
+
+
+def test_keep_raw_false_drops_response_after_decode():
+    response = ReagentResponse(make_response({"results": [{"a": 1}]}), keep_raw=False)
+
+    assert response.dict() == [{"a": 1}]
+    assert response.response is None
+    assert response.df()["a"].tolist() == [1]
+
+
+def test_arrow_builds_flattened_table_and_parquet(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    response = ReagentResponse(make_response({"results": [
+        {"repo": "org/repo", "stats": {"commits": 3}},
+        {"repo": "org/other", "stats": {"commits": 5}, "email": "a@b.c"},
+    ]}))
+
+    table = response.arrow()
+    assert table.column_names == ["repo", "stats.commits", "email"]
+    assert table.column("email").to_pylist() == [None, "a@b.c"]
+    assert response.arrow() is table
+
+    declared = response.arrow(schema=pa.schema([("repo", pa.dictionary(pa.int32(), pa.string()))]))
+    assert pa.types.is_dictionary(declared.schema.field("repo").type)
+
+    response.to_parquet(tmp_path / "out.parquet")
+    assert pq.read_table(tmp_path / "out.parquet").equals(table)
+
+
+def test_arrow_backed_df():
+    pytest.importorskip("pyarrow")
+
+    response = ReagentResponse(make_response({"results": [{"repo": "org/repo", "commits": 3}]}))
+    frame = response.df(dtype_backend="pyarrow")
+
+    assert str(frame["commits"].dtype) == "int64[pyarrow]"
+    assert frame["repo"].tolist() == ["org/repo"]
+
+
+def test_typed_df_uses_endpoint_schema():
+    response = ReagentResponse(make_response({"results": [
+        {"repo": "org/repo", "email": "a@b.c", "timezone": -5.0, "total_commits": 3, "date": "2024-01-02T03:04:05Z"},
+        {"repo": "org/repo", "email": "d@e.f", "timezone": 1.0, "total_commits": 300, "date": "2024-02-02T03:04:05Z"},
+    ]}))
+    response.endpoint = "/commit/data"
+
+    frame = response.df(typed=True)
+
+    assert frame["repo"].dtype == "category"
+    assert frame["email"].dtype == "category"
+    assert str(frame["total_commits"].dtype) == "int16"
+    assert pd.api.types.is_datetime64_any_dtype(frame["date"])
+    assert not isinstance(response.df()["repo"].dtype, pd.CategoricalDtype)
+
+
+def test_schema_keeps_columns_with_values_that_dont_convert():
+    frame = apply_schema(pd.DataFrame([
+        {"total_commits": 3, "date": "2024-01-02T03:04:05Z", "forks": None},
+        {"total_commits": "n/a", "date": "last tuesday", "forks": 2},
+    ]), {"total_commits": INT, "date": DATETIME, "forks": INT})
+
+    assert frame["total_commits"].tolist() == [3, "n/a"]
+    assert frame["date"].tolist() == ["2024-01-02T03:04:05Z", "last tuesday"]
+    # Missing values were already missing; the rest still converts
+    assert frame["forks"].isna().tolist() == [True, False]
+    assert pd.api.types.is_numeric_dtype(frame["forks"])
+
+
+def test_df_column_projection():
+    response = ReagentResponse(make_response({"results": [
+        {"repo": "org/repo", "stats": {"commits": 3, "files": 2}, "email": "a@b.c"},
+    ]}))
+
+    frame = response.df(columns=["stats.commits", "repo"])
+
+    assert list(frame.columns) == ["stats.commits", "repo"]
+    assert frame.iloc[0].tolist() == [3, "org/repo"]
+    assert response.df(columns=["stats.commits", "repo"]) is frame
+
+
+if __name__ == "__main__":
+    pytest.main()
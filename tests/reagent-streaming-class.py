@@ -0,0 +1,114 @@
+# FILE: test_streaming.py
+import io
+import json
+import pytest
+from reagentpy import Reagent
+from reagentpy.cassette import Cassette
+from reagentpy.metrics import LatencyCollector
+from reagentpy.streaming import iter_content_chunks, iter_json_records, streaming, write_csv, write_parquet
+from reagentpy.testing import StubReagentServer
+
+
+BODY = {
+    "metadata": {"limits": [1, 2.5e10]},
+    "results": [{"sha": f"{i:04x}", "name": "Zoë " * (i % 3), "stats": {"total": i * 1.5}} for i in range(500)],
+    "count": 500,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 16])
+def test_decodes_records_across_chunk_boundaries(chunk_size):
+    content = json.dumps(BODY).encode("utf-8")
+    assert list(iter_json_records(iter_content_chunks(content, chunk_size))) == BODY["results"]
+
+
+def test_matches_dict_for_other_body_shapes():
+    assert list(iter_json_records([b'[1', b'2, 3]'])) == [12, 3]
+    assert list(iter_json_records([b'{"status": ', b'"ok"}'])) == [{"status": "ok"}]
+    assert list(iter_json_records([b'{"results": {"a": 1}}'])) == [{"a": 1}]
+    assert list(iter_json_records([b''])) == []
+    with pytest.raises(ValueError):
+        list(iter_json_records([b'{"results": [1, 2']))
+
+
+def test_streamed_responses_decode_from_the_socket():
+    collector = LatencyCollector()
+    with StubReagentServer() as server:
+        reagent = Reagent(reagent_api_key="test-key", base_url=server.base_url, hooks=[collector])
+        expected = reagent.commit().data(repo="org/repo", limit=300).dict()
+
+        with streaming():
+            response = reagent.commit().data(repo="org/repo", limit=300)
+        assert response.streamed
+        assert list(response.iter_records(chunk_size=100)) == expected
+        with pytest.raises(RuntimeError):
+            list(response.iter_records())
+
+        with streaming():
+            response = reagent.commit().data(repo="org/repo", limit=300)
+        out = io.StringIO()
+        assert response.to_csv(out) == 300
+        assert out.getvalue().splitlines()[0] == "sha,repo,email,name,timezone,country,date,total_commits"
+
+    stats = collector.summary()["/commit/data"]
+    assert stats["count"] == 3
+    assert stats["bytes"] == 3 * len(json.dumps({"results": expected}))
+
+
+def test_streaming_is_skipped_when_the_body_must_be_buffered(tmp_path):
+    with StubReagentServer() as server:
+        reagent = Reagent(reagent_api_key="test-key", base_url=server.base_url,
+                          cassette=Cassette(str(tmp_path / "c.cassette"), mode="record"))
+        with streaming():
+            response = reagent.repo().repo_list(limit=5)
+        assert not response.streamed
+        assert len(list(response.iter_records())) == 5
+        reagent.close()
+
+    with Reagent(reagent_api_key="test-key", cassette=Cassette(str(tmp_path / "c.cassette"), mode="replay")) as reagent:
+        with streaming():
+            assert len(list(reagent.repo().repo_list(limit=5).iter_records())) == 5
+
+
+def test_parquet_writer_streams_in_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    with StubReagentServer() as server:
+        reagent = Reagent(reagent_api_key="test-key", base_url=server.base_url)
+        with streaming():
+            response = reagent.repo().repo_list(limit=250)
+        response.to_parquet(str(tmp_path / "repos.parquet"), batch_size=100)
+
+    parquet = pq.ParquetFile(str(tmp_path / "repos.parquet"))
+    assert parquet.metadata.num_rows == 250
+    assert parquet.metadata.num_row_groups == 3
+
+
+def test_parquet_columns_null_in_the_first_batch_take_later_types(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    records = [{"repo": f"org/repo{i}", "score": None if i < 3 else i * 0.5, "tag": None} for i in range(7)]
+    path = str(tmp_path / "scores.parquet")
+
+    assert write_parquet(iter(records), path, batch_size=2) == 7
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("score").type) == "double"
+    assert table.column("score").to_pylist() == [record["score"] for record in records]
+    assert table.column("tag").null_count == 7
+    assert pq.ParquetFile(path).metadata.num_row_groups == 4
+
+
+def test_parquet_columns_untyped_after_the_held_batches_become_strings(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr("reagentpy.streaming.MAX_SCHEMA_BATCHES", 2)
+    records = [{"repo": "org/repo", "total": None if i < 4 else i} for i in range(6)]
+    path = str(tmp_path / "totals.parquet")
+
+    write_parquet(iter(records), path, batch_size=2)
+
+    assert pq.read_table(path).column("total").to_pylist() == [None] * 4 + ["4", "5"]
+
+
+def test_write_csv_flattens_nested_fields():
+    out = io.StringIO()
+    write_csv(BODY["results"][:2], out)
+    assert out.getvalue().splitlines() == ["sha,name,stats.total", "0000,,0.0", "0001,Zoë ,1.5"]
@@ -0,0 +1,58 @@
+# FILE: test_stub_server.py
+import pytest
+import requests
+from reagentpy import Reagent
+from reagentpy.ratelimit import RetryPolicy
+from reagentpy.testing import StubReagentServer
+
+
+@pytest.fixture
+def server():
+    with StubReagentServer(total_records=250, records_per_day=5) as server:
+        yield server
+
+
+def test_serves_client_routes(server):
+    reagent = Reagent(reagent_api_key="test-key", base_url=server.base_url)
+
+    assert reagent.status().dict() == {"status": "ok"}
+    assert len(reagent.repo().repo_list(limit=30).dict()) == 30
+    assert reagent.composite_scores().adversarial_total("org/repo").dict()[0]["foreign_adversarial_score"] == 3.2
+    assert server.requests[1] == {"method": "GET", "path": "/v1/repo/list", "params": {"limit": "30"}}
+
+
+def test_paginates_and_respects_date_range(server):
+    reagent = Reagent(reagent_api_key="test-key", base_url=server.base_url)
+
+    assert len(list(reagent.repo().iter_repo_list(page_size=100))) == 250
+
+    records = list(reagent.commit().iter_data(repo="org/repo", start_date="2024-03-01", end_date="2024-03-10", page_size=20))
+    assert len(records) == 50
+    assert {record["date"][:10] for record in records} == {f"2024-03-{day:02d}" for day in range(1, 11)}
+
+    # The same day yields the same records whatever range it was requested in
+    narrow = reagent.commit().data(repo="org/repo", start_date="2024-03-05", end_date="2024-03-05", limit=10).dict()
+    assert narrow == [record for record in records if record["date"].startswith("2024-03-05")]
+
+
+def test_rejects_missing_credentials_and_unknown_routes(server):
+    assert requests.get(f"{server.base_url}/status").status_code == 401
+    assert requests.get(f"{server.base_url}/nope", headers={"Authorization": "Bearer x"}).status_code == 404
+
+
+def test_injected_errors_are_retried():
+    with StubReagentServer(error_rate=0.5, error_statuses=(429, 503), seed=1) as server:
+        reagent = Reagent(reagent_api_key="test-key", base_url=server.base_url,
+                          retry=RetryPolicy(max_retries=8, backoff_factor=0))
+        responses = [reagent.repo().hygiene_summary("org/repo") for _ in range(10)]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert sum(response.retries for response in responses) > 0
+
+
+def test_record_padding_grows_payloads():
+    with StubReagentServer(record_padding=1000) as server:
+        reagent = Reagent(reagent_api_key="test-key", base_url=server.base_url)
+        response = reagent.repo().repo_list(limit=10)
+
+    assert len(response.content()) > 10 * 1000
@@ -0,0 +1,174 @@
+# FILE: test_timezone_boundaries.py
+import os
+import geopandas as gpd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot
+import pytest
+import cartopy.crs as ccrs
+import shapely
+from click.testing import CliRunner
+from shapely.geometry import box
+from reagentpy.cli import cli
+from reagentpy.visualizations.timezone_boundaries import (
+    build_boundary_store,
+    load_boundaries,
+    load_offset_boundaries,
+    offset_store_path,
+    pick_tolerance,
+)
+from reagentpy.visualizations.timezone_visualizations import TimezoneVisClient
+
+
+def write_geojson(path):
+    frame = gpd.GeoDataFrame(
+        {"tzid": ["Europe/London", "America/New_York", "Asia/Tokyo"]},
+        geometry=[box(-5, 50, 1, 58), box(-80, 38, -70, 45), box(135, 33, 141, 40)],
+        crs="EPSG:4326",
+    )
+    frame.to_file(path, driver="GeoJSON")
+    return frame
+
+
+def test_store_round_trips_boundaries_by_tzid(tmp_path):
+    source = write_geojson(tmp_path / "combined-now.json")
+    store = build_boundary_store(str(tmp_path / "combined-now.json"), str(tmp_path / "boundaries.arrow"))
+
+    boundaries = load_boundaries(store)
+    assert boundaries.tzids == sorted(source["tzid"])
+    assert boundaries.crs == "EPSG:4326"
+    assert "Asia/Tokyo" in boundaries and "Mars/Olympus" not in boundaries
+    tokyo, = boundaries.geometries(["Asia/Tokyo", "Mars/Olympus"])
+    assert tokyo.equals(source.geometry[2])
+    # Loaded once per process
+    assert load_boundaries(store) is boundaries
+    assert boundaries.frame() is boundaries.frame()
+
+
+def test_client_builds_the_store_on_first_use(tmp_path):
+    write_geojson(tmp_path / "combined-now.json")
+    client = TimezoneVisClient(
+        reagent_api_key="test-key",
+        geojson_path=str(tmp_path / "combined-now.json"),
+        boundary_store_path=str(tmp_path / "cache" / "boundaries.arrow"),
+    )
+    frame = client.read_timezone_geojson()
+    assert os.path.exists(tmp_path / "cache" / "boundaries.arrow")
+    assert len(frame[frame["tzid"] == "Europe/London"]) == 1
+
+
+def test_missing_boundaries_explain_how_to_build_them(tmp_path):
+    with pytest.raises(FileNotFoundError, match="build-boundary-store"):
+        load_boundaries(str(tmp_path / "missing.arrow"), str(tmp_path / "missing.json"))
+
+
+def test_without_pyarrow_the_geojson_is_read_in_memory(tmp_path, monkeypatch):
+    def import_pyarrow():
+        raise ImportError("no pyarrow")
+
+    monkeypatch.setattr("reagentpy.visualizations.timezone_boundaries.import_pyarrow", import_pyarrow)
+    source = write_geojson(tmp_path / "combined-now.json")
+    client = TimezoneVisClient(
+        reagent_api_key="test-key",
+        geojson_path=str(tmp_path / "combined-now.json"),
+        boundary_store_path=str(tmp_path / "boundaries.arrow"),
+    )
+
+    frame = client.read_timezone_geojson()
+    assert frame["tzid"].tolist() == sorted(source["tzid"])
+    assert client.read_timezone_geojson() is frame
+    offsets = client.read_offset_boundaries()
+    assert list(offsets.offsets) == [-5.0, 0.0, 9.0]
+    assert offsets.geometries([0])[0].equals(box(-5, 50, 1, 58))
+    assert offsets.simplified(0.05) is offsets.simplified(0.05)
+    assert client.read_offset_boundaries() is offsets
+    assert list(tmp_path.iterdir()) == [tmp_path / "combined-now.json"]
+
+    with pytest.raises(FileNotFoundError, match="pyarrow"):
+        load_boundaries(str(tmp_path / "missing.arrow"), str(tmp_path / "missing.json"))
+
+
+def test_cli_builds_the_store(tmp_path):
+    write_geojson(tmp_path / "combined-now.json")
+    store = str(tmp_path / "boundaries.arrow")
+    result = CliRunner().invoke(cli, [
+        "timezone-visualizations", "build-boundary-store", str(tmp_path / "combined-now.json"), "--store", store,
+    ])
+    assert result.exit_code == 0, result.output
+    assert len(load_boundaries(store)) == 3
+
+
+def test_offsets_are_dissolved_once_and_cached_on_disk(tmp_path):
+    write_geojson(tmp_path / "combined-now.json")
+    store = str(tmp_path / "boundaries.arrow")
+    build_boundary_store(str(tmp_path / "combined-now.json"), store)
+
+    offsets = load_offset_boundaries(store)
+    assert list(offsets.offsets) == [-5.0, 0.0, 9.0]
+    assert os.path.exists(offset_store_path(store))
+    assert load_offset_boundaries(store) is offsets
+
+    london, missing, new_york = offsets.geometries([0, 5.5, -5])
+    assert missing is None
+    assert london.equals(box(-5, 50, 1, 58))
+    assert new_york.equals(box(-80, 38, -70, 45))
+
+
+def test_map_draws_one_shape_per_offset(tmp_path, monkeypatch):
+    write_geojson(tmp_path / "combined-now.json")
+    client = TimezoneVisClient(
+        reagent_api_key="test-key",
+        geojson_path=str(tmp_path / "combined-now.json"),
+        boundary_store_path=str(tmp_path / "boundaries.arrow"),
+    )
+    drawn = []
+    monkeypatch.setattr("matplotlib.pyplot.show", lambda: None)
+    monkeypatch.setattr("cartopy.mpl.geoaxes.GeoAxes.coastlines", lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(
+        "cartopy.mpl.geoaxes.GeoAxes.add_geometries",
+        lambda self, geometries, crs, **kwargs: drawn.append((list(geometries), kwargs["facecolor"])),
+    )
+    client.plot_timezone_distribution_map(client.read_offset_boundaries(), [
+        {"timezone": 0, "total_commits": 10},
+        {"timezone": -5, "total_commits": 4},
+        {"timezone": 5.5, "total_commits": 1},
+    ])
+    matplotlib.pyplot.close("all")
+    assert [len(geometries) for geometries, _ in drawn] == [1, 1]
+    assert drawn[0][0][0].equals(box(-5, 50, 1, 58))
+
+
+def test_level_of_detail_follows_figure_resolution():
+    # A world map 15 inches wide: 0.24 degrees per pixel at 100 dpi, 0.08 at 300 dpi
+    assert pick_tolerance(15, 100) == 0.2
+    assert pick_tolerance(15, 300) == 0.05
+    assert pick_tolerance(60, 1200) == 0.0
+
+
+def test_simplified_levels_and_projections_are_cached_on_disk(tmp_path):
+    # Two wiggly neighbours sharing a border
+    border = [(0, y / 10) for y in range(0, 101)]
+    wiggle = [(0.003 * (i % 2), y) for i, (_, y) in enumerate(border)]
+    frame = gpd.GeoDataFrame(
+        {"tzid": ["Europe/London", "Europe/Berlin"]},
+        geometry=[shapely.Polygon([(-10, 0)] + wiggle + [(-10, 10)]), shapely.Polygon([(10, 0)] + wiggle + [(10, 10)])],
+        crs="EPSG:4326",
+    )
+    frame.to_file(tmp_path / "combined-now.json", driver="GeoJSON")
+    store = str(tmp_path / "boundaries.arrow")
+
+    full = load_offset_boundaries(store, str(tmp_path / "combined-now.json"))
+    simplified = full.simplified(0.05)
+    assert os.path.exists(offset_store_path(store, 0.05))
+    assert simplified is load_offset_boundaries(store, tolerance=0.05)
+    london, berlin = simplified.geometries([0, 1])
+    assert shapely.get_num_coordinates(london) < shapely.get_num_coordinates(full.geometries([0])[0])
+    # Simplified as a coverage: still no gap or overlap between neighbours
+    assert london.intersection(berlin).area == pytest.approx(0)
+    assert london.union(berlin).area == pytest.approx(200, rel=1e-3)
+
+    projection = ccrs.Robinson()
+    projected = simplified.projected(projection)
+    assert projected is simplified.projected(projection)
+    assert len(list(tmp_path.glob("boundaries-offsets-0.05-*.arrow"))) == 1
+    assert projected.geometries([0])[0].bounds[0] < -900000
@@ -0,0 +1,74 @@
+# FILE: test_timezone_raster.py
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import box
+from reagentpy.visualizations.timezone_boundaries import OffsetBoundaries, load_offset_boundaries
+from reagentpy.visualizations.timezone_raster import TimezoneRaster, load_timezone_raster
+from reagentpy.visualizations.timezone_visualizations import TimezoneVisClient
+
+
+def pixel(raster, lon, lat):
+    height, width = raster.labels.shape
+    return int((90 - lat) * height / 180), int((lon + 180) * width / 360)
+
+
+def make_boundaries():
+    return OffsetBoundaries([-5.0, 0.0, 9.0], [box(-80, 38, -70, 45), box(-5, 50, 1, 58), box(135, 33, 141, 40)])
+
+
+def test_label_image_has_one_label_per_offset():
+    raster = TimezoneRaster.render(make_boundaries(), width=720, coastlines=False)
+    assert raster.labels.shape == (360, 720)
+    assert raster.labels[pixel(raster, -75, 41)] == 1
+    assert raster.labels[pixel(raster, -2, 54)] == 2
+    assert raster.labels[pixel(raster, 138, 36)] == 3
+    assert raster.labels[pixel(raster, 60, -40)] == 0
+    # 10 x 7 degrees at two pixels per degree, without antialiasing
+    assert (raster.labels == 1).sum() == 20 * 14
+
+
+def test_colorize_is_a_lookup_under_the_lines():
+    raster = TimezoneRaster.render(make_boundaries(), width=720, coastlines=False)
+    image = raster.colorize([0.0, -5.0, 3.5], [(1, 0, 0, 1), (0, 0, 1, 1), (0, 1, 0, 1)], alpha=0.8)
+    assert image.shape == (360, 720, 4)
+    assert tuple(image[pixel(raster, -75, 41)]) == (51, 51, 255, 255)
+    assert tuple(image[pixel(raster, -2, 54)]) == (255, 51, 51, 255)
+    # Offsets without data keep the background
+    assert tuple(image[pixel(raster, 138, 36)]) == (255, 255, 255, 255)
+    # The boundary lines are drawn over the fill
+    assert image[pixel(raster, -75, 45)][2] < 255
+
+
+def test_raster_is_cached_next_to_the_store(tmp_path, monkeypatch):
+    gpd.GeoDataFrame(
+        {"tzid": ["Europe/London", "America/New_York"]},
+        geometry=[box(-5, 50, 1, 58), box(-80, 38, -70, 45)],
+        crs="EPSG:4326",
+    ).to_file(tmp_path / "combined-now.json", driver="GeoJSON")
+    boundaries = load_offset_boundaries(str(tmp_path / "boundaries.arrow"), str(tmp_path / "combined-now.json"))
+
+    raster = load_timezone_raster(boundaries, width=360, coastlines=False)
+    assert load_timezone_raster(boundaries, width=360, coastlines=False) is raster
+    assert (tmp_path / "boundaries-offsets-raster-360-bare.npz").exists()
+
+    # Another process loads the stored image instead of rendering it
+    monkeypatch.setattr("reagentpy.visualizations.timezone_raster._rasters", {})
+    monkeypatch.setattr(TimezoneRaster, "render", None)
+    assert np.array_equal(load_timezone_raster(boundaries, width=360, coastlines=False).labels, raster.labels)
+
+
+def test_rasterized_map_draws_one_image(monkeypatch):
+    monkeypatch.setattr("matplotlib.pyplot.show", lambda: None)
+    monkeypatch.setattr("cartopy.mpl.geoaxes.GeoAxes.coastlines", lambda self, *args, **kwargs: None)
+    client = TimezoneVisClient(reagent_api_key="test-key")
+    client.plot_timezone_distribution_map(make_boundaries(), [
+        {"timezone": 0, "total_commits": 10},
+        {"timezone": -5, "total_commits": 4},
+    ], rasterized=True)
+    ax = matplotlib.pyplot.gcf().axes[0]
+    assert len(ax.images) == 1
+    assert len(ax.collections) == 0
+    matplotlib.pyplot.close("all")
@@ -0,0 +1,129 @@
+# FILE: test_transport.py
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+import reagentpy.transport as transport_module
+from reagentpy import Reagent
+from reagentpy.ratelimit import RetryPolicy, TokenBucket, parse_retry_after
+from reagentpy.transport import ReagentTransport
+
+
+@pytest.fixture(autouse=True)
+def reset_credentials():
+    transport_module._credentials_loaded = False
+    transport_module._resolved_api_key = None
+    yield
+    transport_module._credentials_loaded = False
+    transport_module._resolved_api_key = None
+
+
+@patch.dict('os.environ', {'REAGENT_API_KEY': 'test-key'})
+def test_clients_share_one_session():
+    reagent = Reagent()
+
+    repo = reagent.repo()
+    composite = reagent.composite_scores()
+    timezones = reagent.timezone_visualizations()
+
+    assert repo.session is composite.session is timezones.session is reagent.transport.session
+    assert repo.reagent_api_key == 'test-key'
+
+
+@patch.dict('os.environ', {'REAGENT_API_KEY': 'test-key'})
+@patch('reagentpy.transport.load_dotenv')
+def test_credentials_resolved_once(mock_load_dotenv):
+    ReagentTransport()
+    ReagentTransport()
+    Reagent().repo()
+
+    mock_load_dotenv.assert_called_once()
+
+
+@patch.dict('os.environ', {'REAGENT_API_KEY': 'test-key', 'REAGENT_BASE_URL': 'http://localhost:8080/v1/'})
+def test_base_url_override():
+    assert ReagentTransport().base_url == 'http://localhost:8080/v1'
+    assert ReagentTransport(base_url='http://other/v1').base_url == 'http://other/v1'
+
+
+@patch.dict('os.environ', {'REAGENT_API_KEY': 'test-key'})
+def test_request_uses_timeout_and_endpoint():
+    reagent = Reagent(timeout=(1, 2))
+    reagent.transport.session.request = MagicMock()
+
+    reagent.repo().hygiene_summary("org/repo")
+
+    reagent.transport.session.request.assert_called_once_with(
+        'GET', 'https://api.reagentanalytics.com/v1/repo/hygiene_summary',
+        params={'repo': 'org/repo'}, json=None, timeout=(1, 2), stream=False
+    )
+
+
+def make_http_response(status_code, headers=None):
+    raw = MagicMock()
+    raw.status_code = status_code
+    raw.headers = headers or {}
+    raw.json.return_value = {"results": []}
+    return raw
+
+
+@patch('reagentpy.transport.time.sleep')
+def test_retries_honor_retry_after(mock_sleep):
+    transport = ReagentTransport(reagent_api_key='test-key', retry=RetryPolicy(jitter=False))
+    transport.session.request = MagicMock(side_effect=[
+        make_http_response(429, {"Retry-After": "7"}),
+        make_http_response(503),
+        make_http_response(200),
+    ])
+
+    response = transport.request("GET", "/repo/list")
+
+    assert response.status_code == 200
+    assert response.retries == 2
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [7.0, 1.0]
+
+
+@patch('reagentpy.transport.time.sleep')
+def test_retries_give_up_and_skip_unsafe_methods(mock_sleep):
+    transport = ReagentTransport(reagent_api_key='test-key', retry=RetryPolicy(max_retries=2))
+    transport.session.request = MagicMock(return_value=make_http_response(502))
+
+    assert transport.request("GET", "/repo/list").status_code == 502
+    assert transport.session.request.call_count == 3
+
+    transport.session.request.reset_mock()
+    assert transport.request("POST", "/anything").status_code == 502
+    assert transport.session.request.call_count == 1
+
+    transport.session.request = MagicMock(side_effect=requests.ConnectionError())
+    with pytest.raises(requests.ConnectionError):
+        transport.request("GET", "/repo/list")
+    assert transport.session.request.call_count == 3
+
+
+def test_token_bucket_spaces_out_requests():
+    with patch('reagentpy.ratelimit.time.monotonic', return_value=100.0):
+        bucket = TokenBucket(rate=2, burst=2)
+        waits = [bucket.reserve() for _ in range(4)]
+        assert waits == [0.0, 0.0, 0.5, 1.0]
+
+        bucket.pause(10)
+        assert bucket.reserve() == pytest.approx(11.5)
+
+
+def test_rate_limiter_is_shared_per_api_key():
+    first = ReagentTransport(reagent_api_key='key-a', rate_limit=5)
+    second = ReagentTransport(reagent_api_key='key-a', rate_limit=5)
+    other = ReagentTransport(reagent_api_key='key-b', rate_limit=5)
+
+    assert first.rate_limiter is second.rate_limiter
+    assert first.rate_limiter is not other.rate_limiter
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+if __name__ == "__main__":
+    pytest.main()